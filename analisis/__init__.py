@@ -0,0 +1 @@
+"""Modul pendukung untuk dashboard dan analisis data sosial media"""
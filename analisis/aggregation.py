@@ -0,0 +1,137 @@
+"""Agregasi per pengguna berbasis np.bincount.
+
+Id pengguna dipetakan sekali ke posisi padat 0..n-1, lalu setiap penghitung
+per pengguna diisi langsung ke array yang sudah dialokasikan, tanpa rantai
+groupby/merge.
+"""
+import numpy as np
+import pandas as pd
+
+from analisis.features import compute_features
+from analisis.profiling import stage
+
+
+def _as_int_array(values):
+    """Kolom id (boleh float/nullable) -> array int64, nilai kosong dibuang"""
+    series = pd.Series(values, copy=False)
+    if series.hasnans:
+        series = series.dropna()
+    return series.to_numpy(dtype=np.int64)
+
+
+class DenseIndex:
+    """Pemetaan id (pengguna atau post) ke posisi padat"""
+
+    def __init__(self, user_ids):
+        self.user_ids = np.asarray(user_ids, dtype=np.int64)
+        self.size = len(self.user_ids)
+        self._offset = None
+        if self.size > 0:
+            start = self.user_ids[0]
+            if np.array_equal(self.user_ids, np.arange(start, start + self.size)):
+                self._offset = int(start)
+        if self._offset is None:
+            self._order = np.argsort(self.user_ids, kind='stable')
+            self._sorted = self.user_ids[self._order]
+
+    def positions(self, keys):
+        """Posisi padat tiap id, -1 untuk id yang tidak dikenal"""
+        keys = _as_int_array(keys)
+        if self._offset is not None:
+            pos = keys - self._offset
+            pos[(pos < 0) | (pos >= self.size)] = -1
+            return pos
+        if self.size == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+        idx = np.minimum(np.searchsorted(self._sorted, keys), self.size - 1)
+        return np.where(self._sorted[idx] == keys, self._order[idx], -1)
+
+    def count(self, *key_arrays):
+        """Jumlah kemunculan tiap id di satu atau lebih kolom id"""
+        counts = np.zeros(self.size, dtype=np.int64)
+        for keys in key_arrays:
+            pos = self.positions(keys)
+            counts += np.bincount(pos[pos >= 0], minlength=self.size)
+        return counts
+
+
+# Kolom id post asli; jika ada di data sumber, dipakai menggantikan simulasi
+POST_ID_COLUMN = 'Post ID'
+COUNT_COLUMNS = ['friend_count', 'post_count', 'reactions_given', 'reactions_received']
+
+
+def post_owners(posts, reaction_post_ids):
+    """Pemilik post untuk tiap reaksi lewat array post -> pemilik.
+
+    Id post yang tidak ada di tabel posts menghasilkan -1, sehingga tidak
+    perlu membentuk tabel gabungan posts x reactions.
+    """
+    if len(posts) == 0:
+        return np.full(len(reaction_post_ids), -1, dtype=np.int64)
+    owners = posts['user_id'].to_numpy(dtype=np.int64)
+    pos = DenseIndex(posts['post_id']).positions(reaction_post_ids)
+    return np.where(pos >= 0, owners[pos], -1)
+
+
+def merge_dtypes(integrated_data):
+    """Dtype penghitung seperti rantai merge + fillna(0) semula: float64 jika ada
+    pengguna tanpa baris (NaN sebelum fillna), selain itu int64"""
+    for column in COUNT_COLUMNS:
+        if (integrated_data[column] == 0).any():
+            integrated_data[column] = integrated_data[column].astype(np.float64)
+
+
+def prepare_events(posts, reactions):
+    """Posts dan reactions dengan kolom user_id, post_id, dan reaction_id"""
+    # Data posting
+    posts = posts.rename(columns={'User': 'user_id'})
+    if POST_ID_COLUMN in posts.columns:
+        posts['post_id'] = posts[POST_ID_COLUMN]
+    else:
+        posts['post_id'] = np.arange(1, len(posts) + 1)
+
+    # Data reaksi diberikan
+    reactions = reactions.rename(columns={'User': 'user_id'})
+    reactions['reaction_id'] = np.arange(1, len(reactions) + 1)
+
+    # Reaksi terhadap posting: pakai id post asli, atau simulasi jika tidak tersedia
+    if POST_ID_COLUMN in reactions.columns:
+        reactions['post_id'] = reactions[POST_ID_COLUMN]
+    else:
+        reactions['post_id'] = reactions['reaction_id'] % max(len(posts), 1) + 1
+    return posts, reactions
+
+
+def build_integrated_dataset(users, friends, posts, reactions):
+    """Membuat dataset terintegrasi (satu baris per pengguna)"""
+    # Base dari users
+    with stage('integrate:base') as record:
+        integrated_data = users[['Name', 'Surname', 'Age', 'Subscription Date']].copy()
+        integrated_data.insert(0, 'user_id', np.arange(1, len(users) + 1))
+        integrated_data.index = pd.RangeIndex(len(integrated_data))
+        index = DenseIndex(integrated_data['user_id'])
+        record['rows'] = len(integrated_data)
+
+    posts, reactions = prepare_events(posts, reactions)
+
+    # Penghitung per pengguna (pengguna tanpa aktivitas bernilai 0)
+    with stage('integrate:friend_count') as record:
+        integrated_data['friend_count'] = index.count(friends['Friend 1'], friends['Friend 2'])
+        record['rows'] = len(friends)
+    with stage('integrate:post_count') as record:
+        integrated_data['post_count'] = index.count(posts['user_id'])
+        record['rows'] = len(posts)
+    with stage('integrate:reactions_given') as record:
+        integrated_data['reactions_given'] = index.count(reactions['user_id'])
+        record['rows'] = len(reactions)
+    with stage('integrate:reactions_received') as record:
+        integrated_data['reactions_received'] = index.count(post_owners(posts, reactions['post_id']))
+        record['rows'] = len(reactions)
+    merge_dtypes(integrated_data)
+
+    # Tambahan kolom analisis (lihat analisis/features.py)
+    with stage('integrate:features') as record:
+        compute_features(integrated_data)
+        record['rows'] = len(integrated_data)
+
+    return integrated_data, posts, reactions
@@ -0,0 +1,144 @@
+"""Cache artefak di disk dengan kunci fingerprint dataset.
+
+Hasil turunan (mis. dataset terintegrasi) disimpan sebagai file Arrow IPC
+(Feather) per kunci dan dibaca kembali lewat memory-map. Ukuran total
+dibatasi; artefak yang paling lama tidak dipakai dihapus lebih dulu (LRU
+berdasarkan mtime). Nama artefak memuat hash kode modul yang membentuk
+isinya, jadi perubahan cleaning/dedup/ingest/agregasi otomatis membuat
+artefak lama tidak terpakai (lalu terhapus oleh eviksi).
+"""
+import functools
+import hashlib
+import importlib.util
+import os
+import shutil
+from contextlib import contextmanager
+
+from analisis.snapshot import cache_dir
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import pyarrow
+    import pyarrow.feather as feather
+except ImportError:
+    pyarrow = None
+
+# Modul yang menentukan isi artefak (tabel bersih, dataset terintegrasi, frame backend)
+ARTIFACT_MODULES = ['analisis.snapshot', 'analisis.ingest', 'analisis.sketches', 'analisis.dedup',
+                    'analisis.cleaning', 'analisis.features', 'analisis.aggregation',
+                    'analisis.graph', 'analisis.backends', 'analisis.artifact_cache']
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """Hash file sumber modul pembentuk artefak (dibaca tanpa mengimpor modulnya)"""
+    digest = hashlib.sha256()
+    for name in ARTIFACT_MODULES:
+        with open(importlib.util.find_spec(name).origin, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+class ArtifactCache:
+    """Penyimpanan artefak DataFrame berukuran terbatas dengan eviksi LRU"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.environ.get('SOSMED_ARTIFACT_DIR', cache_dir('artifacts'))
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('SOSMED_ARTIFACT_CACHE_MB', 1024)) * 2**20
+        self.max_bytes = max_bytes
+
+    def _entry(self, key):
+        return os.path.join(self.directory, f'{key}-{code_version()}')
+
+    def get(self, key):
+        """Daftar frame untuk key, atau None jika belum tersimpan"""
+        entry = self._entry(key)
+        if pyarrow is None or not os.path.isdir(entry):
+            return None
+        names = sorted(os.listdir(entry), key=lambda name: int(name.split('.')[0]))
+        frames = [self._read_frame(os.path.join(entry, name)) for name in names]
+        os.utime(entry)
+        return frames
+
+    def _read_frame(self, path):
+        return feather.read_table(path, memory_map=True).to_pandas()
+
+    def _write_frame(self, frame, path):
+        frame.to_feather(path)
+
+    def put(self, key, frames):
+        """Menyimpan frame-frame secara atomik lalu menjalankan eviksi"""
+        if pyarrow is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entry = self._entry(key)
+        tmp_entry = f'{entry}.tmp-{os.getpid()}'
+        os.makedirs(tmp_entry, exist_ok=True)
+        for i, frame in enumerate(frames):
+            self._write_frame(frame, os.path.join(tmp_entry, f'{i}.arrow'))
+        if os.path.isdir(entry):
+            shutil.rmtree(tmp_entry)
+        else:
+            os.replace(tmp_entry, entry)
+        self.evict()
+
+    def get_or_build(self, key, build):
+        """Artefak dari cache; jika belum ada, build() dipanggil lalu hasilnya disimpan"""
+        frames = self.get(key)
+        if frames is None:
+            # Kunci file: proses lain yang meminta key sama menunggu lalu membaca hasilnya
+            with self._build_lock(key):
+                frames = self.get(key)
+                if frames is None:
+                    built = [frame.reset_index(drop=True) for frame in build()]
+                    self.put(key, built)
+                    # Dibaca ulang agar hasil build dan cache hit identik (None jika langsung tereviksi)
+                    frames = self.get(key)
+                    if frames is None:
+                        frames = built
+        return tuple(frames)
+
+    @contextmanager
+    def _build_lock(self, key):
+        if fcntl is None or pyarrow is None:
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f'{self._entry(key)}.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isdir(path) or '.tmp-' in name:
+                continue
+            size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+            entries.append((os.path.getmtime(path), size, path))
+        return sorted(entries)
+
+    def evict(self):
+        """Menghapus artefak terlama sampai total ukuran di bawah batas"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def usage(self):
+        """(jumlah artefak, total byte) di cache"""
+        if not os.path.isdir(self.directory):
+            return 0, 0
+        entries = self._entries()
+        return len(entries), sum(size for _, size, _ in entries)
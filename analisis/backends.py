@@ -0,0 +1,442 @@
+"""Backend komputasi untuk dataset terintegrasi.
+
+Backend 'pandas' memuat keempat tabel ke memori (jalur dashboard biasa).
+Backend 'duckdb' menjalankan cleaning, dedup, dan agregasi per pengguna di
+DuckDB tertanam secara out-of-core: CSV dipindai bertahap, disimpan sekali
+sebagai Parquet (urutan baris terjaga), dan hanya frame kecil per pengguna
+yang dikembalikan. Kolom turunan tetap dihitung oleh analisis/features.py
+sehingga hasil kedua backend sama persis. Untuk dashboard, duckdb_frames()
+juga mengembalikan edge pertemanan bersih, rollup per jam, ringkasan
+Overview, dan laporan dedup, jadi keempat tabel tidak pernah dimuat ke pandas.
+
+Pilih backend lewat argumen atau SOSMED_BACKEND (default 'pandas'). Cek
+kesamaan dengan jalur pandas:
+
+    python -m analisis.backends --source data/
+"""
+import argparse
+import contextlib
+import csv
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analisis.aggregation import COUNT_COLUMNS, POST_ID_COLUMN, build_integrated_dataset, merge_dtypes
+from analisis.cleaning import CLEAN_NAMES, load_clean_tables
+from analisis.features import compute_features
+from analisis.ingest import SCHEMAS, convert_epoch
+from analisis.profiling import stage
+from analisis.rollup import GRANULARITIES
+from analisis.sections import SectionData
+from analisis.sketches import approx_mode
+from analisis.snapshot import TABLE_NAMES, cache_dir, content_hash, source_path
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+BACKENDS = {}
+
+# Tipe kolom CSV untuk DuckDB (nilai kosong hanya ada di reactions)
+DUCKDB_COLUMNS = {
+    'user_table': {'Surname': 'VARCHAR', 'Name': 'VARCHAR', 'Age': 'BIGINT',
+                   'Subscription Date': 'BIGINT'},
+    'friends_table': {'Friend 1': 'BIGINT', 'Friend 2': 'BIGINT'},
+    'posts_table': {'User': 'BIGINT', 'Post Type': 'VARCHAR', 'Post Date': 'BIGINT'},
+    'reactions_table': {'User': 'DOUBLE', 'Reaction Type': 'VARCHAR', 'Reaction Date': 'DOUBLE'},
+}
+
+# Batas memori DuckDB bawaan; tabel sementara dan hash join di atasnya tumpah ke
+# disk (.cache/duckdb/spill), jadi puncak RAM tidak tumbuh mengikuti ukuran data
+DUCKDB_MEMORY = '512MB'
+
+RAW_VIEWS = {'user_table': 'users_raw', 'friends_table': 'friends_raw',
+             'posts_table': 'posts_raw', 'reactions_table': 'reactions_raw'}
+
+# Kolom sumber tambahan yang dikenali (lihat aggregation.POST_ID_COLUMN); kolom
+# lain yang tidak dikenal dibaca sebagai VARCHAR
+EXTRA_COLUMNS = {'posts_table': {POST_ID_COLUMN: 'BIGINT'},
+                 'reactions_table': {POST_ID_COLUMN: 'DOUBLE'}}
+
+# Cleaning mengikuti clean_tables (dedup semua kolom dengan baris pertama
+# dipertahankan, pertemanan tak berarah, reaksi tanpa User dibuang lalu diisi
+# modus/median), lalu kolom id seperti prepare_events. Setiap tabel bersih
+# disimpan sekali sebagai tabel sementara DuckDB (boleh tumpah ke disk) untuk
+# query berikutnya; friends_clean hanya view di atas friends_ranked.
+CLEAN_SQL = [
+    """
+CREATE TEMP TABLE users_clean AS
+SELECT row_number() OVER (ORDER BY rn) AS user_id, * FROM (
+    SELECT min(rn) AS rn, * EXCLUDE (rn) FROM users_raw GROUP BY ALL
+) ORDER BY rn
+""",
+    """
+CREATE TEMP TABLE friends_ranked AS
+SELECT *,
+       row_number() OVER pair AS k,
+       -- Duplikat yang orientasinya terbalik dari kemunculan pertamanya
+       "Friend 1" <> first_value("Friend 1") OVER pair AS is_reversed
+FROM friends_raw
+WINDOW pair AS (PARTITION BY least("Friend 1", "Friend 2"), greatest("Friend 1", "Friend 2") ORDER BY rn)
+""",
+    """
+CREATE TEMP VIEW friends_clean AS
+SELECT rn, "Friend 1", "Friend 2" FROM friends_ranked WHERE k = 1 ORDER BY rn
+""",
+    """
+CREATE TEMP TABLE posts_events AS
+SELECT rn, "User" AS user_id, {posts_post_id} AS post_id, "Post Type", "Post Date"
+FROM (
+    SELECT *, row_number() OVER (ORDER BY rn) AS post_number FROM (
+        SELECT min(rn) AS rn, * EXCLUDE (rn) FROM posts_raw GROUP BY ALL
+    )
+) ORDER BY rn
+""",
+    """
+CREATE TEMP TABLE reactions_events AS
+WITH reactions_valid AS (
+    SELECT * FROM reactions_raw WHERE "User" IS NOT NULL
+),
+reaction_fill AS (
+    -- Modus (nilai terkecil jika seri, seperti Series.mode) dan median untuk nilai kosong
+    SELECT
+        (SELECT "Reaction Type" FROM reactions_valid WHERE "Reaction Type" IS NOT NULL
+         GROUP BY 1 ORDER BY count(*) DESC, 1 LIMIT 1) AS mode_type,
+        (SELECT {median} FROM reactions_valid) AS median_date
+),
+reactions_clean AS (
+    SELECT min(rn) AS rn, * EXCLUDE (rn) FROM (
+        SELECT r.* REPLACE (coalesce(r."Reaction Type", f.mode_type) AS "Reaction Type",
+                            coalesce(r."Reaction Date", f.median_date) AS "Reaction Date")
+        FROM reactions_valid r, reaction_fill f
+    ) GROUP BY ALL
+)
+SELECT rn, CAST("User" AS BIGINT) AS user_id, {reactions_post_id} AS post_id, "Reaction Type", "Reaction Date"
+FROM (SELECT *, row_number() OVER (ORDER BY rn) AS reaction_id FROM reactions_clean),
+     (SELECT greatest(count(*), 1) AS post_total FROM posts_events)
+ORDER BY rn
+""",
+]
+
+# Id post per tabel: kolom 'Post ID' asli jika ada, selain itu simulasi seperti prepare_events
+POST_ID_SQL = {
+    'posts_table': ('"Post ID"', 'post_number'),
+    'reactions_table': ('"Post ID"', 'reaction_id % post_total + 1'),
+}
+
+FRIEND_COUNTS_SQL = """
+SELECT id, count(*) AS n FROM (
+    SELECT "Friend 1" AS id FROM friends_clean UNION ALL SELECT "Friend 2" FROM friends_clean
+) GROUP BY id
+"""
+
+INTEGRATED_SQL = f"""
+WITH friend_counts AS ({FRIEND_COUNTS_SQL}),
+post_counts AS (
+    SELECT user_id AS id, count(*) AS n FROM posts_events GROUP BY id
+),
+reaction_counts AS (
+    SELECT user_id AS id, count(*) AS n FROM reactions_events GROUP BY id
+),
+post_owners AS (
+    -- Id post kembar: pemiliknya baris pertama, seperti post_owners()
+    SELECT post_id, arg_min(user_id, rn) AS owner FROM posts_events GROUP BY post_id
+),
+received_counts AS (
+    SELECT o.owner AS id, count(*) AS n
+    FROM reactions_events r JOIN post_owners o ON o.post_id = r.post_id
+    GROUP BY o.owner
+)
+SELECT u.user_id, u.Name, u.Surname, u.Age, u."Subscription Date",
+       coalesce(f.n, 0) AS friend_count,
+       coalesce(p.n, 0) AS post_count,
+       coalesce(r.n, 0) AS reactions_given,
+       coalesce(rr.n, 0) AS reactions_received
+FROM users_clean u
+LEFT JOIN friend_counts f ON f.id = u.user_id
+LEFT JOIN post_counts p ON p.id = u.user_id
+LEFT JOIN reaction_counts r ON r.id = u.user_id
+LEFT JOIN received_counts rr ON rr.id = u.user_id
+ORDER BY u.user_id
+"""
+
+# Jumlah event per (awal jam, jenis) untuk RollupStore.from_hourly; jam dihitung
+# dari epoch detik yang dibulatkan ke bawah, seperti analisis/rollup.py
+HOURLY_SQL = """
+SELECT seconds - ((seconds % 3600) + 3600) % 3600 AS hour, type, count(*) AS count
+FROM (
+    SELECT CAST(floor("{date}") AS BIGINT) AS seconds, CAST("{type}" AS VARCHAR) AS type FROM {table}
+)
+WHERE seconds IS NOT NULL AND type IS NOT NULL
+GROUP BY ALL ORDER BY ALL
+"""
+
+# Angka ringkasan section Overview (lihat sections.table_summary)
+SUMMARY_SQL = f"""
+WITH friend_counts AS ({FRIEND_COUNTS_SQL}),
+post_counts AS (SELECT user_id, count(*) AS n FROM posts_events GROUP BY 1)
+SELECT
+    (SELECT count(*) FROM users_clean) AS users,
+    (SELECT count(*) FROM friends_clean) AS friends,
+    (SELECT count(*) FROM posts_events) AS posts,
+    (SELECT count(*) FROM reactions_events) AS reactions,
+    (SELECT avg(Age) FROM users_clean) AS age_mean,
+    (SELECT median(Age) FROM users_clean) AS age_median,
+    (SELECT min(Age) FROM users_clean) AS age_min,
+    (SELECT max(Age) FROM users_clean) AS age_max,
+    (SELECT avg(n) FROM friend_counts) AS avg_friends,
+    (SELECT count(*) FROM friend_counts) AS friend_users,
+    (SELECT count(*) FROM post_counts) AS active_posters,
+    (SELECT avg(n) FROM post_counts) AS avg_posts,
+    (SELECT count(DISTINCT user_id) FROM reactions_events) AS reacting_users
+"""
+
+# Laporan dedup per tabel (kolom sama dengan dedup_report); SQL membandingkan
+# nilai langsung, jadi tidak ada tabrakan hash
+DEDUP_SQL = """
+SELECT 'user_table' AS "table", (SELECT count(*) FROM users_raw) AS rows,
+       (SELECT count(*) FROM users_clean) AS distinct_rows, NULL AS reversed_pairs
+UNION ALL
+SELECT 'friends_table', (SELECT count(*) FROM friends_raw), (SELECT count(*) FROM friends_clean),
+       (SELECT count(*) FROM friends_ranked WHERE k > 1 AND is_reversed)
+UNION ALL
+SELECT 'posts_table', (SELECT count(*) FROM posts_raw), (SELECT count(*) FROM posts_events), NULL
+UNION ALL
+SELECT 'reactions_table', (SELECT count(*) FROM reactions_raw WHERE "User" IS NOT NULL),
+       (SELECT count(*) FROM reactions_events), NULL
+"""
+
+# Frame yang dikembalikan duckdb_frames(), berurutan (lihat SectionData.from_frames)
+DASHBOARD_FRAMES = ['integrated', 'friends', 'posts_hourly', 'reactions_hourly', 'summary', 'dedup']
+
+
+def backend(name):
+    """Mendaftarkan fungsi (source, typed) -> integrated_data sebagai backend"""
+    def register(func):
+        BACKENDS[name] = func
+        return func
+    return register
+
+
+def default_backend():
+    return os.environ.get('SOSMED_BACKEND', 'pandas')
+
+
+@backend('pandas')
+def pandas_integrated(source=None, typed=True):
+    """Jalur in-memory: keempat tabel dimuat ke pandas"""
+    return build_integrated_dataset(*load_clean_tables(source, typed))[0]
+
+
+def _quote(path):
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def _source_columns(name, path):
+    """Tipe DuckDB tiap kolom header CSV (kolom 'Post ID' opsional ikut dibaca)"""
+    with open(path, newline='') as f:
+        header = next(csv.reader(f))
+    known = {**DUCKDB_COLUMNS[name], **EXTRA_COLUMNS.get(name, {})}
+    return {column: known.get(column, 'VARCHAR') for column in header}
+
+
+def _stage_parquet(con, name, source):
+    """CSV -> Parquet sekali per isi file (dipindai bertahap oleh DuckDB)"""
+    path = source_path(name, source)
+    target = cache_dir('duckdb', f'{name}-{content_hash(path)}.parquet')
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        columns = '{' + ', '.join(f'{_quote(c)}: {_quote(t)}'
+                                  for c, t in _source_columns(name, path).items()) + '}'
+        tmp = f'{target}.tmp-{os.getpid()}'
+        # Tanpa ORDER BY, preserve_insertion_order menjaga urutan baris CSV
+        con.execute(f"COPY (SELECT * FROM read_csv({_quote(path)}, header=true, "
+                    f"columns={columns})) TO {_quote(tmp)} (FORMAT parquet)")
+        os.replace(tmp, target)
+    return target
+
+
+def _connect():
+    con = duckdb.connect()
+    con.execute("SET preserve_insertion_order = true")
+    con.execute("SET enable_progress_bar = false")
+    con.execute(f"SET temp_directory = {_quote(cache_dir('duckdb', 'spill'))}")
+    con.execute(f"SET memory_limit = {_quote(os.environ.get('SOSMED_DUCKDB_MEMORY', DUCKDB_MEMORY))}")
+    return con
+
+
+@contextlib.contextmanager
+def _clean_session(source=None, approx=None):
+    """Koneksi DuckDB dengan keempat tabel sudah dibersihkan (tabel sementara *_clean)"""
+    if duckdb is None:
+        raise ImportError("Backend 'duckdb' membutuhkan paket duckdb")
+    if approx is None:
+        approx = approx_mode()
+    con = _connect()
+    try:
+        with stage('duckdb:stage_parquet'):
+            has_post_id = {}
+            for name in TABLE_NAMES:
+                path = _stage_parquet(con, name, source)
+                con.execute(f"CREATE VIEW {RAW_VIEWS[name]} AS SELECT file_row_number AS rn, "
+                            f"* EXCLUDE (file_row_number) FROM "
+                            f"read_parquet({_quote(path)}, file_row_number=true)")
+                columns = con.execute(f"SELECT * FROM {RAW_VIEWS[name]} LIMIT 0").df().columns
+                has_post_id[name] = POST_ID_COLUMN in columns
+        with stage('duckdb:clean'):
+            # Mode aproksimasi: median Reaction Date dari sketch kuantil DuckDB
+            median = 'approx_quantile("Reaction Date", 0.5)' if approx else 'median("Reaction Date")'
+            params = {f'{CLEAN_NAMES[name]}_post_id': expression[0 if has_post_id[name] else 1]
+                      for name, expression in POST_ID_SQL.items()}
+            for statement in CLEAN_SQL:
+                con.execute(statement.format(median=median, **params))
+        yield con
+    finally:
+        con.close()
+
+
+def _integrated_frame(con, typed):
+    """Frame per pengguna dari tabel bersih, dengan tipe kolom seperti jalur pandas"""
+    with stage('duckdb:aggregate') as record:
+        integrated_data = con.execute(INTEGRATED_SQL).df()
+        record['rows'] = len(integrated_data)
+
+    integrated_data['user_id'] = integrated_data['user_id'].astype(np.int64)
+    integrated_data[COUNT_COLUMNS] = integrated_data[COUNT_COLUMNS].astype(np.int64)
+    merge_dtypes(integrated_data)
+    if typed:
+        schema = SCHEMAS['user_table']
+        integrated_data = integrated_data.astype({c: schema[c] for c in ['Name', 'Surname', 'Age']})
+    else:
+        integrated_data = integrated_data.astype({'Name': 'str', 'Surname': 'str', 'Age': np.int64})
+    integrated_data['Subscription Date'] = convert_epoch(integrated_data['Subscription Date'])
+    compute_features(integrated_data)
+    return integrated_data
+
+
+@backend('duckdb')
+def duckdb_integrated(source=None, typed=True):
+    """Jalur out-of-core: cleaning dan agregasi per pengguna di DuckDB"""
+    with _clean_session(source) as con:
+        return _integrated_frame(con, typed)
+
+
+def duckdb_frames(source=None, typed=True, approx=None):
+    """Frame ringkas untuk dashboard (lihat DASHBOARD_FRAMES) tanpa memuat tabel ke pandas.
+
+    Selain dataset terintegrasi hanya edge pertemanan bersih (untuk graf) yang
+    sebesar tabel sumber; rollup per jam, ringkasan Overview, dan laporan dedup
+    dihitung di DuckDB.
+    """
+    with _clean_session(source, approx) as con:
+        integrated_data = _integrated_frame(con, typed)
+        with stage('duckdb:section_aggregates') as record:
+            friends = con.execute('SELECT "Friend 1", "Friend 2" FROM friends_clean ORDER BY rn').df()
+            friends = friends.astype(SCHEMAS['friends_table'] if typed else np.int64)
+            posts_hourly = con.execute(HOURLY_SQL.format(
+                date='Post Date', type='Post Type', table='posts_events')).df()
+            reactions_hourly = con.execute(HOURLY_SQL.format(
+                date='Reaction Date', type='Reaction Type', table='reactions_events')).df()
+            summary = con.execute(SUMMARY_SQL).df()
+            dedup = con.execute(DEDUP_SQL).df()
+            dedup['duplicate_rows'] = dedup['rows'] - dedup['distinct_rows']
+            dedup['hash_collisions'] = 0
+            dedup = dedup[['table', 'rows', 'duplicate_rows', 'distinct_rows', 'hash_collisions',
+                           'reversed_pairs']]
+            record['rows'] = len(friends) + len(posts_hourly) + len(reactions_hourly)
+    return integrated_data, friends, posts_hourly, reactions_hourly, summary, dedup
+
+
+# Backend yang menyiapkan semua frame dashboard (DASHBOARD_FRAMES) sendiri
+FRAME_BACKENDS = {'duckdb': duckdb_frames}
+
+
+def dashboard_frames(source=None, backend=None, typed=True, approx=None):
+    """Frame dashboard dari backend out-of-core yang dipilih (bukan 'pandas')"""
+    name = backend or default_backend()
+    if name not in FRAME_BACKENDS:
+        raise ValueError(f"Backend tanpa frame dashboard: {name!r} (pilihan: {', '.join(FRAME_BACKENDS)})")
+    return FRAME_BACKENDS[name](source, typed, approx)
+
+
+def integrated_dataset(source=None, backend=None, typed=True):
+    """Dataset terintegrasi (satu baris per pengguna) dari backend yang dipilih"""
+    name = backend or default_backend()
+    if name not in BACKENDS:
+        raise ValueError(f"Backend tidak dikenal: {name!r} (pilihan: {', '.join(BACKENDS)})")
+    return BACKENDS[name](source, typed)
+
+
+def _nonzero(counts):
+    counts = counts[counts > 0]
+    return dict(zip(counts.index.astype(str), counts.astype(int)))
+
+
+def _same_rollup(expected, actual):
+    """Jumlah per bucket dan jenis sama (kolom jenis yang selalu nol diabaikan)"""
+    for granularity in GRANULARITIES:
+        a = expected.range(granularity, by_type=True)
+        b = actual.range(granularity, by_type=True)
+        a, b = a.loc[:, a.sum() > 0], b.loc[:, b.sum() > 0]
+        if not (a.columns.astype(str).equals(b.columns.astype(str)) and a.index.equals(b.index)
+                and np.array_equal(a.to_numpy(), b.to_numpy())):
+            return False
+    return True
+
+
+def _same_summary(expected, actual):
+    numbers = ['age_mean', 'age_median', 'avg_friends', 'friend_users', 'active_posters',
+               'avg_posts', 'reacting_users']
+    columns = ['table', 'rows', 'duplicate_rows', 'distinct_rows']
+    return (expected['counts'] == actual['counts']
+            and all(np.isclose(expected[key], actual[key]) for key in numbers)
+            and tuple(expected['age_range']) == tuple(actual['age_range'])
+            and expected['duplicates_report'][columns].equals(actual['duplicates_report'][columns]))
+
+
+def check_against_pandas(source=None, typed=True, approx=False):
+    """Membandingkan data section dari duckdb_frames() dengan jalur pandas; {bagian: sama?}
+
+    Dengan approx=True median imputasi berasal dari sketch yang berbeda (ingest
+    vs approx_quantile DuckDB), jadi bucket reaksi yang diimputasi bisa berbeda.
+    """
+    tables = load_clean_tables(source, typed, approx)
+    integrated, posts, reactions = build_integrated_dataset(*tables)
+    expected = SectionData(*tables, integrated, posts, reactions, 'pandas')
+    frames = duckdb_frames(source, typed, approx)
+    actual = SectionData.from_frames(*frames, 'duckdb')
+    try:
+        pd.testing.assert_frame_equal(expected.integrated_data, actual.integrated_data)
+        same_integrated = True
+    except AssertionError:
+        same_integrated = False
+    return {
+        'integrated': same_integrated,
+        'friends': np.array_equal(tables[1][['Friend 1', 'Friend 2']].to_numpy(),
+                                  actual.friends.to_numpy()),
+        'summary': _same_summary(expected.summary, actual.summary),
+        'reaction_counts': _nonzero(expected.reaction_counts) == _nonzero(actual.reaction_counts),
+        'post_type_counts': _nonzero(expected.post_type_counts) == _nonzero(actual.post_type_counts),
+        'rollup': _same_rollup(expected.rollup.reactions, actual.rollup.reactions)
+                  and _same_rollup(expected.rollup.posts, actual.rollup.posts),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Cek backend DuckDB terhadap jalur pandas')
+    parser.add_argument('--source', default=None, help='folder/URL data (default: SOSMED_DATA_DIR)')
+    parser.add_argument('--untyped', action='store_true', help='pakai dtype bawaan pandas')
+    parser.add_argument('--approx', action='store_true', help='median imputasi dari sketch')
+    args = parser.parse_args(argv)
+
+    results = check_against_pandas(args.source, not args.untyped, args.approx)
+    for name, equal in results.items():
+        print(f"{name}: {'sama' if equal else 'BERBEDA'}")
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""Benchmark skala untuk seluruh pipeline dengan data sintetis.
+
+Untuk setiap skala (jumlah reaksi, 10^4 s.d. 10^8) dataset sintetis
+deterministik ditulis ke CSV (lihat analisis/synthetic.py), lalu setiap tahap
+pipeline (parsing, snapshot, cleaning, integrasi, metrik graf) dan builder
+tiap bagian section dashboard (analisis/sections.py, termasuk figur) diukur
+waktu dan puncak memorinya. Hasil tiap run ditambahkan ke riwayat JSON Lines agar bisa dibandingkan antar commit.
+
+    python -m analisis.benchmark --scale 1e4 --scale 1e6
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from analisis.aggregation import build_integrated_dataset
+from analisis.cleaning import clean_tables
+from analisis.figure_cache import FigureCache
+from analisis.graph import FriendGraph, add_graph_metrics
+from analisis.profiling import Profiler, tracing, use
+from analisis.sections import SECTIONS, SectionData, SectionPrewarmer
+from analisis.snapshot import cache_dir, load_tables
+from analisis.synthetic import write_dataset
+
+HISTORY_PATH = os.path.join('benchmarks', 'history.jsonl')
+DEFAULT_SCALES = [10**4, 10**5]
+
+
+# Bagian yang membaca kolom metrik graf (pagerank, clustering, ...) dari dataset
+# terintegrasi; ikut dilewati bila graph_metrics di-skip
+GRAPH_METRIC_SECTIONS = {'korelasi.matrix', 'jaringan'}
+
+
+def _skipped(name, skip):
+    """Bagian section dilewati jika namanya atau section induknya ada di skip"""
+    if name in skip or name.split('.')[0] in skip:
+        return True
+    return 'graph_metrics' in skip and name in GRAPH_METRIC_SECTIONS
+
+
+@contextlib.contextmanager
+def _snapshot_env(path):
+    """SOSMED_SNAPSHOT_DIR=path selama blok, lalu nilai sebelumnya dipulihkan"""
+    previous = os.environ.get('SOSMED_SNAPSHOT_DIR')
+    os.environ['SOSMED_SNAPSHOT_DIR'] = path
+    try:
+        yield path
+    finally:
+        if previous is None:
+            os.environ.pop('SOSMED_SNAPSHOT_DIR', None)
+        else:
+            os.environ['SOSMED_SNAPSHOT_DIR'] = previous
+
+
+def run_pipeline(source, profiler, skip=(), workers=None, cold_snapshot=None):
+    """Tahap pipeline seperti di dashboard; mengembalikan data untuk builder section.
+
+    cold_snapshot: direktori snapshot milik benchmark yang dikosongkan dulu agar
+    parsing CSV terukur dalam kondisi dingin (None: snapshot tidak disentuh).
+    """
+    if cold_snapshot:
+        shutil.rmtree(cold_snapshot, ignore_errors=True)
+    tables = profiler.run('parse_csv', load_tables, source, typed=True, workers=workers)
+    tables = profiler.run('load_snapshot', load_tables, source, typed=True, workers=workers)
+    tables = profiler.run('clean', clean_tables, *tables, workers=workers)
+    integrated, posts, reactions = profiler.run('integrate', build_integrated_dataset, *tables)
+    if 'graph_metrics' not in skip:
+        with profiler.stage('graph_metrics') as record:
+            graph = FriendGraph.from_friends(tables[1], integrated['user_id'])
+            add_graph_metrics(integrated, graph)
+            record['rows'] = graph.num_edges
+    return SectionData(*tables, integrated, posts, reactions, 'benchmark')
+
+
+def _profile_pass(data_dir, trace_memory, skip, snapshot):
+    # Tahap di dalam modul pipeline (load:*, clean:*, integrate:*) ikut tercatat
+    # Pass memori memuat/membersihkan tabel berurutan agar puncak per tabel tidak
+    # bercampur dengan thread lain (puncak tracemalloc berlaku untuk seluruh proses)
+    profiler = Profiler(trace_memory)
+    with use(profiler), (tracing() if trace_memory else contextlib.nullcontext()):
+        data = run_pipeline(data_dir, profiler, skip, workers=1 if trace_memory else None,
+                            cold_snapshot=snapshot)
+        # Builder section yang sama dengan dashboard (indeks malas, agregasi, figur
+        # terkompresi); cache baru per pass agar setiap bagian dibangun dingin
+        prewarmer = SectionPrewarmer(data, cache=FigureCache())
+        for name in SECTIONS:
+            if not _skipped(name, skip):
+                profiler.run(f'section:{name}', prewarmer.payload, name)
+    return profiler.records
+
+
+def _stage_key(record):
+    return f"{record['parent']}/{record['stage']}" if record['parent'] else record['stage']
+
+
+def run_scale(n_reactions, seed=0, workdir=None, skip=(), memory=True):
+    """Benchmark satu skala; mengembalikan record hasil"""
+    workdir = workdir or cache_dir('benchmark')
+    data_dir = os.path.join(workdir, f'data-{n_reactions}-{seed}')
+    # Snapshot benchmark selalu di dalam workdir; env proses dipulihkan setelahnya
+    snapshot = os.path.join(workdir, 'snapshot')
+
+    marker = os.path.join(data_dir, 'rows.json')
+    generate_s = None
+    if os.path.exists(marker):
+        with open(marker) as f:
+            rows = json.load(f)
+    else:
+        # Dataset sintetis disimpan per (skala, seed) dan dipakai ulang di run berikutnya
+        started = time.perf_counter()
+        rows = write_dataset(data_dir, n_reactions, seed)
+        generate_s = time.perf_counter() - started
+        with open(marker, 'w') as f:
+            json.dump(rows, f)
+
+    # tracemalloc memperlambat kode yang banyak membuat objek Python, jadi waktu
+    # diukur pada pass tanpa tracing dan puncak memori pada pass kedua
+    with _snapshot_env(snapshot):
+        stages = {_stage_key(r): {'wall_s': r['wall_s'], 'cpu_s': r['cpu_s'], 'peak_mb': None,
+                                  'rows': r['rows']}
+                  for r in _profile_pass(data_dir, False, skip, snapshot)}
+        if memory:
+            for r in _profile_pass(data_dir, True, skip, snapshot):
+                stages[_stage_key(r)]['peak_mb'] = r['peak_mb']
+    return {'scale': int(n_reactions), 'seed': seed, 'rows': rows,
+            'generate_s': generate_s, 'stages': stages}
+
+
+def environment():
+    """Informasi mesin dan commit untuk membandingkan riwayat"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def read_history(path=HISTORY_PATH):
+    """Semua record riwayat benchmark"""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(records, path=HISTORY_PATH):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+def compare(record, history):
+    """Tabel wall time/peak tahap dibanding run terakhir dengan skala & seed sama"""
+    previous = [r for r in history if r['scale'] == record['scale'] and r['seed'] == record['seed']]
+    table = pd.DataFrame(record['stages']).T[['wall_s', 'cpu_s', 'peak_mb', 'rows']]
+    if previous:
+        before = pd.DataFrame(previous[-1]['stages']).T
+        table['prev_wall_s'] = before['wall_s']
+        table['wall_ratio'] = table['wall_s'] / table['prev_wall_s']
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark skala pipeline dengan data sintetis')
+    parser.add_argument('--scale', action='append', type=float,
+                        help='jumlah reaksi (boleh berulang, mis. --scale 1e4 --scale 1e6)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--history', default=HISTORY_PATH, help='file riwayat JSON Lines')
+    parser.add_argument('--workdir', default=None, help='folder data sintetis & snapshot')
+    parser.add_argument('--skip', action='append', default=[],
+                        help='lewati tahap/section tertentu (mis. graph_metrics)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='lewati pass tracemalloc (hanya waktu)')
+    args = parser.parse_args(argv)
+
+    history = read_history(args.history)
+    env = environment()
+    records = []
+    for scale in args.scale or DEFAULT_SCALES:
+        record = {**env, **run_scale(int(scale), args.seed, args.workdir, set(args.skip),
+                                     not args.no_memory)}
+        print(f"\n== {record['scale']:,} reaksi ==")
+        print(compare(record, history).to_string(float_format=lambda v: f'{v:.3f}'))
+        records.append(record)
+    append_history(records, args.history)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Pembersihan keempat tabel sumber (dipakai dashboard dan laporan headless)"""
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+from analisis.dedup import FRIEND_COLUMNS, deduplicate
+from analisis.profiling import stage
+from analisis.ingest import CHUNK_SIZE
+from analisis.sketches import QUANTILE_TABLES, approx_mode, refresh_quantiles, table_sketches
+from analisis.snapshot import TABLE_NAMES, load_table, map_tables
+
+APPROX_SUFFIX = '~approx'
+
+
+def sketch_median(reactions):
+    """Median Reaction Date dari sketch ingest (None jika sketch tidak ada)"""
+    sketch = table_sketches(reactions).get('Reaction Date')
+    if sketch is None or sketch.n == 0:
+        return None
+    median = sketch.quantile(0.5)
+    if is_datetime64_any_dtype(reactions['Reaction Date']):
+        return pd.to_datetime(median, unit='s')
+    return median
+
+
+def clean_reactions(reactions, approx=False):
+    """Hapus reaksi tanpa User, isi Reaction Type (modus) dan Reaction Date (median).
+
+    Dengan approx=True median diambil dari sketch ingest, bukan dihitung ulang.
+    """
+    with stage('clean:reactions_dropna') as record:
+        reactions = reactions.dropna(subset=['User'])
+        record['rows'] = len(reactions)
+    with stage('clean:reactions_fillna') as record:
+        mode_rt = reactions['Reaction Type'].mode()[0]
+        reactions['Reaction Type'] = reactions['Reaction Type'].fillna(mode_rt)
+        median_rd = sketch_median(reactions) if approx else None
+        if median_rd is None:
+            median_rd = reactions['Reaction Date'].median()
+        reactions['Reaction Date'] = reactions['Reaction Date'].fillna(median_rd)
+        record['rows'] = len(reactions)
+    return reactions
+
+
+# Nama pendek tiap tabel (dipakai di nama tahap) dan kolom pertemanan tak berarah
+CLEAN_NAMES = dict(zip(TABLE_NAMES, ['users', 'friends', 'posts', 'reactions']))
+UNDIRECTED_COLUMNS = {'friends_table': FRIEND_COLUMNS}
+
+
+def clean_table(name, df, approx=False):
+    """Membersihkan satu tabel sumber; tabel-tabel saling bebas sampai integrasi"""
+    if name == 'reactions_table':
+        df = clean_reactions(df, approx)
+        if approx:
+            # Hasil imputasi aproksimasi diberi versi dataset tersendiri
+            df.attrs['content_hash'] = f"{df.attrs.get('content_hash', '')}{APPROX_SUFFIX}"
+
+    # Remove duplicates (hash baris 64-bit; pertemanan (A,B) dan (B,A) dianggap sama)
+    with stage(f'clean:dedup_{CLEAN_NAMES[name]}') as record:
+        df, report = deduplicate(df, undirected=UNDIRECTED_COLUMNS.get(name))
+        record['rows'] = len(df)
+
+    if approx and name in QUANTILE_TABLES and (report['duplicate_rows'] or name == 'reactions_table'):
+        # Sketch kuantil ingest mencakup duplikat (dan belum berisi tanggal imputasi); bangun
+        # ulang atas baris bersih. HyperLogLog tidak berubah oleh dedup maupun imputasi.
+        with stage(f'clean:sketch_{CLEAN_NAMES[name]}') as record:
+            df = refresh_quantiles(name, df, CHUNK_SIZE)
+            record['rows'] = len(df)
+    return df
+
+
+def clean_tables(users, friends, posts, reactions, approx=False, workers=None):
+    """Membersihkan keempat tabel dan membuang duplikat (per tabel di thread pool)"""
+    tables = dict(zip(TABLE_NAMES, [users, friends, posts, reactions]))
+    return tuple(map_tables(lambda name: clean_table(name, tables[name], approx), workers=workers))
+
+
+def load_clean_tables(source=None, typed=True, approx=None, workers=None):
+    """Memuat (lewat snapshot) lalu membersihkan keempat tabel (approx default dari SOSMED_APPROX).
+
+    Setiap tabel diunduh, dimuat, dan dibersihkan di thread-nya sendiri, jadi
+    waktu mulai dingin mengikuti tabel yang paling lambat.
+    """
+    if approx is None:
+        approx = approx_mode()
+    return tuple(map_tables(lambda name: clean_table(name, load_table(name, source, typed), approx),
+                            workers=workers))
@@ -0,0 +1,102 @@
+"""Kubus agregat untuk heatmap demografi dan Insights.
+
+Sel dasar kubus adalah Age (per tahun usia) x registration_year x
+activity_level. Untuk setiap metrik disimpan count, sum, dan sum of squares,
+sehingga mean/std/idxmax pada irisan atau roll-up apa pun (termasuk ke
+age_group) dihitung dari kubus tanpa memindai ulang tabel pengguna.
+"""
+import numpy as np
+import pandas as pd
+
+from analisis.features import AGE_GROUP_LABELS, age_group
+
+CUBE_METRICS = ['friend_count', 'post_count', 'reactions_given',
+                'reactions_received', 'total_activity', 'engagement_ratio']
+BASE_DIMENSIONS = ['Age', 'registration_year', 'activity_level']
+
+
+class AggregateCube:
+    """Kubus count/sum/sum-of-squares per metrik"""
+
+    def __init__(self, integrated_data, metrics=CUBE_METRICS):
+        self.metrics = list(metrics)
+        codes = []
+        self.levels = {}
+        for dim in BASE_DIMENSIONS:
+            series = integrated_data[dim]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Pertahankan semua kategori (termasuk yang kosong) sesuai urutannya
+                dim_codes, levels = series.cat.codes, series.cat.categories
+            else:
+                dim_codes, levels = pd.factorize(series, sort=True)
+            codes.append(np.asarray(dim_codes))
+            self.levels[dim] = pd.Index(levels, name=dim)
+
+        shape = tuple(len(self.levels[dim]) for dim in BASE_DIMENSIONS)
+        valid = np.all([c >= 0 for c in codes], axis=0)
+        cell = np.ravel_multi_index([c[valid] for c in codes], shape)
+        size = int(np.prod(shape))
+
+        self.count = np.bincount(cell, minlength=size).reshape(shape).astype(np.float64)
+        self.sum = {}
+        self.sumsq = {}
+        for metric in self.metrics:
+            values = integrated_data[metric].to_numpy(dtype=np.float64)[valid]
+            self.sum[metric] = np.bincount(cell, weights=values, minlength=size).reshape(shape)
+            self.sumsq[metric] = np.bincount(cell, weights=values * values, minlength=size).reshape(shape)
+
+        # Peta usia -> kelompok usia untuk roll-up ke age_group
+        group_codes = np.asarray(age_group(self.levels['Age']).codes)
+        self._age_groups = np.zeros((len(self.levels['Age']), len(AGE_GROUP_LABELS)))
+        known = group_codes >= 0
+        self._age_groups[np.flatnonzero(known), group_codes[known]] = 1.0
+
+    def _rollup(self, array, by):
+        """Jumlahkan array sel dasar ke dimensi by (urut sesuai by)"""
+        if 'age_group' in by:
+            array = np.tensordot(array, self._age_groups, axes=([0], [0]))
+            dims = ['registration_year', 'activity_level', 'age_group']
+        else:
+            dims = list(BASE_DIMENSIONS)
+        drop = tuple(i for i, dim in enumerate(dims) if dim not in by)
+        array = array.sum(axis=drop)
+        kept = [dim for dim in dims if dim in by]
+        return np.transpose(array, [kept.index(dim) for dim in by])
+
+    def _index(self, by):
+        levels = [pd.CategoricalIndex(AGE_GROUP_LABELS, categories=AGE_GROUP_LABELS, ordered=True, name='age_group')
+                  if dim == 'age_group' else self.levels[dim] for dim in by]
+        if len(levels) == 1:
+            return levels[0]
+        return pd.MultiIndex.from_product(levels)
+
+    def aggregate(self, by, metric='total_activity', stat='mean'):
+        """Statistik (count/sum/mean/std) metrik per kombinasi dimensi by.
+
+        by berisi nama dari Age, age_group, registration_year, activity_level.
+        Kombinasi tanpa pengguna bernilai NaN (kecuali count).
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        if not isinstance(metric, str):
+            return pd.DataFrame({m: self.aggregate(by, m, stat) for m in metric})
+
+        n = self._rollup(self.count, by)
+        total = self._rollup(self.sum[metric], by)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if stat == 'count':
+                values = n.astype(np.int64)
+            elif stat == 'sum':
+                values = total
+            elif stat == 'mean':
+                values = np.where(n > 0, total / n, np.nan)
+            elif stat == 'std':
+                squares = self._rollup(self.sumsq[metric], by)
+                variance = (squares - total * total / n) / (n - 1)
+                values = np.where(n > 1, np.sqrt(np.maximum(variance, 0)), np.nan)
+            else:
+                raise ValueError(f"Statistik tidak dikenal: {stat}")
+        return pd.Series(values.ravel(), index=self._index(by), name=metric)
+
+    def heatmap(self, rows, columns, metric='total_activity', stat='mean'):
+        """Tabel 2 dimensi (rows x columns) untuk heatmap"""
+        return self.aggregate([rows, columns], metric, stat).unstack(columns)
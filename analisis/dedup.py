@@ -0,0 +1,144 @@
+"""Deduplikasi berbasis hash baris 64-bit.
+
+Setiap baris di-hash secara vektor (pd.util.hash_pandas_object), duplikat
+dicari pada array hash, lalu kandidat duplikat diverifikasi terhadap baris
+pertamanya agar tabrakan hash tidak menghapus data. Untuk tabel edge tak
+berarah, pasangan (A, B) dan (B, A) dianggap baris yang sama.
+
+Kesetaraan dengan DataFrame.duplicated (termasuk saat hash bertabrakan) bisa
+dicek pada tabel sumber:
+
+    python -m analisis.dedup --bits 4
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analisis.snapshot import TABLE_NAMES, load_tables
+
+FRIEND_COLUMNS = ('Friend 1', 'Friend 2')
+
+
+def _key_frame(df, undirected=None):
+    """Frame pembanding; kolom edge tak berarah diurutkan menjadi (min, max)"""
+    if not undirected:
+        return df
+    first, second = undirected
+    a = df[first].to_numpy()
+    b = df[second].to_numpy()
+    key = df.drop(columns=[first, second])
+    key.insert(0, first, np.minimum(a, b))
+    key.insert(1, second, np.maximum(a, b))
+    return key
+
+
+def row_hashes(df, undirected=None):
+    """Hash uint64 per baris (index tidak ikut di-hash)"""
+    return pd.util.hash_pandas_object(_key_frame(df, undirected), index=False).to_numpy()
+
+
+def _same_rows(key, left, right):
+    """Perbandingan isi baris left[i] vs right[i], NaN dianggap sama"""
+    same = np.ones(len(left), dtype=bool)
+    for col in key.columns:
+        values = key[col]
+        a = values.iloc[left].reset_index(drop=True)
+        b = values.iloc[right].reset_index(drop=True)
+        equal = (a == b).fillna(False) | (a.isna() & b.isna())
+        same &= equal.to_numpy(dtype=bool)
+    return same
+
+
+def _verified_duplicates(df, undirected=None, hashes=None):
+    """(mask baris duplikat selain kemunculan pertama, posisi baris pertama grupnya, jumlah tabrakan)
+
+    Grup adalah baris yang isinya benar-benar sama (sudah diverifikasi), bukan
+    sekadar hash yang sama. hashes boleh diberikan, mis. hash terpotong untuk
+    memaksa tabrakan saat pengecekan.
+    """
+    key = _key_frame(df, undirected)
+    if hashes is None:
+        hashes = row_hashes(df, undirected)
+    _, first_index, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+    group = first_index[inverse.reshape(-1)]
+    candidates = np.flatnonzero(group != np.arange(len(df)))
+
+    same = _same_rows(key, candidates, group[candidates])
+
+    # Tabrakan hash: grup ditentukan ulang secara eksak di antara baris yang bertabrakan saja
+    collided = candidates[~same]
+    if len(collided) > 0:
+        codes = key.iloc[collided].groupby(list(key.columns), dropna=False, sort=False,
+                                           observed=True).ngroup().to_numpy()
+        _, code_first = np.unique(codes, return_index=True)
+        group[collided] = collided[code_first[codes]]
+    duplicate = group != np.arange(len(df))
+    return duplicate, group, len(collided)
+
+
+def duplicate_mask(df, undirected=None, keep='first', hashes=None):
+    """Seperti DataFrame.duplicated: keep='first' atau keep=False (semua anggota grup)"""
+    duplicate, group, _ = _verified_duplicates(df, undirected, hashes)
+    if keep is False:
+        return np.bincount(group, minlength=len(df))[group] > 1
+    return duplicate
+
+
+def check_against_pandas(df, undirected=None, hash_bits=4):
+    """True jika duplicate_mask sama dengan DataFrame.duplicated, dengan hash dipotong
+    menjadi hash_bits bit agar tabrakan pasti terjadi"""
+    key = _key_frame(df, undirected)
+    hashes = row_hashes(df, undirected) & np.uint64((1 << hash_bits) - 1)
+    return all(np.array_equal(duplicate_mask(df, undirected, keep, hashes),
+                              key.duplicated(keep=keep).to_numpy())
+               for keep in ('first', False))
+
+
+def deduplicate(df, undirected=None):
+    """Membuang baris duplikat; mengembalikan (frame bersih, laporan ringkas)"""
+    duplicate, group, collisions = _verified_duplicates(df, undirected)
+    report = {
+        'rows': len(df),
+        'duplicate_rows': int(duplicate.sum()),
+        'distinct_rows': int(len(df) - duplicate.sum()),
+        'hash_collisions': collisions,
+    }
+    if undirected:
+        first_col = undirected[0]
+        values = df[first_col].to_numpy()
+        # Duplikat yang orientasinya terbalik dari kemunculan pertamanya
+        reversed_pairs = duplicate & (values != values[group])
+        report['reversed_pairs'] = int(reversed_pairs.sum())
+    result = df[~duplicate]
+    result.attrs['dedup'] = report
+    return result, report
+
+
+def dedup_report(*tables):
+    """Ringkasan deduplikasi per tabel dari atribut df.attrs['dedup']"""
+    rows = [
+        {'table': df.attrs.get('ingest', {}).get('table', ''), **df.attrs['dedup']}
+        for df in tables if 'dedup' in df.attrs
+    ]
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Cek deduplikasi hash terhadap DataFrame.duplicated')
+    parser.add_argument('--source', default=None, help='folder/URL data (default: SOSMED_DATA_DIR)')
+    parser.add_argument('--bits', type=int, default=4, help='lebar hash terpotong untuk memaksa tabrakan')
+    args = parser.parse_args(argv)
+
+    ok = True
+    for name, df in zip(TABLE_NAMES, load_tables(args.source, typed=True)):
+        undirected = FRIEND_COLUMNS if name == 'friends_table' else None
+        equal = check_against_pandas(df, undirected, args.bits)
+        print(f"{name}: {'sama' if equal else 'BERBEDA'}")
+        ok &= equal
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
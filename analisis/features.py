@@ -0,0 +1,99 @@
+"""Registri kolom turunan untuk dataset terintegrasi.
+
+Setiap kolom turunan dideklarasikan sekali beserta kolom yang dibutuhkannya,
+lalu dihitung secara vektor (tanpa apply per baris). Kolom yang sudah ada
+di frame tidak dihitung ulang.
+"""
+import numpy as np
+import pandas as pd
+
+# Batas kelompok usia, interval tertutup kanan seperti pd.cut: (0, 20], (20, 30], ...
+AGE_GROUP_BINS = [0, 20, 30, 40, 50, 100]
+AGE_GROUP_LABELS = ['<20', '20-29', '30-39', '40-49', '50+']
+
+# total_activity == 0 -> Tidak Aktif, <= 5 -> Rendah, <= 15 -> Sedang, <= 30 -> Tinggi
+ACTIVITY_LEVEL_THRESHOLDS = [0, 5, 15, 30]
+ACTIVITY_LEVEL_LABELS = ['Tidak Aktif', 'Aktivitas Rendah', 'Aktivitas Sedang',
+                         'Aktivitas Tinggi', 'Sangat Aktif']
+
+FEATURES = {}
+
+
+def feature(name, depends):
+    """Dekorator untuk mendaftarkan kolom turunan beserta dependensinya"""
+    def decorator(func):
+        FEATURES[name] = (tuple(depends), func)
+        return func
+    return decorator
+
+
+def binned(values, edges, labels):
+    """Kategori berurutan dari batas interval tertutup kanan (searchsorted)"""
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.searchsorted(edges, values, side='left') - 1
+    codes[(codes < 0) | (codes >= len(labels)) | np.isnan(values)] = -1
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+
+def age_group(age):
+    """Kelompok usia; usia di luar (0, 100] menjadi NaN"""
+    return binned(age, AGE_GROUP_BINS, AGE_GROUP_LABELS)
+
+
+def activity_level(total_activity):
+    """Level aktivitas pengguna berdasarkan total_activity"""
+    total = np.asarray(total_activity, dtype=np.float64)
+    codes = np.searchsorted(ACTIVITY_LEVEL_THRESHOLDS, total, side='left')
+    return pd.Categorical.from_codes(codes, categories=ACTIVITY_LEVEL_LABELS, ordered=True)
+
+
+@feature('age_group', ['Age'])
+def _age_group(df):
+    return age_group(df['Age'])
+
+
+@feature('registration_year', ['Subscription Date'])
+def _registration_year(df):
+    return pd.to_datetime(df['Subscription Date']).dt.year
+
+
+@feature('is_active_poster', ['post_count'])
+def _is_active_poster(df):
+    return df['post_count'] > 0
+
+
+@feature('is_social', ['friend_count'])
+def _is_social(df):
+    return df['friend_count'] > 0
+
+
+@feature('engagement_ratio', ['reactions_received', 'post_count'])
+def _engagement_ratio(df):
+    # +1 untuk menghindari pembagian nol
+    return df['reactions_received'] / (df['post_count'] + 1)
+
+
+@feature('total_activity', ['friend_count', 'post_count', 'reactions_given'])
+def _total_activity(df):
+    return df['friend_count'] + df['post_count'] + df['reactions_given']
+
+
+@feature('activity_level', ['total_activity'])
+def _activity_level(df):
+    return activity_level(df['total_activity'])
+
+
+def compute_features(df, names=None):
+    """Menambahkan kolom turunan ke df (in-place) sesuai urutan dependensi"""
+    def resolve(name):
+        if name in df.columns:
+            return
+        depends, func = FEATURES[name]
+        for dependency in depends:
+            if dependency in FEATURES:
+                resolve(dependency)
+        df[name] = func(df)
+
+    for name in names or FEATURES:
+        resolve(name)
+    return df
@@ -0,0 +1,124 @@
+"""Cache payload section di memori dengan spec figur terkompresi.
+
+Kunci entri adalah (fingerprint dataset, bagian section, params widget),
+mis. ('ab12…', 'top_performers', (('top_n', 15),)). Figur di payload
+disimpan sebagai JSON terkompresi zlib; ukuran total (figur terkompresi
+ditambah tabel kecil di payload) dibatasi SOSMED_FIGURE_CACHE_MB (default 64)
+dan entri yang paling lama tidak dipakai dibuang lebih dulu (LRU).
+
+Figur di-replay langsung dari spec tanpa validasi ulang Plotly: spec berasal
+dari figur yang sudah tervalidasi saat dibangun, dan Streamlit tidak
+memvalidasi ulang objek Figure.
+"""
+import collections
+import json
+import os
+import sys
+import threading
+import zlib
+
+import pandas as pd
+import plotly.graph_objects as go
+
+COMPRESSION_LEVEL = 6
+
+
+def compress_figure(fig):
+    """Spec JSON figur Plotly, terkompresi zlib (None tetap None)"""
+    if fig is None:
+        return None
+    return zlib.compress(fig.to_json().encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def replay_figure(spec):
+    """Figur Plotly dari spec terkompresi, tanpa validasi ulang properti"""
+    if spec is None:
+        return None
+    return go.Figure(json.loads(zlib.decompress(spec)), _validate=False)
+
+
+def payload_bytes(payload):
+    """Perkiraan ukuran payload: figur terkompresi dan frame/series di dalamnya"""
+    size = 0
+    for value in payload.values():
+        if isinstance(value, dict):
+            size += payload_bytes(value)
+        elif isinstance(value, bytes):
+            size += len(value)
+        elif isinstance(value, pd.DataFrame):
+            size += int(value.memory_usage(index=True, deep=True).sum())
+        elif isinstance(value, pd.Series):
+            size += int(value.memory_usage(index=True, deep=True))
+        else:
+            size += sys.getsizeof(value)
+    return size
+
+
+class FigureCache:
+    """Payload per kunci dalam batas byte, dengan eviksi LRU; aman antar thread"""
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('SOSMED_FIGURE_CACHE_MB', 64)) * 2**20
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._build_locks = {}
+
+    def get(self, key):
+        """Payload untuk key (ditandai baru dipakai), atau None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, payload):
+        """Menyimpan payload lalu membuang entri terlama sampai di bawah batas"""
+        size = payload_bytes(payload)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (payload, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        # Entri terbaru selalu dipertahankan walau sendirian melebihi batas
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def get_or_build(self, key, build):
+        """Payload dari cache; jika belum ada, build() dipanggil sekali lalu disimpan.
+
+        Pemanggil lain dengan key yang sama menunggu build yang sedang berjalan.
+        """
+        payload = self.get(key)
+        if payload is not None:
+            return payload
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            payload = self.get(key)
+            if payload is None:
+                payload = build()
+                self.put(key, payload)
+        with self._lock:
+            self._build_locks.pop(key, None)
+        return payload
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def usage(self):
+        """(jumlah entri, total byte) di cache"""
+        with self._lock:
+            return len(self._entries), self._bytes
+
+
+# Cache bersama semua sesi dalam satu proses
+FIGURE_CACHE = FigureCache()
@@ -0,0 +1,131 @@
+"""Indeks rentang untuk panel Eksplorasi Interaktif.
+
+Setiap kolom numerik disimpan dalam urutan terurut beserta prefix sum
+metrik-metriknya, sehingga count dan mean untuk satu rentang cukup dua
+searchsorted. Untuk pasangan kolom yang sering difilter bersama (mis. Age x
+total_activity) dibangun grid prefix sum 2 dimensi atas nilai-nilai unik,
+sehingga kombinasi dua rentang juga dijawab dalam O(log n).
+"""
+import numpy as np
+
+FILTER_COLUMNS = ['Age', 'total_activity', 'friend_count', 'post_count',
+                  'reactions_given', 'reactions_received', 'engagement_ratio']
+FILTER_METRICS = ['total_activity', 'engagement_ratio', 'friend_count', 'post_count']
+FILTER_PAIRS = [('Age', 'total_activity')]
+
+# Batas ukuran grid 2D (sel); pasangan yang lebih besar memakai jalur seleksi
+MAX_GRID_CELLS = 5_000_000
+
+
+def _bounds(values, lo, hi):
+    """Posisi [start, stop) nilai dalam rentang [lo, hi] pada array terurut"""
+    start = 0 if lo is None else np.searchsorted(values, lo, side='left')
+    stop = len(values) if hi is None else np.searchsorted(values, hi, side='right')
+    return start, max(start, stop)
+
+
+class FilterIndex:
+    """Indeks terurut + prefix sum untuk query rentang pada dataset terintegrasi"""
+
+    def __init__(self, integrated_data, columns=FILTER_COLUMNS, metrics=FILTER_METRICS, pairs=FILTER_PAIRS):
+        self.data = integrated_data
+        self.metrics = list(metrics)
+        metric_values = {m: integrated_data[m].to_numpy(dtype=np.float64) for m in self.metrics}
+
+        self.order = {}
+        self.sorted_values = {}
+        self.prefix = {}
+        for col in columns:
+            values = integrated_data[col].to_numpy(dtype=np.float64)
+            order = np.argsort(values, kind='stable')
+            self.order[col] = order
+            self.sorted_values[col] = values[order]
+            self.prefix[col] = {
+                m: np.concatenate([[0.0], np.cumsum(metric_values[m][order])]) for m in self.metrics
+            }
+
+        self.grids = {}
+        for first, second in pairs:
+            self._build_grid(first, second, metric_values)
+
+    def _build_grid(self, first, second, metric_values):
+        levels_a = np.unique(self.sorted_values[first])
+        levels_b = np.unique(self.sorted_values[second])
+        shape = (len(levels_a), len(levels_b))
+        if shape[0] * shape[1] > MAX_GRID_CELLS:
+            return
+        cell = np.ravel_multi_index((
+            np.searchsorted(levels_a, self.data[first].to_numpy(dtype=np.float64)),
+            np.searchsorted(levels_b, self.data[second].to_numpy(dtype=np.float64)),
+        ), shape)
+        size = shape[0] * shape[1]
+
+        def prefix_2d(weights):
+            grid = np.bincount(cell, weights=weights, minlength=size).reshape(shape)
+            out = np.zeros((shape[0] + 1, shape[1] + 1))
+            out[1:, 1:] = grid.cumsum(axis=0).cumsum(axis=1)
+            return out
+
+        sums = {m: prefix_2d(metric_values[m]) for m in self.metrics}
+        self.grids[(first, second)] = (levels_a, levels_b, prefix_2d(None), sums)
+
+    def bounds(self, column):
+        """(min, max) kolom terindeks"""
+        values = self.sorted_values[column]
+        return values[0], values[-1]
+
+    def _single(self, column, lo, hi):
+        start, stop = _bounds(self.sorted_values[column], lo, hi)
+        prefix = self.prefix[column]
+        sums = {m: prefix[m][stop] - prefix[m][start] for m in self.metrics}
+        return stop - start, sums
+
+    def _pair(self, key, ranges):
+        levels_a, levels_b, count, sums = self.grids[key]
+        a0, a1 = _bounds(levels_a, *ranges[key[0]])
+        b0, b1 = _bounds(levels_b, *ranges[key[1]])
+
+        def box(prefix):
+            return prefix[a1, b1] - prefix[a0, b1] - prefix[a1, b0] + prefix[a0, b0]
+
+        return int(round(box(count))), {m: box(sums[m]) for m in self.metrics}
+
+    def select_positions(self, ranges):
+        """Posisi baris yang memenuhi semua rentang (berbiaya O(ukuran irisan))"""
+        ranges = dict(ranges)
+        # Mulai dari kolom dengan irisan terkecil, lalu saring kolom lainnya
+        slices = {col: _bounds(self.sorted_values[col], *bounds) for col, bounds in ranges.items()}
+        first = min(slices, key=lambda col: slices[col][1] - slices[col][0])
+        start, stop = slices[first]
+        positions = np.sort(self.order[first][start:stop])
+        for col, (lo, hi) in ranges.items():
+            if col == first:
+                continue
+            values = self.data[col].to_numpy(dtype=np.float64)[positions]
+            keep = np.ones(len(positions), dtype=bool)
+            if lo is not None:
+                keep &= values >= lo
+            if hi is not None:
+                keep &= values <= hi
+            positions = positions[keep]
+        return positions
+
+    def select(self, ranges):
+        """Baris dataset yang memenuhi semua rentang {kolom: (lo, hi)}; None = terbuka"""
+        return self.data.iloc[self.select_positions(ranges)]
+
+    def stats(self, ranges):
+        """(count, {metrik: mean}) untuk kombinasi rentang {kolom: (lo, hi)}"""
+        ranges = dict(ranges)
+        columns = tuple(ranges)
+        if len(columns) == 1:
+            count, sums = self._single(columns[0], *ranges[columns[0]])
+        elif columns in self.grids or columns[::-1] in self.grids:
+            key = columns if columns in self.grids else columns[::-1]
+            count, sums = self._pair(key, ranges)
+        else:
+            positions = self.select_positions(ranges)
+            count = len(positions)
+            sums = {m: self.data[m].to_numpy(dtype=np.float64)[positions].sum() for m in self.metrics}
+        means = {m: (sums[m] / count if count else np.nan) for m in self.metrics}
+        return count, means
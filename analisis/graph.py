@@ -0,0 +1,209 @@
+"""Struktur graf pertemanan dalam format CSR (compressed sparse row).
+
+Setiap baris tabel friends adalah edge tak berarah, disimpan dua arah.
+Tetangga pengguna ke-i adalah indices[indptr[i]:indptr[i + 1]], sehingga
+derajat, tetangga, teman bersama, dan jangkauan k-hop cukup O(edge).
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+from analisis.aggregation import DenseIndex
+
+# Di bawah jumlah edge ini proses pool tidak sebanding dengan overhead-nya
+PARALLEL_MIN_EDGES = 200_000
+# Batas jumlah jalur panjang 2 per blok baris saat menghitung segitiga
+TRIANGLE_BLOCK_WORK = 20_000_000
+
+
+def _pool_context():
+    """Konteks proses tanpa fork: dashboard berjalan multithread (server Streamlit dan
+    worker prewarm), dan fork dari proses multithread bisa deadlock pada lock yang diwarisi"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _gather(indptr, indices, nodes):
+    """Gabungan tetangga dari sekumpulan node tanpa loop Python"""
+    starts = indptr[nodes]
+    lengths = indptr[nodes + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return indices[offsets + np.arange(total)]
+
+
+class FriendGraph:
+    """Graf pertemanan CSR atas posisi padat pengguna"""
+
+    def __init__(self, indptr, indices, user_ids):
+        self.indptr = indptr
+        self.indices = indices
+        self.user_ids = np.asarray(user_ids, dtype=np.int64)
+        self.index = DenseIndex(self.user_ids)
+
+    @classmethod
+    def from_friends(cls, friends, user_ids):
+        """Membangun CSR dari kolom Friend 1/Friend 2; edge ke non-pengguna dibuang"""
+        index = DenseIndex(user_ids)
+        a = index.positions(friends['Friend 1'])
+        b = index.positions(friends['Friend 2'])
+        valid = (a >= 0) & (b >= 0)
+        a, b = a[valid], b[valid]
+        src = np.concatenate([a, b])
+        dst = np.concatenate([b, a])
+        order = np.lexsort((dst, src))
+        indptr = np.zeros(index.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=index.size), out=indptr[1:])
+        indices = dst[order].astype(np.int32 if index.size < 2**31 else np.int64)
+        return cls(indptr, indices, user_ids)
+
+    @property
+    def num_nodes(self):
+        return len(self.user_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.indices) // 2
+
+    def degrees(self):
+        """Derajat semua pengguna (sama dengan friend_count)"""
+        return np.diff(self.indptr)
+
+    def _position(self, user_id):
+        pos = self.index.positions([user_id])[0]
+        if pos < 0:
+            raise KeyError(f"user_id {user_id} tidak ada di graf")
+        return pos
+
+    def degree(self, user_id):
+        pos = self._position(user_id)
+        return int(self.indptr[pos + 1] - self.indptr[pos])
+
+    def neighbors(self, user_id):
+        """user_id teman-teman seorang pengguna (urut, tanpa duplikat)"""
+        pos = self._position(user_id)
+        return self.user_ids[np.unique(self.indices[self.indptr[pos]:self.indptr[pos + 1]])]
+
+    def mutual_friends(self, user_a, user_b):
+        """Jumlah teman bersama dua pengguna"""
+        return len(np.intersect1d(self.neighbors(user_a), self.neighbors(user_b), assume_unique=True))
+
+    def k_hop(self, user_id, k):
+        """Jumlah pengguna baru yang terjangkau pada hop 1..k (BFS per frontier)"""
+        visited = np.zeros(self.num_nodes, dtype=bool)
+        frontier = np.array([self._position(user_id)])
+        visited[frontier] = True
+        counts = []
+        for _ in range(k):
+            reached = np.unique(_gather(self.indptr, self.indices, frontier))
+            frontier = reached[~visited[reached]]
+            visited[frontier] = True
+            counts.append(len(frontier))
+            if len(frontier) == 0:
+                break
+        return counts + [0] * (k - len(counts))
+
+    def adjacency(self):
+        """Matriks ketetanggaan biner simetris (tanpa edge ganda dan self-loop)"""
+        n = self.num_nodes
+        matrix = sp.csr_matrix(
+            (np.ones(len(self.indices), dtype=np.float64), self.indices, self.indptr),
+            shape=(n, n),
+            copy=True
+        )
+        matrix.setdiag(0)
+        matrix.eliminate_zeros()
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0
+        return matrix
+
+
+_worker_matrix = None
+
+
+def _init_worker(data, indices, indptr, shape):
+    global _worker_matrix
+    _worker_matrix = sp.csr_matrix((data, indices, indptr), shape=shape)
+
+
+def _triangles_block(bounds):
+    start, stop = bounds
+    rows = _worker_matrix[start:stop]
+    # (A[rows] @ A) * A[rows]: jumlah jalur panjang 2 yang menutup segitiga
+    return np.asarray((rows @ _worker_matrix).multiply(rows).sum(axis=1)).ravel() / 2
+
+
+def _row_blocks(adjacency, n_blocks):
+    """Batas blok baris dengan beban (jumlah jalur panjang 2) seimbang dan terbatas"""
+    n = adjacency.shape[0]
+    degree = np.diff(adjacency.indptr).astype(np.float64)
+    work = np.cumsum(adjacency @ degree)
+    total = work[-1] if n else 0
+    # Blok dengan hub tidak boleh membuat A[rows] @ A melebihi TRIANGLE_BLOCK_WORK
+    n_blocks = max(n_blocks, int(np.ceil(total / TRIANGLE_BLOCK_WORK)), 1)
+    cuts = np.searchsorted(work, np.arange(1, n_blocks) * total / n_blocks)
+    edges = np.unique(np.concatenate([[0], cuts, [n]]))
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def triangle_counts(adjacency, workers=None):
+    """Jumlah segitiga per node, dibagi per blok baris ke proses pool"""
+    workers = workers or os.cpu_count() or 1
+    args = (adjacency.data, adjacency.indices, adjacency.indptr, adjacency.shape)
+    if workers == 1 or adjacency.nnz < 2 * PARALLEL_MIN_EDGES:
+        _init_worker(*args)
+        blocks = [_triangles_block(bounds) for bounds in _row_blocks(adjacency, 1)]
+    else:
+        with ProcessPoolExecutor(workers, mp_context=_pool_context(),
+                                 initializer=_init_worker, initargs=args) as pool:
+            blocks = list(pool.map(_triangles_block, _row_blocks(adjacency, workers * 4)))
+    return np.concatenate(blocks) if blocks else np.zeros(0)
+
+
+def pagerank(adjacency, damping=0.85, tol=1e-10, max_iter=100):
+    """PageRank dengan iterasi pangkat atas matriks sparse"""
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.empty(0)
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = degree == 0
+    inv_degree = np.divide(1.0, degree, out=np.zeros(n), where=~dangling)
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        spread = adjacency.T @ (rank * inv_degree)
+        new_rank = damping * (spread + rank[dangling].sum() / n) + (1 - damping) / n
+        if np.abs(new_rank - rank).sum() < tol:
+            return new_rank
+        rank = new_rank
+    return rank
+
+
+def graph_metrics(graph, workers=None):
+    """Komponen terhubung, PageRank, koefisien clustering, dan jumlah segitiga"""
+    adjacency = graph.adjacency()
+    _, labels = connected_components(adjacency, directed=False)
+    component_size = np.bincount(labels)[labels]
+    triangles = triangle_counts(adjacency, workers)
+    degree = np.diff(adjacency.indptr)
+    possible = degree * (degree - 1) / 2
+    clustering = np.divide(triangles, possible, out=np.zeros(len(degree)), where=possible > 0)
+    return {
+        'component_id': labels,
+        'component_size': component_size,
+        'pagerank': pagerank(adjacency),
+        'clustering_coefficient': clustering,
+        'triangle_count': triangles.astype(np.int64),
+    }
+
+
+def add_graph_metrics(integrated_data, graph, workers=None):
+    """Menambahkan kolom metrik graf ke dataset terintegrasi (in-place)"""
+    for name, values in graph_metrics(graph, workers).items():
+        integrated_data[name] = values
+    return integrated_data
@@ -0,0 +1,91 @@
+"""Ingest CSV bertahap (chunked) dengan skema dtype yang ringkas.
+
+Mode typed membaca setiap tabel per potongan dengan skema eksplisit:
+id int32, kolom teks berulang sebagai category, Age int8, dan kolom epoch
+yang langsung dikonversi ke datetime64 di tiap potongan.
+
+Kedua mode juga membangun sketch statistik (jumlah unik, kuantil) per
+potongan dan menggabungkannya ke df.attrs['sketches'] (lihat
+analisis/sketches.py).
+"""
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from analisis.profiling import MB, Profiler, tracing
+from analisis.sketches import attach_sketches, merge_sketches, sketch_chunk, sketch_frame
+
+DATE_COLUMNS = {
+    'user_table': 'Subscription Date',
+    'posts_table': 'Post Date',
+    'reactions_table': 'Reaction Date',
+}
+
+# Age memakai int8 (bukan uint8) karena data sumber memuat usia negatif
+# yang harus tetap terlihat oleh filter validasi usia.
+SCHEMAS = {
+    'user_table': {
+        'Surname': 'category', 'Name': 'category',
+        'Age': 'int8', 'Subscription Date': 'int64',
+    },
+    'friends_table': {'Friend 1': 'int32', 'Friend 2': 'int32'},
+    'posts_table': {'User': 'int32', 'Post Type': 'category', 'Post Date': 'int64'},
+    # Kolom reactions bisa kosong, jadi id memakai Int32 nullable dan epoch float64
+    'reactions_table': {'User': 'Int32', 'Reaction Type': 'category', 'Reaction Date': 'float64'},
+}
+
+CHUNK_SIZE = 1_000_000
+
+
+def convert_epoch(series):
+    """Epoch detik -> datetime64[ns] (NaN menjadi NaT)"""
+    return pd.to_datetime(series, unit='s').astype('datetime64[ns]')
+
+
+def read_default_csv(path, name):
+    """Parse CSV dengan dtype bawaan pandas, hanya kolom tanggal yang dikonversi"""
+    df = pd.read_csv(path)
+    date_col = DATE_COLUMNS.get(name)
+    if date_col in df.columns:
+        df[date_col] = convert_epoch(df[date_col])
+    return attach_sketches(df, sketch_frame(name, df, CHUNK_SIZE))
+
+
+def _concat_chunks(chunks):
+    if len(chunks) == 1:
+        return chunks[0]
+    # Samakan kategori antar potongan agar hasil concat tetap category
+    for col in chunks[0].select_dtypes('category').columns:
+        categories = union_categoricals([chunk[col] for chunk in chunks]).categories
+        for chunk in chunks:
+            chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def read_typed_csv(path, name, chunksize=CHUNK_SIZE):
+    """Membaca CSV per potongan dengan skema SCHEMAS[name]"""
+    date_col = DATE_COLUMNS.get(name)
+    chunks = []
+    sketches = None
+    with pd.read_csv(path, dtype=SCHEMAS[name], chunksize=chunksize) as reader:
+        for chunk in reader:
+            if date_col:
+                chunk[date_col] = convert_epoch(chunk[date_col])
+            sketches = merge_sketches(sketches, sketch_chunk(name, chunk))
+            chunks.append(chunk)
+    if not chunks:
+        df = pd.read_csv(path, dtype=SCHEMAS[name])
+        return attach_sketches(df, sketch_chunk(name, df))
+    return attach_sketches(_concat_chunks(chunks), sketches)
+
+
+def measure_peak(func, *args, **kwargs):
+    """Menjalankan func dan mengembalikan (hasil, puncak alokasi dalam byte)"""
+    with tracing(), Profiler(trace_memory=True).stage(getattr(func, '__name__', 'func')) as record:
+        result = func(*args, **kwargs)
+    return result, int(record['peak_mb'] * MB)
+
+
+def ingest_report(*tables):
+    """Ringkasan memori ingest per tabel dari atribut df.attrs['ingest']"""
+    rows = [df.attrs['ingest'] for df in tables if 'ingest' in df.attrs]
+    return pd.DataFrame(rows, columns=['table', 'mode', 'rows', 'peak_mb', 'peak_shared', 'resident_mb'])
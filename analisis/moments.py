@@ -0,0 +1,142 @@
+"""Akumulator momen untuk korelasi dan garis tren.
+
+MomentAccumulator menyimpan jumlah baris, rata-rata, dan matriks co-moment
+(jumlah hasil kali simpangan) untuk semua metrik numerik pengguna. Baris baru
+bisa ditambahkan lewat update() dan akumulator antar potongan digabung lewat
+merge() (rumus paralel Chan dkk.), jadi korelasi Pearson, kemiringan/intersep
+OLS, dan selang kepercayaannya cukup dibaca dari momen tanpa memindai ulang
+data. Min/max per kolom ikut disimpan untuk ujung garis tren. Korelasi
+Spearman dihitung dari akumulator atas rank rata-rata.
+"""
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+MOMENT_COLUMNS = ['Age', 'friend_count', 'post_count', 'reactions_given', 'reactions_received',
+                  'total_activity', 'engagement_ratio', 'pagerank', 'clustering_coefficient',
+                  'triangle_count']
+CHUNK_SIZE = 1_000_000
+
+
+def average_ranks(values, order=None):
+    """Rank naik (mulai 1) dengan rata-rata untuk nilai kembar, seperti Series.rank().
+
+    order (argsort naik dari values) boleh diberikan agar tidak diurutkan ulang.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if order is None:
+        order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    # Awal tiap kelompok nilai kembar pada urutan terurut
+    starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+    ends = np.r_[starts[1:], len(values)]
+    ranks = np.empty(len(values))
+    ranks[order] = np.repeat((starts + ends + 1) / 2, ends - starts)
+    return ranks
+
+
+class MomentAccumulator:
+    """count, mean, co-moment, dan min/max beberapa kolom; bisa di-update dan digabung"""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.n = 0
+        self.mean = np.zeros(len(self.columns))
+        self.comoment = np.zeros((len(self.columns), len(self.columns)))
+        self.min = np.full(len(self.columns), np.inf)
+        self.max = np.full(len(self.columns), -np.inf)
+        self._position = {column: i for i, column in enumerate(self.columns)}
+
+    @classmethod
+    def from_frame(cls, df, columns=MOMENT_COLUMNS, chunksize=CHUNK_SIZE):
+        """Akumulator atas kolom yang ada di df, dibangun per potongan"""
+        accumulator = cls([column for column in columns if column in df])
+        for start in range(0, len(df), chunksize):
+            accumulator.update(df.iloc[start:start + chunksize])
+        return accumulator
+
+    def update(self, rows):
+        """Menambahkan baris baru (DataFrame atau array n x kolom)"""
+        if isinstance(rows, pd.DataFrame):
+            rows = rows[self.columns].to_numpy(dtype=np.float64)
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, len(self.columns))
+        # Baris dengan nilai kosong dilewati seluruhnya (listwise)
+        rows = rows[~np.isnan(rows).any(axis=1)]
+        if len(rows) == 0:
+            return self
+        chunk = MomentAccumulator(self.columns)
+        chunk.n = len(rows)
+        chunk.mean = rows.mean(axis=0)
+        centered = rows - chunk.mean
+        chunk.comoment = centered.T @ centered
+        chunk.min, chunk.max = rows.min(axis=0), rows.max(axis=0)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Menggabungkan akumulator lain dengan kolom yang sama"""
+        if other.columns != self.columns:
+            raise ValueError('Akumulator dengan kolom berbeda tidak bisa digabung')
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * self.n * other.n / n
+        self.mean = self.mean + delta * other.n / n
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.n = n
+        return self
+
+    def covariance(self, ddof=1):
+        """Matriks kovarians sampel sebagai DataFrame"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = self.comoment / (self.n - ddof)
+        return pd.DataFrame(covariance, index=self.columns, columns=self.columns)
+
+    def correlation(self, x=None, y=None):
+        """Korelasi Pearson: matriks penuh, atau satu nilai untuk pasangan (x, y)"""
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            matrix = self.comoment / np.outer(std, std)
+        matrix = np.clip(matrix, -1.0, 1.0)
+        np.fill_diagonal(matrix, np.where(std > 0, 1.0, np.nan))
+        if x is not None:
+            return float(matrix[self._position[x], self._position[y]])
+        return pd.DataFrame(matrix, index=self.columns, columns=self.columns)
+
+    def range(self, column):
+        """(min, max) kolom, mis. untuk ujung garis tren"""
+        i = self._position[column]
+        return float(self.min[i]), float(self.max[i])
+
+    def regression(self, x, y, confidence=0.95):
+        """Regresi OLS y = intercept + slope * x beserta selang kepercayaannya"""
+        i, j = self._position[x], self._position[y]
+        sxx, syy, sxy = self.comoment[i, i], self.comoment[j, j], self.comoment[i, j]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = sxy / sxx
+            intercept = self.mean[j] - slope * self.mean[i]
+            # Ragam residu dengan derajat bebas n - 2
+            residual = max(syy - slope * sxy, 0.0) / (self.n - 2)
+            slope_se = np.sqrt(residual / sxx)
+            intercept_se = np.sqrt(residual * (1 / self.n + self.mean[i] ** 2 / sxx))
+        t = stats.t.ppf((1 + confidence) / 2, self.n - 2) if self.n > 2 else np.nan
+        return {
+            'slope': float(slope), 'intercept': float(intercept), 'n': self.n,
+            'slope_ci': (float(slope - t * slope_se), float(slope + t * slope_se)),
+            'intercept_ci': (float(intercept - t * intercept_se), float(intercept + t * intercept_se)),
+            'correlation': self.correlation(x, y),
+        }
+
+
+def spearman_accumulator(df, columns=MOMENT_COLUMNS, orders=None):
+    """Akumulator atas rank rata-rata tiap kolom; correlation() menjadi Spearman.
+
+    orders boleh berisi argsort naik per kolom yang sudah ada (mis. dari indeks
+    terurut) agar kolom itu tidak diurutkan ulang.
+    """
+    orders = orders or {}
+    columns = [column for column in columns if column in df]
+    ranks = np.column_stack([average_ranks(df[column].to_numpy(dtype=np.float64), orders.get(column))
+                             for column in columns])
+    return MomentAccumulator(columns).update(ranks)
@@ -0,0 +1,210 @@
+"""Pengukuran waktu dan memori per tahap pipeline.
+
+Profiler.stage() mencatat wall time, CPU time, puncak alokasi (tracemalloc)
+dan jumlah baris untuk satu blok kode. Tahap boleh bersarang, juga antar
+Profiler; puncak tahap luar tetap mencakup puncak tahap di dalamnya.
+
+Modul pipeline memakai stage() yang mencatat ke profiler aktif (default
+PROFILER, dipakai dashboard; ganti sementara lewat use()). Setiap catatan
+juga dikirim sebagai JSON ke logger 'sosmed.perf'; set SOSMED_PERF_LOG=path
+untuk menulisnya ke file JSON Lines.
+
+Tumpukan tahap disimpan per thread; bungkus fungsi yang dijalankan di
+thread pool dengan inherit() agar tahapnya tercatat di bawah tahap pemanggil.
+
+tracemalloc dinyalakan sekali per proses lewat start_memory_tracing()
+(dashboard, hanya jika SOSMED_PERF_MEMORY=1) atau selama blok tracing() (CLI);
+stage() tidak pernah menyalakan/mematikannya dan hanya mengukur selama
+tracing aktif. Puncak tracemalloc berlaku untuk seluruh proses: tahap yang
+tumpang tindih dengan tahap terukur di thread lain (mis. load:* di thread
+pool) tidak me-reset puncak milik tahap lain, dan peak_mb-nya adalah puncak
+proses selama tahap itu (batas atas), ditandai peak_shared=True.
+"""
+import collections
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+MB = 2**20
+MAX_RECORDS = 1000
+REPORT_COLUMNS = ['stage', 'parent', 'depth', 'wall_s', 'cpu_s', 'peak_mb', 'peak_shared', 'rows']
+
+logger = logging.getLogger('sosmed.perf')
+
+# Tumpukan tahap yang sedang berjalan per thread, dibagi semua Profiler
+_local = threading.local()
+
+# Frame tahap terukur yang sedang berjalan di semua thread (id -> frame)
+_traced = {}
+_traced_lock = threading.Lock()
+
+
+def _current_stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def row_count(result):
+    """Jumlah baris hasil tahap (DataFrame/Series/array, atau total dari tuple)"""
+    if isinstance(result, (tuple, list)):
+        counts = [row_count(item) for item in result]
+        counts = [c for c in counts if c is not None]
+        return sum(counts) if counts else None
+    if hasattr(result, 'shape') and len(getattr(result, 'shape', ())) > 0:
+        return int(result.shape[0])
+    return None
+
+
+def configure_logging(path=None):
+    """Menulis catatan tahap ke file JSON Lines (path atau SOSMED_PERF_LOG), sekali per proses"""
+    path = path or os.environ.get('SOSMED_PERF_LOG')
+    if not path or any(getattr(h, 'baseFilename', None) == os.path.abspath(path)
+                       for h in logger.handlers):
+        return
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def memory_tracing_enabled():
+    return os.environ.get('SOSMED_PERF_MEMORY', '0') != '0'
+
+
+def start_memory_tracing():
+    """Menyalakan tracemalloc sekali per proses jika SOSMED_PERF_MEMORY=1; tidak pernah dimatikan"""
+    with _traced_lock:
+        if memory_tracing_enabled() and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+@contextmanager
+def tracing():
+    """tracemalloc aktif selama blok; dimatikan lagi hanya jika blok ini yang menyalakannya"""
+    with _traced_lock:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            with _traced_lock:
+                tracemalloc.stop()
+
+
+class Profiler:
+    """Pengumpul catatan per tahap: stage, parent, depth, wall_s, cpu_s, peak_mb, rows"""
+
+    def __init__(self, trace_memory=True, max_records=None):
+        self.trace_memory = trace_memory
+        self.records = collections.deque(maxlen=max_records)
+
+    @contextmanager
+    def stage(self, name, trace_memory=None, **info):
+        """Mengukur blok kode; isi record['rows'] di dalam blok bila perlu"""
+        if trace_memory is None:
+            trace_memory = self.trace_memory
+        stack = _current_stack()
+        record = {'stage': name, 'parent': stack[-1]['name'] if stack else None,
+                  'depth': len(stack), **info}
+        frame = {'name': name, 'start': 0, 'child_peak': 0, 'traced': False, 'shared': False}
+        if trace_memory and tracemalloc.is_tracing():
+            with _traced_lock:
+                # Tahap terukur lain yang sedang berjalan di luar tumpukan thread ini
+                ancestors = {id(f) for f in stack}
+                others = [f for key, f in _traced.items() if key not in ancestors]
+                for other in others:
+                    other['shared'] = True
+                current, peak = tracemalloc.get_traced_memory()
+                if stack:
+                    # Simpan puncak tahap induk sebelum di-reset untuk tahap ini
+                    parent = stack[-1]
+                    parent['child_peak'] = max(parent['child_peak'], peak)
+                frame.update(start=current, traced=True, shared=bool(others))
+                if not others:
+                    tracemalloc.reset_peak()
+                _traced[id(frame)] = frame
+        stack.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_s'] = time.perf_counter() - wall
+            record['cpu_s'] = time.process_time() - cpu
+            stack.pop()
+            record['peak_mb'] = record['peak_shared'] = None
+            if frame['traced']:
+                with _traced_lock:
+                    _traced.pop(id(frame), None)
+                    _, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+                peak = max(peak, frame['child_peak'])
+                record['peak_mb'] = max(peak - frame['start'], 0) / MB
+                record['peak_shared'] = frame['shared']
+                if stack:
+                    parent = stack[-1]
+                    parent['child_peak'] = max(parent['child_peak'], peak)
+            record.setdefault('rows', None)
+            self.records.append(record)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(json.dumps({'ts': time.time(), 'pid': os.getpid(), **record},
+                                       default=str))
+
+    def run(self, name, func, *args, **kwargs):
+        """Menjalankan func sebagai satu tahap; rows diambil dari hasilnya"""
+        with self.stage(name) as record:
+            result = func(*args, **kwargs)
+            record['rows'] = row_count(result)
+        return result
+
+    def report(self):
+        """Catatan tahap sebagai DataFrame (urut selesai)"""
+        return pd.DataFrame(list(self.records), columns=REPORT_COLUMNS)
+
+    def clear(self):
+        self.records.clear()
+
+
+PROFILER = Profiler(trace_memory=memory_tracing_enabled(),
+                    max_records=MAX_RECORDS)
+_active = [PROFILER]
+
+
+def current():
+    """Profiler yang sedang aktif"""
+    return _active[-1]
+
+
+@contextmanager
+def use(profiler):
+    """Mengarahkan stage() ke profiler lain selama blok berjalan"""
+    _active.append(profiler)
+    try:
+        yield profiler
+    finally:
+        _active.pop()
+
+
+def inherit(func):
+    """Membungkus func untuk thread lain: tahapnya menjadi anak tahap aktif pemanggil"""
+    parent = list(_current_stack())
+
+    def run(*args, **kwargs):
+        _local.stack = list(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.stack = []
+    return run
+
+
+def stage(name, **info):
+    """Tahap pada profiler aktif (lihat Profiler.stage)"""
+    return current().stage(name, **info)
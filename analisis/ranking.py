@@ -0,0 +1,46 @@
+"""Indeks peringkat untuk bagian Top Performers.
+
+Urutan menurun setiap metrik dihitung sekali per versi dataset, sehingga
+query top-N maupun "peringkat pengguna X" cukup berupa slice array.
+"""
+import numpy as np
+
+from analisis.aggregation import DenseIndex
+
+RANKING_COLUMNS = ['total_activity', 'post_count', 'friend_count',
+                   'reactions_given', 'reactions_received', 'engagement_ratio']
+
+
+class RankingIndex:
+    """Urutan menurun dan peringkat per metrik untuk satu dataset"""
+
+    def __init__(self, integrated_data, columns=RANKING_COLUMNS):
+        self.data = integrated_data
+        self.order = {}
+        self.ranks = {}
+        for col in columns:
+            # argsort stabil atas nilai negatif: seri tetap urut indeks, sama seperti nlargest
+            order = np.argsort(-integrated_data[col].to_numpy(dtype=np.float64), kind='stable')
+            ranks = np.empty_like(order)
+            ranks[order] = np.arange(1, len(order) + 1)
+            self.order[col] = order
+            self.ranks[col] = ranks
+        self.labels = (integrated_data['Name'].astype(str) + ' ' +
+                       integrated_data['Surname'].astype(str)).to_numpy()
+        # Posisi user_id lewat offset (id berurutan) atau searchsorted, tanpa dict per pengguna
+        self._index = DenseIndex(integrated_data['user_id'].to_numpy())
+
+    def top(self, column, n):
+        """n baris teratas untuk metrik column"""
+        return self.data.iloc[self.order[column][:n]]
+
+    def top_labels(self, column, n):
+        """Label 'Nama Marga' untuk n baris teratas"""
+        return self.labels[self.order[column][:n]]
+
+    def rank_of(self, user_id, column):
+        """Peringkat (mulai 1) pengguna pada metrik column, None jika tidak ada"""
+        pos = int(self._index.positions([user_id])[0])
+        if pos < 0:
+            return None
+        return int(self.ranks[column][pos])
@@ -0,0 +1,129 @@
+"""Lapisan render untuk plot besar.
+
+Di bawah ambang jumlah baris, figur dibuat seperti biasa dengan Plotly
+Express. Di atas ambang, data diringkas di server sebelum dikirim ke
+browser: scatter menjadi grid kepadatan 2D, histogram memakai hitungan
+np.histogram, dan deret waktu di-downsample dengan LTTB.
+
+Figur dibuat lewat plot() yang memegang PLOT_LOCK: Plotly Express dan
+go.Figure membaca template default bersama secara lazy dan tidak aman
+dipanggil bersamaan dari beberapa thread. Hanya konstruksi figur yang
+dikunci; agregasi dan binning berjalan di luar kunci.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Ambang jumlah baris/titik sebelum plot diringkas di server
+MAX_PLOT_POINTS = int(os.environ.get('SOSMED_MAX_PLOT_POINTS', 20_000))
+DENSITY_BINS = 100
+
+PLOT_LOCK = threading.RLock()
+
+
+def plot(func, *args, **kwargs):
+    """Memanggil konstruktor figur (px.*, go.Figure) di bawah PLOT_LOCK"""
+    with PLOT_LOCK:
+        return func(*args, **kwargs)
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: posisi n_out titik yang menjaga bentuk kurva"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Titik acuan berikutnya: rata-rata bucket setelahnya (atau titik terakhir)
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        next_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous]) -
+            (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def scatter(data, x, y, title, labels=None, threshold=None, **kwargs):
+    """Scatter biasa, atau heatmap kepadatan 2D jika baris melebihi ambang"""
+    threshold = MAX_PLOT_POINTS if threshold is None else threshold
+    if len(data) <= threshold:
+        return plot(px.scatter, data, x=x, y=y, title=title, labels=labels, **kwargs)
+
+    counts, x_edges, y_edges = np.histogram2d(
+        data[x].to_numpy(dtype=np.float64),
+        data[y].to_numpy(dtype=np.float64),
+        bins=DENSITY_BINS
+    )
+    labels = labels or {}
+    fig = plot(go.Figure, go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=np.log1p(counts.T),
+        customdata=counts.T,
+        hovertemplate='x=%{x:.2f}<br>y=%{y:.2f}<br>jumlah=%{customdata:,.0f}<extra></extra>',
+        colorscale='Viridis',
+        colorbar=dict(title='log(1 + jumlah)')
+    ))
+    fig.update_layout(
+        title=f"{title} (kepadatan, {len(data):,} titik)",
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get(y, y)
+    )
+    return fig
+
+
+def histogram(data, x, title, labels=None, nbins=30, threshold=None):
+    """Histogram; di atas ambang, bin dihitung dengan np.histogram di server"""
+    threshold = MAX_PLOT_POINTS if threshold is None else threshold
+    if len(data) <= threshold:
+        return plot(px.histogram, data, x=x, title=title, labels=labels, nbins=nbins)
+
+    values = data[x].to_numpy(dtype=np.float64)
+    counts, edges = np.histogram(values[~np.isnan(values)], bins=nbins)
+    labels = labels or {}
+    fig = plot(go.Figure, go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_line_width=0
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get('count', 'count'),
+        bargap=0
+    )
+    return fig
+
+
+def line(data, x, y, title, labels=None, threshold=None):
+    """Line chart; tiap deret di-downsample dengan LTTB jika titik melebihi ambang"""
+    threshold = MAX_PLOT_POINTS if threshold is None else threshold
+    columns = [y] if isinstance(y, str) else list(y)
+    if len(data) * len(columns) <= threshold:
+        return plot(px.line, data, x=x, y=y, title=title, labels=labels)
+
+    per_series = max(threshold // len(columns), 3)
+    x_values = pd.to_numeric(data[x]).to_numpy(dtype=np.float64)
+    parts = []
+    for col in columns:
+        keep = lttb(x_values, data[col].to_numpy(dtype=np.float64), per_series)
+        parts.append(pd.DataFrame({x: data[x].iloc[keep].to_numpy(), 'value': data[col].iloc[keep].to_numpy(), 'variable': col}))
+    sampled = pd.concat(parts, ignore_index=True)
+    if isinstance(y, str):
+        return plot(px.line, sampled.rename(columns={'value': y}), x=x, y=y, title=title, labels=labels)
+    return plot(px.line, sampled, x=x, y='value', color='variable', title=title, labels=labels)
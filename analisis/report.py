@@ -0,0 +1,460 @@
+"""Runner laporan headless untuk analisis projeksim.py.
+
+Setiap pertanyaan visualisasi dijalankan sebagai tugas terpisah di process
+pool (backend matplotlib Agg), grafiknya disimpan sebagai PNG/SVG dan
+jawabannya dikumpulkan ke answers.json. projeksim.py menggambar grafik yang
+sama lewat draw_task(). Tugas dilewati jika fingerprint dataset (hash file
+sumber, dicek sebelum tabel dimuat), mode, dan kodenya sama dengan run
+sebelumnya (lihat manifest.json).
+
+    python -m analisis.report --output reports/ --workers 4
+"""
+import argparse
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+from analisis.aggregation import build_integrated_dataset
+from analisis.artifact_cache import ArtifactCache
+from analisis.cleaning import load_clean_tables
+from analisis.cube import AggregateCube
+from analisis.moments import MomentAccumulator
+from analisis.sketches import approx_mode
+from analisis.snapshot import source_version
+
+FORMATS = ('png', 'svg')
+MANIFEST_NAME = 'manifest.json'
+ANSWERS_NAME = 'answers.json'
+
+TASKS = {}
+
+# Modul yang ikut menentukan frame masukan dan isi grafik; perubahan sumbernya
+# menjalankan ulang semua tugas
+HELPER_MODULES = ['analisis.snapshot', 'analisis.dedup', 'analisis.cleaning', 'analisis.features',
+                  'analisis.aggregation', 'analisis.cube', 'analisis.moments']
+
+# Dataset milik proses worker (diisi oleh _init_worker)
+_DATA = None
+
+
+def task(name, question):
+    """Mendaftarkan fungsi grafik sebagai tugas laporan"""
+    def register(func):
+        TASKS[name] = (question, func)
+        return func
+    return register
+
+
+def _strength(corr):
+    return 'lemah' if abs(corr) < 0.3 else 'sedang' if abs(corr) < 0.7 else 'kuat'
+
+
+def _title(text):
+    plt.title(text, fontsize=16, fontweight='bold', pad=20)
+
+
+def _show_autotexts(autotexts):
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+        autotext.set_fontsize(12)
+
+
+@task('pertanyaan_01', 'Bagaimana Distribusi Pengguna Berdasarkan Kelompok Usia?')
+def age_group_distribution(data):
+    age_distribution = data['integrated']['age_group'].value_counts().sort_index()
+    bars = plt.bar(age_distribution.index.astype(str), age_distribution.values,
+                   color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7'],
+                   alpha=0.8, edgecolor='black', linewidth=1)
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height + 50,
+                 f'{int(height):,}', ha='center', va='bottom', fontweight='bold')
+    plt.xlabel('Kelompok Usia', fontsize=14)
+    plt.ylabel('Jumlah Pengguna', fontsize=14)
+    plt.grid(axis='y', alpha=0.3)
+
+    top_group = age_distribution.idxmax()
+    answer = f"Kelompok usia {top_group} memiliki pengguna terbanyak ({age_distribution.max():,} orang)"
+    return answer, {'distribution': age_distribution.to_dict()}
+
+
+@task('pertanyaan_02', 'Siapa 10 Pengguna Paling Aktif di Platform?')
+def top_active_users(data):
+    top_active = data['integrated'].nlargest(10, 'total_activity')
+    plt.barh(range(len(top_active)), top_active['total_activity'],
+             color='#96CEB4', alpha=0.8, edgecolor='black', linewidth=1)
+    for i, value in enumerate(top_active['total_activity']):
+        plt.text(value + 1, i, f"{int(value)}", va='center', fontweight='bold')
+    plt.yticks(range(len(top_active)),
+               [f"User {int(uid)}\n({name} {surname})" for uid, name, surname
+                in zip(top_active['user_id'], top_active['Name'], top_active['Surname'])])
+    plt.xlabel('Total Aktivitas (Teman + Post + Reaksi Diberikan)', fontsize=14)
+    plt.grid(axis='x', alpha=0.3)
+
+    most_active_user = top_active.iloc[0]
+    answer = (f"User {int(most_active_user['user_id'])} adalah yang paling aktif dengan total "
+              f"aktivitas {int(most_active_user['total_activity'])}")
+    return answer, {'top_users': dict(zip(top_active['user_id'].astype(int).tolist(),
+                                          top_active['total_activity'].astype(int).tolist()))}
+
+
+@task('pertanyaan_03', 'Apa Jenis Reaksi yang Paling Populer di Platform?')
+def reaction_types(data):
+    reaction_counts = data['reactions']['Reaction Type'].value_counts()
+    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
+    _, _, autotexts = plt.pie(reaction_counts.values, labels=reaction_counts.index,
+                              autopct='%1.1f%%', colors=colors[:len(reaction_counts)],
+                              startangle=90, explode=[0.05] * len(reaction_counts))
+    _show_autotexts(autotexts)
+
+    answer = (f"Reaksi '{reaction_counts.index[0]}' adalah yang paling populer "
+              f"({reaction_counts.iloc[0]:,} reaksi)")
+    return answer, {'counts': reaction_counts.to_dict()}
+
+
+@task('pertanyaan_04', 'Bagaimana Proporsi Pengguna Berdasarkan Level Aktivitas?')
+def activity_levels(data):
+    activity_counts = data['integrated']['activity_level'].value_counts()
+    activity_counts = activity_counts[activity_counts > 0]
+    colors = ['#FF6B6B', '#FFEAA7', '#4ECDC4', '#96CEB4', '#DDA0DD']
+    _, _, autotexts = plt.pie(activity_counts.values, labels=activity_counts.index,
+                              autopct='%1.1f%%', colors=colors[:len(activity_counts)],
+                              startangle=90, explode=[0.05] * len(activity_counts))
+    _show_autotexts(autotexts)
+
+    answer = (f"Mayoritas pengguna memiliki '{activity_counts.index[0]}' "
+              f"({activity_counts.iloc[0]:,} pengguna)")
+    return answer, {'counts': activity_counts.to_dict()}
+
+
+@task('pertanyaan_05', 'Bagaimana Distribusi Usia Pengguna?')
+def age_distribution(data):
+    age_data = data['integrated']['Age']
+    age_data = age_data[(age_data >= 0) & (age_data <= 100)]
+    plt.hist(age_data, bins=np.arange(age_data.min(), age_data.max() + 1, 1),
+             color='#4ECDC4', edgecolor='black', linewidth=0.3)
+
+    mean, median = age_data.mean(), age_data.median()
+    q25, q75 = age_data.quantile(0.25), age_data.quantile(0.75)
+    plt.axvline(mean, color='red', linestyle='--', linewidth=2.5, label=f'Rata-rata: {mean:.1f} thn')
+    plt.axvline(median, color='orange', linestyle='--', linewidth=2.5, label=f'Median: {median:.1f} thn')
+    plt.axvline(q25, color='green', linestyle=':', linewidth=2, label=f'Q1: {q25:.1f} thn')
+    plt.axvline(q75, color='green', linestyle=':', linewidth=2, label=f'Q3: {q75:.1f} thn')
+    plt.axvspan(q25, q75, alpha=0.2, color='green', label='IQR (50% tengah)')
+    plt.xlabel('Usia (tahun)', fontsize=14)
+    plt.ylabel('Jumlah Pengguna', fontsize=14)
+    plt.legend(fontsize=11)
+    plt.grid(axis='y', alpha=0.3)
+
+    answer = f"Rata-rata usia {mean:.1f} tahun, median {median:.1f} tahun, IQR {q25:.1f}-{q75:.1f} tahun"
+    return answer, {'mean': mean, 'median': median, 'q1': q25, 'q3': q75,
+                    'min': age_data.min(), 'max': age_data.max(), 'std': age_data.std()}
+
+
+@task('pertanyaan_06', 'Bagaimana Distribusi Tingkat Engagement Pengguna?')
+def engagement_distribution(data):
+    integrated_data = data['integrated']
+    engagement = integrated_data.loc[integrated_data['post_count'] > 0, 'engagement_ratio']
+    plt.hist(engagement, bins=30, color='#FFEAA7', alpha=0.7, edgecolor='black', linewidth=1)
+    plt.axvline(engagement.mean(), color='red', linestyle='--', linewidth=2,
+                label=f'Rata-rata: {engagement.mean():.2f}')
+    plt.axvline(engagement.median(), color='green', linestyle='--', linewidth=2,
+                label=f'Median: {engagement.median():.2f}')
+    plt.xlabel('Engagement Ratio (Reaksi per Post)', fontsize=14)
+    plt.ylabel('Jumlah Pengguna', fontsize=14)
+    plt.legend(fontsize=12)
+    plt.grid(axis='y', alpha=0.3)
+
+    high_engagement_pct = (engagement > engagement.median()).mean() * 100
+    answer = f"{high_engagement_pct:.1f}% content creator memiliki engagement di atas median"
+    return answer, {'above_median_pct': high_engagement_pct, 'mean': engagement.mean(),
+                    'median': engagement.median()}
+
+
+@task('pertanyaan_07', 'Bagaimana Jumlah Postingan per Jenis Postingan?')
+def post_types(data):
+    post_type_activity = data['posts']['Post Type'].value_counts().sort_index()
+    plt.plot(post_type_activity.index.astype(str), post_type_activity.values,
+             marker='o', color='#0984e3', linewidth=3, markersize=8)
+    plt.xlabel('Jenis Postingan', fontsize=14)
+    plt.ylabel('Jumlah Postingan', fontsize=14)
+    plt.grid(True, alpha=0.3)
+
+    answer = (f"Jenis postingan '{post_type_activity.idxmax()}' memiliki jumlah postingan terbanyak "
+              f"yaitu {post_type_activity.max()} postingan.")
+    return answer, {'counts': post_type_activity.to_dict()}
+
+
+@task('pertanyaan_08', 'Bagaimana Pola Aktivitas Berbeda Antar Kelompok Usia?')
+def age_group_activity(data):
+    age_activity = AggregateCube(data['integrated']).aggregate(
+        'age_group', ['friend_count', 'post_count', 'reactions_given', 'reactions_received'])
+    labels = age_activity.index.astype(str)
+    series = [('friend_count', 'o', 'Rata-rata Teman', '#FF6B6B'),
+              ('post_count', 's', 'Rata-rata Post', '#4ECDC4'),
+              ('reactions_given', '^', 'Rata-rata Reaksi Diberikan', '#45B7D1'),
+              ('reactions_received', 'D', 'Rata-rata Reaksi Diterima', '#96CEB4')]
+    for column, marker, label, color in series:
+        plt.plot(labels, age_activity[column], marker=marker, linewidth=3,
+                 markersize=8, label=label, color=color)
+    plt.xlabel('Kelompok Usia', fontsize=14)
+    plt.ylabel('Rata-rata Aktivitas', fontsize=14)
+    plt.legend(fontsize=12)
+    plt.grid(True, alpha=0.3)
+
+    most_active_age_group = age_activity.sum(axis=1).idxmax()
+    answer = f"Kelompok usia '{most_active_age_group}' adalah yang paling aktif secara keseluruhan"
+    return answer, {'means': age_activity.to_dict(orient='index')}
+
+
+@task('pertanyaan_09', 'Apakah Pengguna yang Lebih Sosial Cenderung Lebih Aktif Posting?')
+def friends_vs_posts(data):
+    integrated_data = data['integrated']
+    filtered_data = integrated_data[(integrated_data['friend_count'] <= 50) &
+                                    (integrated_data['post_count'] <= 30)]
+    plt.scatter(filtered_data['friend_count'], filtered_data['post_count'],
+                alpha=0.6, s=60, color='#45B7D1', edgecolors='black', linewidth=0.5)
+    filtered_moments = MomentAccumulator.from_frame(filtered_data, ['friend_count', 'post_count'])
+    trend = filtered_moments.regression('friend_count', 'post_count')
+    x = np.array(filtered_moments.range('friend_count'))
+    plt.plot(x, trend['slope'] * x + trend['intercept'], "r--", alpha=0.8, linewidth=2)
+
+    correlation = MomentAccumulator.from_frame(integrated_data, ['friend_count', 'post_count']).correlation(
+        'friend_count', 'post_count')
+    plt.xlabel('Jumlah Teman', fontsize=14)
+    plt.ylabel('Jumlah Postingan', fontsize=14)
+    plt.text(0.05, 0.95, f'Korelasi: {correlation:.3f}', transform=plt.gca().transAxes,
+             bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7),
+             fontsize=12, fontweight='bold')
+    plt.grid(True, alpha=0.3)
+
+    answer = f"Korelasi {correlation:.3f} menunjukkan hubungan yang {_strength(correlation)}"
+    return answer, {'correlation': correlation, 'slope': trend['slope'], 'intercept': trend['intercept'],
+                    'slope_ci': trend['slope_ci']}
+
+
+@task('pertanyaan_10', 'Apakah Usia Mempengaruhi Tingkat Aktivitas Pengguna?')
+def age_vs_activity(data):
+    integrated_data = data['integrated']
+    scatter = plt.scatter(integrated_data['Age'], integrated_data['total_activity'],
+                          alpha=0.6, s=60, c=integrated_data['total_activity'],
+                          cmap='viridis', edgecolors='black', linewidth=0.5)
+    moments = MomentAccumulator.from_frame(integrated_data, ['Age', 'total_activity'])
+    trend = moments.regression('Age', 'total_activity')
+    x = np.array(moments.range('Age'))
+    plt.plot(x, trend['slope'] * x + trend['intercept'], "r--", alpha=0.8, linewidth=2)
+
+    correlation = trend['correlation']
+    plt.colorbar(scatter, label='Total Aktivitas')
+    plt.xlabel('Usia (tahun)', fontsize=14)
+    plt.ylabel('Total Aktivitas', fontsize=14)
+    plt.text(0.05, 0.95, f'Korelasi: {correlation:.3f}', transform=plt.gca().transAxes,
+             bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7),
+             fontsize=12, fontweight='bold')
+    plt.grid(True, alpha=0.3)
+
+    strength = ('tidak ada' if abs(correlation) < 0.1 else 'lemah' if abs(correlation) < 0.3
+                else 'sedang')
+    answer = f"Korelasi {correlation:.3f} menunjukkan {strength} hubungan antara usia dan aktivitas"
+    return answer, {'correlation': correlation, 'slope': trend['slope'], 'intercept': trend['intercept'],
+                    'slope_ci': trend['slope_ci']}
+
+
+@task('pertanyaan_11', 'Bagaimana Hubungan Antar Variabel Aktivitas Pengguna?')
+def activity_correlations(data):
+    correlation_vars = ['Age', 'friend_count', 'post_count', 'reactions_given', 'reactions_received']
+    correlation_matrix = MomentAccumulator.from_frame(data['integrated'], correlation_vars).correlation()
+    mask = np.triu(np.ones_like(correlation_matrix, dtype=bool))
+    sns.heatmap(correlation_matrix, mask=mask, annot=True, cmap='RdYlBu_r',
+                center=0, square=True, linewidths=1, cbar_kws={"shrink": .8},
+                fmt='.3f', annot_kws={'fontsize': 12, 'fontweight': 'bold'})
+
+    pairs = correlation_matrix.where(~mask).stack()
+    strongest = pairs.abs().idxmax()
+    answer = f"Korelasi terkuat adalah {pairs[strongest]:.3f} ({strongest[0]} vs {strongest[1]})"
+    return answer, {'matrix': correlation_matrix.to_dict()}
+
+
+@task('pertanyaan_12', 'Bagaimana Pola Aktivitas Berdasarkan Usia dan Tahun Bergabung?')
+def age_year_heatmap(data):
+    activity_heatmap = AggregateCube(data['integrated']).heatmap(
+        'age_group', 'registration_year', 'total_activity')
+    sns.heatmap(activity_heatmap, annot=True, cmap='YlOrRd',
+                cbar_kws={'label': 'Rata-rata Total Aktivitas'},
+                fmt='.1f', annot_kws={'fontsize': 10})
+    plt.xlabel('Tahun Registrasi', fontsize=14)
+    plt.ylabel('Kelompok Usia', fontsize=14)
+
+    stacked = activity_heatmap.stack()
+    age_group, year = stacked.idxmax()
+    answer = (f"Kombinasi kelompok usia '{age_group}' yang bergabung tahun {year} memiliki "
+              f"aktivitas tertinggi ({stacked.max():.1f})")
+    return answer, {'age_group': age_group, 'registration_year': year, 'value': stacked.max()}
+
+
+def _jsonable(value):
+    """Mengubah nilai numpy/pandas menjadi tipe bawaan agar bisa ditulis ke JSON"""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """Hash sumber modul pembantu dan helper grafik bersama di modul ini"""
+    digest = hashlib.sha256()
+    helpers = [_strength, _title, _show_autotexts, _jsonable, draw_task]
+    for obj in [importlib.import_module(name) for name in HELPER_MODULES] + helpers:
+        digest.update(inspect.getsource(obj).encode())
+    return digest.hexdigest()[:16]
+
+
+def task_fingerprint(name, version, mode='exact'):
+    """Fingerprint input tugas: versi dataset, mode cleaning, kode pembantu + fungsi tugas"""
+    source = inspect.getsource(TASKS[name][1])
+    return hashlib.sha256(f'{version}:{mode}:{code_version()}:{source}'.encode()).hexdigest()[:16]
+
+
+def build_report_frames(source=None):
+    """Dataset terintegrasi, posts, dan reactions dari tabel bersih (sama dengan projeksim)"""
+    return build_integrated_dataset(*load_clean_tables(source, typed=True))
+
+
+def _init_worker(key, directory, source):
+    """Memuat dataset dari cache artefak (memory-map) sekali per proses worker"""
+    global _DATA
+    matplotlib.use('Agg')
+    frames = ArtifactCache(directory).get(key)
+    if frames is None:
+        # Artefak sudah tereviksi sebelum worker mulai: bangun ulang di worker ini
+        frames = build_report_frames(source)
+    integrated, posts, reactions = frames
+    _DATA = {'integrated': integrated, 'posts': posts, 'reactions': reactions}
+
+
+def draw_task(name, data):
+    """Menggambar grafik tugas di figure baru; mengembalikan (jawaban, nilai).
+
+    data: dict berisi frame 'integrated', 'posts', dan 'reactions'.
+    """
+    question, func = TASKS[name]
+    number = int(name.rsplit('_', 1)[1])
+    plt.figure(figsize=(12, 8))
+    answer, values = func(data)
+    _title(f'Pertanyaan {number}: {question}')
+    plt.tight_layout()
+    return answer, values
+
+
+def run_task(name, output_dir, data=None):
+    """Menjalankan satu tugas, menyimpan grafiknya dan mengembalikan jawabannya"""
+    try:
+        answer, values = draw_task(name, data if data is not None else _DATA)
+        files = []
+        for fmt in FORMATS:
+            path = os.path.join(output_dir, f'{name}.{fmt}')
+            plt.savefig(path, format=fmt)
+            files.append(os.path.basename(path))
+    finally:
+        plt.close('all')
+    return {'question': TASKS[name][0], 'answer': answer, 'values': _jsonable(values), 'files': files}
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path, payload):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _is_fresh(entry, fingerprint, output_dir):
+    if not entry or entry.get('fingerprint') != fingerprint:
+        return False
+    return all(os.path.exists(os.path.join(output_dir, f)) for f in entry['result']['files'])
+
+
+def run_report(output_dir, source=None, workers=None, names=None, force=False):
+    """Menjalankan semua tugas (atau `names`) dan menulis answers.json; mengembalikan ringkasan"""
+    os.makedirs(output_dir, exist_ok=True)
+    names = list(names or TASKS)
+    manifest = _read_json(os.path.join(output_dir, MANIFEST_NAME))
+
+    # Kesegaran dicek dari hash file sumber; tabel hanya dimuat jika ada tugas yang perlu jalan
+    version = source_version(source, typed=True)
+    mode = 'approx' if approx_mode() else 'exact'
+    fingerprints = {name: task_fingerprint(name, version, mode) for name in TASKS}
+    pending = [name for name in names
+               if force or not _is_fresh(manifest.get(name), fingerprints[name], output_dir)]
+
+    if pending:
+        matplotlib.use('Agg')
+        if workers == 1:
+            data = dict(zip(['integrated', 'posts', 'reactions'], build_report_frames(source)))
+            results = {name: run_task(name, output_dir, data) for name in pending}
+        else:
+            # Worker membaca frame dari cache artefak Arrow alih-alih menerima salinan pickle;
+            # frame hanya dibangun jika artefak untuk versi data dan kode ini belum ada
+            cache = ArtifactCache()
+            key = f'report-{version}-{mode}-{code_version()}'
+            cache.get_or_build(key, lambda: build_report_frames(source))
+            results = {}
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(key, cache.directory, source)) as pool:
+                futures = {pool.submit(run_task, name, output_dir): name for name in pending}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        for name, result in results.items():
+            manifest[name] = {'fingerprint': fingerprints[name], 'result': result}
+        _write_json(os.path.join(output_dir, MANIFEST_NAME), manifest)
+
+    # Sertakan juga jawaban tugas lain yang masih segar dari run sebelumnya
+    answers = {name: manifest[name]['result'] for name in TASKS
+               if _is_fresh(manifest.get(name), fingerprints[name], output_dir)}
+    _write_json(os.path.join(output_dir, ANSWERS_NAME),
+                {'dataset_version': version, 'answers': answers})
+    return {'dataset_version': version, 'ran': sorted(pending),
+            'skipped': sorted(set(names) - set(pending))}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Laporan headless analisis projeksim')
+    parser.add_argument('--output', default='reports', help='folder keluaran grafik dan answers.json')
+    parser.add_argument('--source', default=None, help='folder/URL data (default: SOSMED_DATA_DIR)')
+    parser.add_argument('--workers', type=int, default=None, help='jumlah proses (1 = tanpa pool)')
+    parser.add_argument('--task', action='append', choices=sorted(TASKS), help='jalankan tugas tertentu saja')
+    parser.add_argument('--force', action='store_true', help='jalankan ulang walau input tidak berubah')
+    args = parser.parse_args(argv)
+
+    summary = run_report(args.output, args.source, args.workers, args.task, args.force)
+    print(f"Dataset {summary['dataset_version']}: {len(summary['ran'])} tugas dijalankan, "
+          f"{len(summary['skipped'])} dilewati (input tidak berubah)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
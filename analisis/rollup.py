@@ -0,0 +1,110 @@
+"""Rollup deret waktu untuk posts dan reactions.
+
+Event mentah diagregasi sekali ke bucket per jam (per jenis), lalu bucket
+harian, mingguan, dan bulanan diturunkan dari bucket per jam. Awal bucket
+disimpan sebagai epoch detik int64 sehingga query rentang cukup memakai
+searchsorted tanpa menyentuh event mentah.
+"""
+import numpy as np
+import pandas as pd
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+# 1970-01-01 adalah Kamis; minggu dimulai Senin (1970-01-05)
+WEEK_ORIGIN = 4 * DAY
+
+GRANULARITIES = ['hour', 'day', 'week', 'month']
+
+
+def _epoch_seconds(dates):
+    values = pd.to_datetime(dates).to_numpy(dtype='datetime64[s]')
+    return values.astype(np.int64)
+
+
+def _bucket_starts(seconds, granularity):
+    if granularity == 'hour':
+        return seconds - seconds % HOUR
+    if granularity == 'day':
+        return seconds - seconds % DAY
+    if granularity == 'week':
+        return seconds - (seconds - WEEK_ORIGIN) % WEEK
+    if granularity == 'month':
+        months = seconds.astype('datetime64[s]').astype('datetime64[M]')
+        return months.astype('datetime64[s]').astype(np.int64)
+    raise ValueError(f"Granularitas tidak dikenal: {granularity}")
+
+
+def _group_sum(buckets, counts):
+    """Jumlahkan baris counts yang bucket-nya sama (buckets sudah terurut)"""
+    starts, first = np.unique(buckets, return_index=True)
+    return starts, np.add.reduceat(counts, first, axis=0) if len(first) else counts[:0]
+
+
+class EventRollup:
+    """Jumlah event per bucket waktu dan per jenis untuk satu tabel"""
+
+    def __init__(self, dates, types):
+        dates = pd.Series(dates).reset_index(drop=True)
+        types = pd.Categorical(pd.Series(types).reset_index(drop=True))
+        valid = dates.notna().to_numpy() & (types.codes >= 0)
+        seconds = _epoch_seconds(dates[valid])
+        codes = types.codes[valid].astype(np.int64)
+        self.types = list(types.categories)
+
+        n_types = len(self.types)
+        hours, inverse = np.unique(_bucket_starts(seconds, 'hour'), return_inverse=True)
+        hourly = np.bincount(inverse * n_types + codes, minlength=len(hours) * n_types)
+        self._set_hourly(hours, hourly.reshape(len(hours), n_types))
+
+    @classmethod
+    def from_hourly(cls, hours, types, counts):
+        """Rollup dari jumlah event per (awal jam dalam epoch detik, jenis) yang sudah
+        diagregasi di luar, mis. oleh backend DuckDB"""
+        rollup = cls.__new__(cls)
+        types = pd.Categorical(pd.Series(types).reset_index(drop=True))
+        rollup.types = list(types.categories)
+        hours, inverse = np.unique(np.asarray(hours, dtype=np.int64), return_inverse=True)
+        hourly = np.zeros((len(hours), len(rollup.types)), dtype=np.int64)
+        np.add.at(hourly, (inverse, types.codes), np.asarray(counts, dtype=np.int64))
+        rollup._set_hourly(hours, hourly)
+        return rollup
+
+    def _set_hourly(self, hours, hourly):
+        self.buckets = {'hour': (hours, hourly)}
+        for granularity in GRANULARITIES[1:]:
+            self.buckets[granularity] = _group_sum(
+                _bucket_starts(hours, granularity), self.buckets['hour'][1]
+            )
+
+    def range(self, granularity='day', start=None, end=None, by_type=False):
+        """Jumlah event per bucket dalam rentang [start, end]"""
+        starts, counts = self.buckets[granularity]
+        lo = 0 if start is None else np.searchsorted(starts, _epoch_seconds([start])[0], side='left')
+        hi = len(starts) if end is None else np.searchsorted(starts, _epoch_seconds([end])[0], side='right')
+        index = pd.to_datetime(starts[lo:hi], unit='s')
+        if by_type:
+            return pd.DataFrame(counts[lo:hi], index=index, columns=self.types)
+        return pd.Series(counts[lo:hi].sum(axis=1), index=index, name='count')
+
+    def totals(self):
+        """Total event per jenis"""
+        return pd.Series(self.buckets['hour'][1].sum(axis=0), index=self.types)
+
+
+class RollupStore:
+    """Rollup untuk reactions (per Reaction Type) dan posts (per Post Type)"""
+
+    def __init__(self, posts, reactions):
+        self.reactions = EventRollup(reactions['Reaction Date'], reactions['Reaction Type'])
+        self.posts = EventRollup(posts['Post Date'], posts['Post Type'])
+
+    @classmethod
+    def from_hourly(cls, posts_hourly, reactions_hourly):
+        """Rollup dari frame (hour, type, count) per tabel, lihat backends.HOURLY_SQL"""
+        store = cls.__new__(cls)
+        store.reactions = EventRollup.from_hourly(
+            reactions_hourly['hour'], reactions_hourly['type'], reactions_hourly['count'])
+        store.posts = EventRollup.from_hourly(
+            posts_hourly['hour'], posts_hourly['type'], posts_hourly['count'])
+        return store
@@ -0,0 +1,664 @@
+"""Payload per section dashboard yang bisa disiapkan di latar belakang.
+
+Setiap bagian section (mis. 'demografi' atau 'top_performers') didaftarkan
+dengan @section sebagai fungsi (data, **params) -> payload: dict berisi
+nilai, tabel kecil, dan figur Plotly di payload['figures']. SectionData
+menyimpan tabel satu versi dataset beserta indeks turunannya (kubus, ranking,
+momen, graf, rollup) yang dibangun malas sekali saja, aman antar thread.
+
+SectionPrewarmer menyimpan payload di FigureCache (lihat
+analisis/figure_cache.py) dengan kunci (versi dataset, bagian, params) dan
+figur sebagai JSON terkompresi. Setelah dataset terintegrasi siap, start()
+membangun payload semua bagian dengan params default di thread latar
+belakang, sehingga berpindah section cukup membaca payload yang sudah jadi.
+Permintaan untuk bagian yang sedang dibangun worker menunggu hasilnya, bukan
+menghitung ulang. Bagian yang berbeda dibangun bersamaan; hanya konstruksi
+figur Plotly yang diserialkan lewat rendering.plot().
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from analisis import rendering
+from analisis.cube import AggregateCube
+from analisis.dedup import dedup_report
+from analisis.figure_cache import FIGURE_CACHE, compress_figure, replay_figure
+from analisis.filter_index import FilterIndex
+from analisis.graph import FriendGraph
+from analisis.ingest import ingest_report
+from analisis.moments import MomentAccumulator, spearman_accumulator
+from analisis.profiling import stage
+from analisis.ranking import RankingIndex
+from analisis.rollup import RollupStore
+from analisis.sketches import approx_mode, approximate_stats
+
+SECTIONS = {}
+
+CORRELATION_VARS = ['Age', 'friend_count', 'post_count', 'reactions_given', 'reactions_received',
+                    'total_activity', 'pagerank', 'clustering_coefficient', 'triangle_count']
+TOP_DETAIL_COLUMNS = ['Name', 'Surname', 'Age', 'friend_count', 'post_count', 'reactions_given',
+                      'reactions_received', 'total_activity']
+GRANULARITIES = {'Per Jam': 'hour', 'Harian': 'day', 'Mingguan': 'week', 'Bulanan': 'month'}
+
+
+def section(name, **defaults):
+    """Mendaftarkan builder bagian section beserta params default.
+
+    Nilai default boleh berupa fungsi data -> nilai (mis. batas slider).
+    """
+    def register(func):
+        SECTIONS[name] = (func, defaults)
+        return func
+    return register
+
+
+class _Once:
+    """Nilai per kunci yang dibangun sekali; pemanggil lain dengan kunci sama menunggu"""
+
+    def __init__(self):
+        self.values = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key, build):
+        if key in self.values:
+            return self.values[key]
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self.values:
+                self.values[key] = build()
+        return self.values[key]
+
+
+def table_summary(users, friends, posts, reactions):
+    """Angka ringkasan section Overview dari keempat tabel bersih"""
+    all_friends = pd.concat([
+        friends[['Friend 1']].rename(columns={'Friend 1': 'user_id'}),
+        friends[['Friend 2']].rename(columns={'Friend 2': 'user_id'})
+    ])
+    # Mode aproksimasi: jumlah unik & median dari sketch ingest, dengan batas galat ~95%
+    approx = approximate_stats(users, friends, posts, reactions) if approx_mode() else {}
+    return {
+        'counts': {'users': len(users), 'friends': len(friends), 'posts': len(posts),
+                   'reactions': len(reactions)},
+        'age_mean': users['Age'].mean(),
+        'age_median': users['Age'].median(),
+        'age_range': (users['Age'].min(), users['Age'].max()),
+        'avg_friends': all_friends.groupby('user_id').size().mean(),
+        'friend_users': all_friends['user_id'].nunique(),
+        'active_posters': posts['User'].nunique(),
+        'avg_posts': posts.groupby('User').size().mean(),
+        'reacting_users': reactions['User'].nunique(),
+        'approx': approx,
+        'memory_report': ingest_report(users, friends, posts, reactions),
+        'duplicates_report': dedup_report(users, friends, posts, reactions),
+    }
+
+
+def _frame_summary(summary, dedup):
+    """table_summary() dari frame ringkasan backend (satu baris) dan laporan dedup"""
+    row = summary.iloc[0]
+    return {
+        'counts': {name: int(row[name]) for name in ['users', 'friends', 'posts', 'reactions']},
+        'age_mean': row['age_mean'],
+        'age_median': row['age_median'],
+        'age_range': (row['age_min'], row['age_max']),
+        'avg_friends': row['avg_friends'],
+        'friend_users': int(row['friend_users']),
+        'active_posters': int(row['active_posters']),
+        'avg_posts': row['avg_posts'],
+        'reacting_users': int(row['reacting_users']),
+        # Backend menghitung nilai eksak langsung; tidak ada sketch maupun memori ingest pandas
+        'approx': {},
+        'memory_report': pd.DataFrame(),
+        'duplicates_report': dedup,
+    }
+
+
+def _type_counts(hourly):
+    """Jumlah per jenis dari frame rollup per jam, terbanyak dulu (seperti value_counts)"""
+    return hourly.groupby('type')['count'].sum().sort_values(ascending=False, kind='stable')
+
+
+class SectionData:
+    """Tabel satu versi dataset beserta indeks turunan yang dibangun malas.
+
+    resources: indeks/agregat yang sudah dihitung di luar (lihat from_frames);
+    tabel yang tidak lagi dibutuhkan oleh resource tersebut boleh None.
+    """
+
+    def __init__(self, users, friends, posts, reactions, integrated_data, posts_processed,
+                 reactions_processed, version, resources=None):
+        self.users, self.friends, self.posts, self.reactions = users, friends, posts, reactions
+        self.integrated_data = integrated_data
+        self.posts_processed = posts_processed
+        self.reactions_processed = reactions_processed
+        self.version = version
+        self._resources = _Once()
+        self._resources.values.update(resources or {})
+
+    @classmethod
+    def from_frames(cls, integrated_data, friends, posts_hourly, reactions_hourly, summary, dedup,
+                    version):
+        """Data section dari frame ringkas backend out-of-core (backends.duckdb_frames).
+
+        Keempat tabel tidak dimuat: ringkasan Overview, jumlah per jenis, dan
+        rollup berasal dari agregat backend, graf dari edge pertemanan bersih.
+        """
+        resources = {
+            'summary': _frame_summary(summary, dedup),
+            'rollup': RollupStore.from_hourly(posts_hourly, reactions_hourly),
+            'reaction_counts': _type_counts(reactions_hourly),
+            'post_type_counts': _type_counts(posts_hourly),
+        }
+        return cls(None, friends, None, None, integrated_data, None, None, version, resources)
+
+    @property
+    def summary(self):
+        return self._resources.get('summary', lambda: table_summary(
+            self.users, self.friends, self.posts, self.reactions))
+
+    @property
+    def reaction_counts(self):
+        """Jumlah reaksi per Reaction Type, terbanyak dulu"""
+        return self._resources.get('reaction_counts', lambda: (
+            self.reactions_processed['Reaction Type'].value_counts()))
+
+    @property
+    def post_type_counts(self):
+        """Jumlah post per Post Type, terbanyak dulu (None jika kolomnya tidak ada)"""
+        def build():
+            if 'Post Type' not in self.posts_processed.columns:
+                return None
+            return self.posts_processed['Post Type'].value_counts()
+        return self._resources.get('post_type_counts', build)
+
+    @property
+    def ranking(self):
+        return self._resources.get('ranking', lambda: RankingIndex(self.integrated_data))
+
+    @property
+    def graph(self):
+        return self._resources.get('graph', lambda: FriendGraph.from_friends(
+            self.friends, self.integrated_data['user_id']))
+
+    @property
+    def rollup(self):
+        return self._resources.get('rollup', lambda: RollupStore(
+            self.posts_processed, self.reactions_processed))
+
+    @property
+    def cube(self):
+        return self._resources.get('cube', lambda: AggregateCube(self.integrated_data))
+
+    @property
+    def moments(self):
+        """Akumulator momen (korelasi Pearson, regresi OLS)"""
+        return self._resources.get('moments', lambda: MomentAccumulator.from_frame(self.integrated_data))
+
+    @property
+    def spearman_moments(self):
+        """Akumulator momen atas rank; urutan metrik diambil dari indeks peringkat"""
+        def build():
+            # Urutan menurun dibalik menjadi urutan naik (urutan antar nilai kembar tidak berpengaruh)
+            orders = {column: order[::-1] for column, order in self.ranking.order.items()}
+            return spearman_accumulator(self.integrated_data, orders=orders)
+        return self._resources.get('spearman_moments', build)
+
+    @property
+    def filter_index(self):
+        return self._resources.get('filter_index', lambda: FilterIndex(self.integrated_data))
+
+
+class SectionPrewarmer:
+    """Payload bagian section per params, disiapkan di thread latar belakang"""
+
+    def __init__(self, data, sections=None, cache=None):
+        self.data = data
+        self.sections = list(sections or SECTIONS)
+        self.cache = cache if cache is not None else FIGURE_CACHE
+        self._thread = None
+
+    def params(self, name, **params):
+        """Params lengkap (default diisi) sebagai tuple terurut untuk kunci payload"""
+        defaults = {key: value(self.data) if callable(value) else value
+                    for key, value in SECTIONS[name][1].items()}
+        defaults.update(params)
+        return tuple(sorted(defaults.items()))
+
+    def payload(self, name, **params):
+        """Payload bagian name; dibangun (atau ditunggu) jika belum siap"""
+        key = (self.data.version, name, self.params(name, **params))
+        return self.cache.get_or_build(key, lambda: self._build(name, dict(key[2])))
+
+    def _build(self, name, params):
+        # Hanya konstruksi figur yang dikunci (rendering.plot); agregasi dan indeks
+        # bagian lain berjalan bersamaan
+        payload = dict(SECTIONS[name][0](self.data, **params))
+        # Figur disimpan sebagai JSON terkompresi: ringkas dan tidak ikut berubah
+        # oleh sesi yang menampilkannya
+        payload['figures'] = {key: compress_figure(fig) for key, fig in payload.get('figures', {}).items()}
+        return payload
+
+    def start(self):
+        """Menjalankan worker latar belakang sekali; semua bagian dibangun dengan params default"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._warm, name='section-prewarm', daemon=True)
+            self._thread.start()
+        return self
+
+    def _warm(self):
+        for name in self.sections:
+            with stage(f'prewarm:{name}'):
+                self.payload(name)
+
+
+def figure(payload, key):
+    """Figur Plotly yang di-replay dari spec di payload (None jika tidak ada)"""
+    return replay_figure(payload['figures'].get(key))
+
+
+@section('overview')
+def overview(data):
+    return dict(data.summary)
+
+
+@section('demografi')
+def demografi(data):
+    integrated_data = data.integrated_data
+    figures = {}
+
+    # Distribusi Kelompok Usia
+    age_distribution = integrated_data['age_group'].value_counts().sort_index()
+    fig = rendering.plot(
+        px.bar,
+        x=age_distribution.index,
+        y=age_distribution.values,
+        title="Distribusi Pengguna per Kelompok Usia",
+        labels={'x': 'Kelompok Usia', 'y': 'Jumlah Pengguna'},
+        color=age_distribution.values,
+        color_continuous_scale='viridis'
+    )
+    fig.update_layout(showlegend=False, height=400)
+    figures['age_distribution'] = fig
+
+    # Histogram Usia
+    fig = rendering.histogram(
+        integrated_data,
+        x='Age',
+        title="Distribusi Usia Pengguna (Histogram)",
+        labels={'Age': 'Usia (tahun)', 'count': 'Jumlah Pengguna'},
+        nbins=30
+    )
+    fig.add_vline(x=integrated_data['Age'].mean(), line_dash="dash",
+                  annotation_text=f"Rata-rata: {integrated_data['Age'].mean():.1f}")
+    fig.add_vline(x=integrated_data['Age'].median(), line_dash="dot",
+                  annotation_text=f"Median: {integrated_data['Age'].median():.1f}")
+    fig.update_layout(height=400)
+    figures['age_histogram'] = fig
+
+    # Aktivitas per Kelompok Usia (dari kubus agregat)
+    age_activity = data.cube.aggregate('age_group', ['friend_count', 'post_count', 'reactions_given', 'reactions_received'])
+    fig = rendering.plot(go.Figure)
+    for column, name in [('friend_count', 'Rata-rata Teman'), ('post_count', 'Rata-rata Post'),
+                         ('reactions_given', 'Rata-rata Reaksi Diberikan'),
+                         ('reactions_received', 'Rata-rata Reaksi Diterima')]:
+        fig.add_trace(go.Scatter(x=age_activity.index, y=age_activity[column],
+                                 mode='lines+markers', name=name, line=dict(width=3)))
+    fig.update_layout(
+        title="Pola Aktivitas per Kelompok Usia",
+        xaxis_title="Kelompok Usia",
+        yaxis_title="Rata-rata Aktivitas",
+        height=500
+    )
+    figures['age_activity'] = fig
+
+    # Drill-down per usia tunggal
+    age_detail = data.cube.aggregate('Age', 'total_activity', stat='mean')
+    age_detail_std = data.cube.aggregate('Age', 'total_activity', stat='std')
+    fig = rendering.plot(go.Figure, go.Scatter(
+        x=age_detail.index, y=age_detail.values,
+        error_y=dict(type='data', array=age_detail_std.fillna(0).values, visible=True),
+        mode='lines+markers', name='Rata-rata Total Aktivitas'
+    ))
+    fig.update_layout(
+        title="Drill-down: Rata-rata Total Aktivitas per Usia",
+        xaxis_title="Usia (tahun)",
+        yaxis_title="Rata-rata Total Aktivitas",
+        height=400
+    )
+    figures['age_detail'] = fig
+    return {'figures': figures}
+
+
+@section('top_performers', top_n=10)
+def top_performers(data, top_n):
+    ranking = data.ranking
+    figures = {}
+
+    # Top Active Users
+    fig = rendering.plot(
+        px.bar,
+        ranking.top('total_activity', top_n),
+        x='total_activity',
+        y=ranking.top_labels('total_activity', top_n),
+        orientation='h',
+        title=f"Top {top_n} Pengguna Paling Aktif",
+        labels={'total_activity': 'Total Aktivitas', 'y': 'Pengguna'}
+    )
+    fig.update_layout(height=400)
+    figures['top_active'] = fig
+
+    # Top Posters
+    fig = rendering.plot(
+        px.bar,
+        ranking.top('post_count', top_n),
+        x='post_count',
+        y=ranking.top_labels('post_count', top_n),
+        orientation='h',
+        title=f"Top {top_n} Content Creator",
+        labels={'post_count': 'Jumlah Post', 'y': 'Pengguna'}
+    )
+    fig.update_layout(height=400)
+    figures['top_posters'] = fig
+    return {'figures': figures, 'top_detailed': ranking.top('total_activity', top_n)[TOP_DETAIL_COLUMNS]}
+
+
+@section('analisis_reaksi')
+def analisis_reaksi(data):
+    reaction_counts = data.reaction_counts
+    figures = {}
+
+    # Pie chart reaksi
+    fig = rendering.plot(
+        px.pie,
+        values=reaction_counts.values,
+        names=reaction_counts.index,
+        title="Proporsi Jenis Reaksi"
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(height=400)
+    figures['reaction_pie'] = fig
+
+    # Bar chart reaksi
+    fig = rendering.plot(
+        px.bar,
+        x=reaction_counts.index,
+        y=reaction_counts.values,
+        title="Jumlah Reaksi per Jenis",
+        labels={'x': 'Jenis Reaksi', 'y': 'Jumlah'},
+        color=reaction_counts.values,
+        color_continuous_scale='plasma'
+    )
+    fig.update_layout(showlegend=False, height=400)
+    figures['reaction_bar'] = fig
+    return {'figures': figures}
+
+
+@section('analisis_reaksi.timeline', granularity='Harian', by_type=False)
+def reaction_timeline(data, granularity, by_type):
+    # Timeline reaksi dari rollup yang dibangun sekali per versi dataset
+    rollup = data.rollup
+    timeline = rollup.reactions.range(GRANULARITIES[granularity], by_type=by_type)
+    timeline = timeline.rename_axis('date').reset_index()
+    fig = rendering.line(
+        timeline,
+        x='date',
+        y=rollup.reactions.types if by_type else 'count',
+        title=f"Timeline Aktivitas Reaksi {granularity}"
+    )
+    fig.update_layout(height=400)
+    return {'figures': {'timeline': fig}}
+
+
+@section('distribusi_aktivitas')
+def distribusi_aktivitas(data):
+    integrated_data = data.integrated_data
+    figures = {}
+
+    # Pie chart level aktivitas
+    activity_counts = integrated_data['activity_level'].value_counts()
+    activity_counts = activity_counts[activity_counts > 0]
+    fig = rendering.plot(
+        px.pie,
+        values=activity_counts.values,
+        names=activity_counts.index,
+        title="Proporsi Level Aktivitas Pengguna"
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(height=400)
+    figures['activity_pie'] = fig
+
+    # Engagement ratio distribution
+    posting_users = integrated_data[integrated_data['post_count'] > 0]
+    fig = rendering.histogram(
+        posting_users,
+        x='engagement_ratio',
+        title="Distribusi Engagement Ratio",
+        labels={'engagement_ratio': 'Engagement Ratio', 'count': 'Jumlah Pengguna'},
+        nbins=30
+    )
+    fig.add_vline(x=posting_users['engagement_ratio'].mean(), line_dash="dash",
+                  annotation_text=f"Rata-rata: {posting_users['engagement_ratio'].mean():.2f}")
+    fig.update_layout(height=400)
+    figures['engagement'] = fig
+
+    # Post type analysis
+    figures['post_types'] = None
+    post_type_counts = data.post_type_counts
+    if post_type_counts is not None:
+        fig = rendering.plot(
+            px.bar,
+            x=post_type_counts.index,
+            y=post_type_counts.values,
+            title="Distribusi Jenis Postingan",
+            labels={'x': 'Jenis Post', 'y': 'Jumlah'},
+            color=post_type_counts.values,
+            color_continuous_scale='viridis'
+        )
+        fig.update_layout(showlegend=False, height=400)
+        figures['post_types'] = fig
+    return {'figures': figures}
+
+
+def add_trendline(fig, trend, x_range):
+    """Garis tren OLS dari hasil MomentAccumulator.regression()"""
+    x = np.array(x_range)
+    fig.add_trace(go.Scatter(x=x, y=trend['intercept'] + trend['slope'] * x, mode='lines',
+                             line=dict(color='red', dash='dash'), name='Tren OLS', showlegend=False))
+
+
+def trend_label(trend):
+    """Kemiringan tren beserta selang kepercayaan 95%"""
+    low, high = trend['slope_ci']
+    return f"Tren: {trend['slope']:.3f} (95% CI {low:.3f} s.d. {high:.3f})"
+
+
+def _annotate_trend(fig, moments, x, y):
+    trend = moments.regression(x, y)
+    add_trendline(fig, trend, moments.range(x))
+    fig.add_annotation(
+        text=f"Korelasi: {trend['correlation']:.3f}<br>{trend_label(trend)}",
+        xref="paper", yref="paper",
+        x=0.02, y=0.98,
+        showarrow=False,
+        bgcolor="yellow",
+        bordercolor="black"
+    )
+    fig.update_layout(height=400)
+
+
+@section('korelasi')
+def korelasi(data):
+    # Korelasi dan garis tren dibaca dari akumulator momen (tanpa memindai ulang data)
+    integrated_data = data.integrated_data
+    figures = {}
+
+    # Scatter plot: Friends vs Posts
+    fig = rendering.scatter(
+        integrated_data,
+        x='friend_count',
+        y='post_count',
+        color='total_activity',
+        size='Age',
+        title="Hubungan Jumlah Teman vs Postingan",
+        labels={'friend_count': 'Jumlah Teman', 'post_count': 'Jumlah Post'},
+        color_continuous_scale='viridis'
+    )
+    _annotate_trend(fig, data.moments, 'friend_count', 'post_count')
+    figures['friends_posts'] = fig
+
+    # Scatter plot: Age vs Activity
+    fig = rendering.scatter(
+        integrated_data,
+        x='Age',
+        y='total_activity',
+        color='age_group',
+        title="Hubungan Usia vs Total Aktivitas",
+        labels={'Age': 'Usia', 'total_activity': 'Total Aktivitas'}
+    )
+    _annotate_trend(fig, data.moments, 'Age', 'total_activity')
+    figures['age_activity'] = fig
+    return {'figures': figures}
+
+
+@section('korelasi.matrix', method='Pearson')
+def correlation_matrix(data, method):
+    moments = data.moments if method == "Pearson" else data.spearman_moments
+    matrix = moments.correlation().loc[CORRELATION_VARS, CORRELATION_VARS]
+    fig = rendering.plot(
+        px.imshow,
+        matrix,
+        text_auto=True,
+        aspect="auto",
+        title=f"Matriks Korelasi Antar Variabel ({method})",
+        color_continuous_scale='RdBu'
+    )
+    fig.update_layout(height=500)
+    return {'figures': {'matrix': fig}}
+
+
+@section('insights.heatmap', drill_down=False)
+def activity_heatmap(data, drill_down):
+    # Heatmap aktivitas per usia dan tahun (dari kubus agregat)
+    age_dimension = 'Age' if drill_down else 'age_group'
+    heatmap = data.cube.heatmap(age_dimension, 'registration_year', 'total_activity')
+    fig = rendering.plot(
+        px.imshow,
+        heatmap,
+        text_auto=True,
+        aspect="auto",
+        title="Pola Aktivitas Berdasarkan Usia dan Tahun Bergabung",
+        labels={'x': 'Tahun Registrasi', 'y': 'Usia' if drill_down else 'Kelompok Usia'},
+        color_continuous_scale='YlOrRd'
+    )
+    fig.update_layout(height=400)
+    return {'figures': {'heatmap': fig}}
+
+
+@section('insights')
+def insights(data):
+    integrated_data = data.integrated_data
+    posting_users = integrated_data[integrated_data['post_count'] > 0]
+    correlation = data.moments.correlation('friend_count', 'post_count')
+    if correlation > 0.3:
+        social_insight = "Pengguna yang lebih sosial cenderung lebih aktif posting"
+    elif correlation < -0.3:
+        social_insight = "Pengguna yang lebih sosial cenderung kurang aktif posting"
+    else:
+        social_insight = "Tidak ada hubungan kuat antara jumlah teman dan aktivitas posting"
+    return {
+        'most_active_age': data.cube.aggregate('age_group', 'total_activity').idxmax(),
+        'high_engagement_pct': (posting_users['engagement_ratio'] > posting_users['engagement_ratio'].median()).mean() * 100,
+        'social_insight': social_insight,
+        'top_reaction': data.reaction_counts.index[0],
+        'inactive_pct': (integrated_data['total_activity'] == 0).mean() * 100,
+        'avg_posts': posting_users['post_count'].mean(),
+    }
+
+
+def _age_bounds(data):
+    return tuple(int(v) for v in data.filter_index.bounds('Age'))
+
+
+@section('insights.filter', age_range=_age_bounds, activity_threshold=0)
+def insights_filter(data, age_range, activity_threshold):
+    # Indeks terurut + prefix sum, tanpa mask atas seluruh data
+    filter_ranges = {'Age': age_range, 'total_activity': (activity_threshold, None)}
+    filtered_count, filtered_means = data.filter_index.stats(filter_ranges)
+    fig = None
+    if filtered_count > 0:
+        fig = rendering.scatter(
+            data.filter_index.select(filter_ranges),
+            x='friend_count',
+            y='post_count',
+            color='age_group',
+            size='total_activity',
+            title="Data Terfilter: Teman vs Post",
+            hover_data=['Name', 'Surname', 'Age']
+        )
+        fig.update_layout(height=400)
+    return {'filtered_count': filtered_count, 'filtered_means': filtered_means,
+            'figures': {'filtered': fig}}
+
+
+@section('jaringan')
+def jaringan(data):
+    integrated_data = data.integrated_data
+    graph = data.graph
+    degrees = graph.degrees()
+    figures = {}
+
+    # Distribusi derajat
+    degree_counts = np.bincount(degrees)
+    fig = rendering.plot(
+        px.bar,
+        x=np.arange(len(degree_counts)),
+        y=degree_counts,
+        title="Distribusi Derajat (Jumlah Teman per Pengguna)",
+        labels={'x': 'Jumlah Teman', 'y': 'Jumlah Pengguna'}
+    )
+    fig.update_layout(height=400)
+    figures['degrees'] = fig
+
+    fig = rendering.histogram(
+        integrated_data,
+        x='clustering_coefficient',
+        title="Distribusi Koefisien Clustering",
+        labels={'clustering_coefficient': 'Koefisien Clustering', 'count': 'Jumlah Pengguna'},
+        nbins=30
+    )
+    fig.update_layout(height=400)
+    figures['clustering'] = fig
+
+    component_sizes = integrated_data.groupby('component_id')['component_size'].first()
+    return {
+        'num_nodes': graph.num_nodes,
+        'num_edges': graph.num_edges,
+        'degree_mean': degrees.mean(),
+        'degree_max': degrees.max(),
+        'components': len(component_sizes),
+        'largest_component': component_sizes.max(),
+        'triangles': integrated_data['triangle_count'].sum() // 3,
+        'clustering_mean': integrated_data['clustering_coefficient'].mean(),
+        'top_pagerank': integrated_data.nlargest(10, 'pagerank')[['user_id', 'Name', 'Surname', 'friend_count', 'pagerank']],
+        'figures': figures,
+    }
+
+
+@section('jaringan.hops', user_id=1, k=3)
+def reachable(data, user_id, k):
+    hops = data.graph.k_hop(user_id, k)
+    fig = rendering.plot(
+        px.bar,
+        x=[f"Hop {i}" for i in range(1, k + 1)],
+        y=hops,
+        title=f"Pengguna Baru yang Terjangkau dari User {user_id}",
+        labels={'x': 'Jarak', 'y': 'Jumlah Pengguna'}
+    )
+    fig.update_layout(height=400)
+    return {'reached': sum(hops), 'figures': {'hops': fig}}
@@ -0,0 +1,50 @@
+"""Penyimpanan dataset bersama antar sesi Streamlit dan proses.
+
+Tabel bersih dan dataset terintegrasi diterbitkan sekali per versi dataset
+sebagai file Arrow IPC tanpa kompresi, secara default di /dev/shm (memori
+bersama). Setiap proses memetakan file tersebut read-only lewat memory-map:
+kolom numerik tanpa nilai kosong menjadi view numpy langsung ke halaman
+memori bersama, jadi jumlah penonton atau replika tidak menggandakan data.
+"""
+import os
+
+from analisis.artifact_cache import ArtifactCache
+from analisis.snapshot import cache_dir
+
+try:
+    import pyarrow
+    import pyarrow.feather as feather
+except ImportError:
+    pyarrow = None
+
+SHM_DIR = '/dev/shm'
+
+
+def shared_dir():
+    """Direktori store (SOSMED_SHARED_DIR, /dev/shm/sosmed, atau cache lokal)"""
+    directory = os.environ.get('SOSMED_SHARED_DIR')
+    if directory:
+        return directory
+    if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK):
+        return os.path.join(SHM_DIR, 'sosmed')
+    return cache_dir('shared')
+
+
+class SharedStore(ArtifactCache):
+    """ArtifactCache dengan file Arrow tanpa kompresi yang dipetakan zero-copy"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('SOSMED_SHARED_STORE_MB', 2048)) * 2**20
+        super().__init__(directory or shared_dir(), max_bytes)
+
+    def _write_frame(self, frame, path):
+        # Tanpa kompresi agar buffer di file bisa dipakai langsung; df.attrs ikut
+        # tersimpan di metadata pandas
+        table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+        feather.write_feather(table, path, compression='uncompressed')
+
+    def _read_frame(self, path):
+        # split_blocks: tiap kolom jadi blok sendiri sehingga kolom numerik tidak
+        # disalin ke blok gabungan (hasilnya read-only)
+        return feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
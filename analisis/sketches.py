@@ -0,0 +1,308 @@
+"""Sketch statistik yang bisa digabung untuk mode statistik aproksimasi.
+
+HyperLogLog menaksir jumlah nilai unik (mis. pengguna yang memberi reaksi)
+dan QuantileSketch (kompaktor bergaya KLL) menaksir median/kuantil. Keduanya
+dibangun per potongan saat ingest lalu digabung (lihat analisis/ingest.py),
+dan disimpan ringkas di df.attrs['sketches'] sehingga ikut tersimpan di
+snapshot Parquet maupun store bersama.
+
+Sketch ingest mencakup baris mentah (kecuali reaksi tanpa User), jadi median
+imputasi aproksimasi memakai populasi yang sama dengan median eksak saat
+cleaning. Jumlah unik HyperLogLog tidak berubah oleh dedup maupun imputasi,
+sedangkan sketch kuantil dibangun ulang atas baris bersih (refresh_quantiles)
+dalam mode aproksimasi, agar taksiran kuantil di dashboard memakai populasi
+yang sama dengan statistik eksak (tanpa duplikat, tanggal terisi).
+
+Setiap taksiran membawa batas galat (selang kepercayaan ~95%). Set
+SOSMED_APPROX=1 agar cleaning dan dashboard memakai taksiran sketch.
+"""
+import base64
+import math
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+HLL_PRECISION = 14
+QUANTILE_K = 256
+CONFIDENCE_Z = 1.96
+
+# Kolom yang disketch per tabel: label -> (jenis, kolom sumber)
+SKETCH_COLUMNS = {
+    'user_table': {'Age': ('quantile', ['Age'])},
+    'friends_table': {'Friend': ('distinct', ['Friend 1', 'Friend 2'])},
+    'posts_table': {'User': ('distinct', ['User'])},
+    'reactions_table': {'User': ('distinct', ['User']),
+                        'Reaction Date': ('quantile', ['Reaction Date'])},
+}
+
+# Tabel yang punya sketch kuantil (dibangun ulang atas baris bersih, lihat refresh_quantiles)
+QUANTILE_TABLES = {name for name, labels in SKETCH_COLUMNS.items()
+                   if any(kind == 'quantile' for kind, _ in labels.values())}
+
+# Baris yang akan dibuang cleaning (User kosong) tidak ikut disketch
+REQUIRED_COLUMNS = {'reactions_table': 'User'}
+
+
+def approx_mode():
+    """True jika SOSMED_APPROX=1 (statistik dari sketch, bukan hitung penuh)"""
+    return os.environ.get('SOSMED_APPROX', '0') == '1'
+
+
+def _encode(array):
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode('ascii')
+
+
+def _decode(text, dtype):
+    return np.frombuffer(base64.b64decode(text), dtype=dtype).copy()
+
+
+def _bit_length(values):
+    """Panjang bit tiap uint64 (0 untuk nol), tepat lewat dua paruh 32-bit"""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """Penaksir jumlah nilai unik dengan 2^p register (galat relatif 1,04/sqrt(2^p))"""
+
+    kind = 'distinct'
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+        values = np.asarray(values)
+        if len(values) == 0:
+            return self
+        hashes = pd.util.hash_array(values)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << np.uint64(self.precision)
+        rank = np.minimum(64 - _bit_length(rest) + 1, 64 - self.precision + 1)
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+        return self
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError('HyperLogLog dengan presisi berbeda tidak bisa digabung')
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Kardinalitas kecil: linear counting lebih akurat
+            estimate = m * math.log(m / zeros)
+        return float(estimate)
+
+    def relative_error(self):
+        """Setengah lebar selang ~95% relatif terhadap taksiran"""
+        return CONFIDENCE_Z * 1.04 / math.sqrt(len(self.registers))
+
+    def bounds(self):
+        estimate, error = self.estimate(), self.relative_error()
+        return estimate * (1 - error), estimate * (1 + error)
+
+    def to_dict(self):
+        return {'kind': self.kind, 'precision': self.precision,
+                'registers': _encode(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['precision'])
+        sketch.registers = _decode(data['registers'], np.uint8)
+        return sketch
+
+
+class QuantileSketch:
+    """Penaksir kuantil dari tumpukan kompaktor berkapasitas k (gaya KLL).
+
+    Level h menyimpan item berbobot 2^h. Saat level penuh, item diurutkan
+    dan separuhnya (posisi ganjil atau genap, acak) naik ke level berikutnya.
+    Tiap kompaksi menggeser rank sembarang titik sebesar 0 atau ±2^h dengan
+    peluang sama, jadi ragam galat rank dijumlahkan dan dipakai sebagai batas.
+    """
+
+    kind = 'quantile'
+
+    def __init__(self, k=QUANTILE_K, seed=0):
+        self.k = k
+        self.n = 0
+        self.variance = 0.0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += len(values)
+        self._compress()
+        return self
+
+    def merge(self, other):
+        for h, items in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.variance += other.variance
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self.k:
+                items = np.sort(items)
+                # Jumlah ganjil: item terbesar tetap tinggal di level ini
+                paired = len(items) - len(items) % 2
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                promoted = items[self._rng.integers(2):paired:2]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self.levels[h] = items[paired:]
+                self.variance += 4.0 ** h
+            h += 1
+
+    def quantile(self, q):
+        if self.n == 0:
+            return float('nan')
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** h) for h, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        weights = weights[order]
+        # Rank tiap item diukur di tengah bobotnya dan dipilih item terdekat, agar
+        # item berbobot besar di level atas tidak membuat taksiran bias ke atas
+        centers = np.cumsum(weights) - weights / 2
+        target = q * self.n
+        position = min(np.searchsorted(centers, target), len(centers) - 1)
+        if position > 0 and target - centers[position - 1] < centers[position] - target:
+            position -= 1
+        return float(items[order[position]])
+
+    def rank_error(self):
+        """Batas galat rank (~95%) sebagai fraksi dari n"""
+        if self.n == 0:
+            return 0.0
+        # Ditambah setengah bobot item terberat: jarak maksimum ke item terdekat
+        top = max(h for h, items in enumerate(self.levels) if len(items))
+        return (CONFIDENCE_Z * math.sqrt(self.variance) + 2.0 ** top / 2) / self.n
+
+    def bounds(self, q):
+        error = self.rank_error()
+        return self.quantile(max(q - error, 0.0)), self.quantile(min(q + error, 1.0))
+
+    def to_dict(self):
+        return {'kind': self.kind, 'k': self.k, 'n': self.n, 'variance': self.variance,
+                'levels': [_encode(items) for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['k'])
+        sketch.n = data['n']
+        sketch.variance = data['variance']
+        sketch.levels = [_decode(items, np.float64) for items in data['levels']]
+        return sketch
+
+
+SKETCH_TYPES = {'distinct': HyperLogLog, 'quantile': QuantileSketch}
+
+
+def _values(series):
+    """Nilai non-kosong sebagai float64 (datetime menjadi epoch detik)"""
+    series = series.dropna()
+    if is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9
+    return series.to_numpy(dtype=np.float64)
+
+
+def sketch_chunk(name, chunk, kinds=None):
+    """Sketch untuk satu potongan tabel sesuai SKETCH_COLUMNS[name] (hanya jenis `kinds` jika diberikan)"""
+    required = REQUIRED_COLUMNS.get(name)
+    if required in chunk:
+        chunk = chunk[chunk[required].notna()]
+    sketches = {}
+    for label, (kind, columns) in SKETCH_COLUMNS.get(name, {}).items():
+        if kinds is not None and kind not in kinds:
+            continue
+        sketch = SKETCH_TYPES[kind]()
+        for column in columns:
+            sketch.add(_values(chunk[column]))
+        sketches[label] = sketch
+    return sketches
+
+
+def merge_sketches(sketches, other):
+    """Menggabungkan sketch per label (sketches boleh None untuk potongan pertama)"""
+    if sketches is None:
+        return other
+    for label, sketch in other.items():
+        if label in sketches:
+            sketches[label].merge(sketch)
+        else:
+            sketches[label] = sketch
+    return sketches
+
+
+def sketch_frame(name, df, chunksize, kinds=None):
+    """Sketch seluruh frame, dibangun per potongan chunksize baris lalu digabung"""
+    sketches = None
+    for start in range(0, max(len(df), 1), chunksize):
+        sketches = merge_sketches(sketches, sketch_chunk(name, df.iloc[start:start + chunksize], kinds))
+    return sketches
+
+
+def attach_sketches(df, sketches):
+    """Menyimpan sketch ke df.attrs['sketches'] dalam bentuk yang bisa diserialisasi"""
+    if sketches:
+        df.attrs['sketches'] = {label: sketch.to_dict() for label, sketch in sketches.items()}
+    return df
+
+
+def refresh_quantiles(name, df, chunksize):
+    """Membangun ulang sketch kuantil df atas barisnya sekarang; sketch lain dipertahankan"""
+    fresh = sketch_frame(name, df, chunksize, kinds=('quantile',))
+    if fresh:
+        attach_sketches(df, {**table_sketches(df), **fresh})
+    return df
+
+
+def table_sketches(df):
+    """Sketch tabel dari df.attrs['sketches'] (dict kosong jika belum ada)"""
+    return {label: SKETCH_TYPES[data['kind']].from_dict(data)
+            for label, data in df.attrs.get('sketches', {}).items()}
+
+
+def approximate_stats(users, friends, posts, reactions):
+    """Taksiran statistik Overview beserta batas galatnya.
+
+    Mengembalikan dict nama -> {'estimate', 'lower', 'upper', 'error'};
+    statistik yang sketch-nya tidak tersedia dilewati. Tanggal dalam epoch detik.
+    """
+    stats = {}
+    distinct = {'friend_users': (friends, 'Friend'), 'active_posters': (posts, 'User'),
+                'reacting_users': (reactions, 'User')}
+    for key, (df, label) in distinct.items():
+        sketch = table_sketches(df).get(label)
+        if sketch is not None:
+            lower, upper = sketch.bounds()
+            stats[key] = {'estimate': sketch.estimate(), 'lower': lower, 'upper': upper,
+                          'error': f'±{sketch.relative_error():.1%}'}
+    quantiles = {'age_q1': (users, 'Age', 0.25), 'age_median': (users, 'Age', 0.5),
+                 'age_q3': (users, 'Age', 0.75),
+                 'reaction_date_median': (reactions, 'Reaction Date', 0.5)}
+    for key, (df, label, q) in quantiles.items():
+        sketch = table_sketches(df).get(label)
+        if sketch is not None:
+            lower, upper = sketch.bounds(q)
+            stats[key] = {'estimate': sketch.quantile(q), 'lower': lower, 'upper': upper,
+                          'error': f'rank ±{sketch.rank_error():.1%}'}
+    return stats
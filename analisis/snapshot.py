@@ -0,0 +1,268 @@
+"""Snapshot kolumnar lokal untuk keempat tabel sumber.
+
+Setiap tabel CSV diparse sekali, kolom tanggal epoch langsung dikonversi ke
+datetime64, lalu hasilnya disimpan sebagai Parquet dengan kunci hash isi
+file. Pemuatan berikutnya cukup membaca Parquet tersebut.
+
+Sumber URL diunduh bersamaan untuk keempat tabel, dengan timeout, retry, dan
+revalidasi bersyarat (ETag/Last-Modified) terhadap salinan unduhan lokal.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from analisis.ingest import read_default_csv, read_typed_csv
+from analisis.profiling import inherit, stage
+
+try:
+    import pyarrow  # noqa: F401  (dibutuhkan oleh DataFrame.to_parquet)
+except ImportError:
+    pyarrow = None
+
+DATA_BASE_URL = 'https://raw.githubusercontent.com/cayaaa14/data-real/refs/heads/main'
+TABLE_NAMES = ['user_table', 'friends_table', 'posts_table', 'reactions_table']
+
+# Naikkan nilai ini jika cara parsing berubah agar snapshot lama tidak dipakai
+SNAPSHOT_VERSION = 3
+
+FETCH_TIMEOUT = 30
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.5
+# Unduhan yang lebih baru dari ini (detik) dipakai tanpa revalidasi ke server
+FETCH_MAX_AGE = 60
+
+
+def data_source():
+    """Sumber CSV: direktori lokal dari SOSMED_DATA_DIR atau URL GitHub"""
+    return os.environ.get('SOSMED_DATA_DIR', DATA_BASE_URL)
+
+
+def cache_dir(*parts):
+    """Direktori cache lokal (default .cache, ubah lewat SOSMED_CACHE_DIR)"""
+    return os.path.join(os.environ.get('SOSMED_CACHE_DIR', '.cache'), *parts)
+
+
+def snapshot_dir():
+    """Direktori penyimpanan snapshot Parquet"""
+    return os.environ.get('SOSMED_SNAPSHOT_DIR', cache_dir('snapshot'))
+
+
+def map_tables(func, names=TABLE_NAMES, workers=None):
+    """func(name) untuk setiap tabel di thread pool; hasil sesuai urutan names.
+
+    Tabel-tabel saling bebas sampai diintegrasikan, jadi unduhan, parsing, dan
+    cleaning cukup menunggu tabel yang paling lambat. workers default dari
+    SOSMED_LOAD_WORKERS (atau satu thread per tabel); 1 berarti berurutan.
+    """
+    workers = workers or int(os.environ.get('SOSMED_LOAD_WORKERS', len(names)))
+    if workers <= 1 or len(names) <= 1:
+        return [func(name) for name in names]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(inherit(func), name) for name in names]
+        return [future.result() for future in futures]
+
+
+def _read_fetch_meta(path):
+    try:
+        with open(f'{path}.meta.json') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_fetch_meta(path, meta):
+    tmp_path = f'{path}.meta.json.tmp-{os.getpid()}-{threading.get_ident()}'
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, f'{path}.meta.json')
+
+
+def fetch(url, path, timeout=FETCH_TIMEOUT, retries=FETCH_RETRIES, max_age=FETCH_MAX_AGE):
+    """Mengunduh url ke path; mengembalikan status 'fresh', 'not_modified', atau 'downloaded'.
+
+    Salinan lokal yang ada direvalidasi lewat If-None-Match/If-Modified-Since
+    (respons 304 berarti file tidak diunduh ulang). Galat jaringan, timeout,
+    429, dan 5xx dicoba ulang dengan jeda eksponensial; galat lain langsung
+    diteruskan (HTTPError/URLError adalah turunan OSError).
+    """
+    meta = _read_fetch_meta(path) if os.path.exists(path) else {}
+    if meta and time.time() - meta.get('fetched_at', 0) < max_age:
+        return 'fresh'
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+
+    tmp_path = f'{path}.tmp-{os.getpid()}-{threading.get_ident()}'
+    for attempt in range(retries):
+        try:
+            request = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                with open(tmp_path, 'wb') as f:
+                    shutil.copyfileobj(response, f)
+                meta = {'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified')}
+            os.replace(tmp_path, path)
+            status = 'downloaded'
+            break
+        except urllib.error.HTTPError as error:
+            if error.code == 304:
+                status = 'not_modified'
+                break
+            if error.code != 429 and error.code < 500 or attempt == retries - 1:
+                raise
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            if attempt == retries - 1:
+                raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        time.sleep(FETCH_BACKOFF * 2 ** attempt)
+    _write_fetch_meta(path, {**meta, 'fetched_at': time.time()})
+    return status
+
+
+def source_path(name, source=None):
+    """Path lokal <name>.csv; sumber URL diunduh (atau direvalidasi) ke cache unduhan"""
+    source = source or data_source()
+    if '://' not in source:
+        return os.path.join(source, f'{name}.csv')
+    os.makedirs(cache_dir('downloads'), exist_ok=True)
+    path = cache_dir('downloads', f'{name}.csv')
+    with stage(f'fetch:{name}') as record:
+        record['status'] = fetch(f'{source.rstrip("/")}/{name}.csv', path,
+                                 timeout=float(os.environ.get('SOSMED_FETCH_TIMEOUT', FETCH_TIMEOUT)))
+    return path
+
+
+def content_hash(path, typed=False):
+    """Kunci snapshot dari isi file, mode ingest, dan versi parser"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(f'v{SNAPSHOT_VERSION}-{"typed" if typed else "default"}'.encode())
+    return digest.hexdigest()[:20]
+
+
+def parse_table(name, path, typed=False):
+    """Parse CSV; mode typed memakai skema ringkas dan pembacaan bertahap"""
+    if typed:
+        return read_typed_csv(path, name)
+    return read_default_csv(path, name)
+
+
+def _snapshot_path(name, key):
+    return os.path.join(snapshot_dir(), f'{name}-{key}.parquet')
+
+
+def _latest_path(name, typed):
+    return os.path.join(snapshot_dir(), f'{name}{"-typed" if typed else ""}.latest')
+
+
+def read_snapshot(name, key):
+    """Membaca snapshot untuk kunci tertentu, None jika belum ada"""
+    path = _snapshot_path(name, key)
+    if pyarrow is None or not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def write_snapshot(name, key, df, typed=False):
+    """Menyimpan snapshot secara atomik dan mencatatnya sebagai yang terbaru"""
+    if pyarrow is None:
+        return
+    os.makedirs(snapshot_dir(), exist_ok=True)
+    path = _snapshot_path(name, key)
+    tmp_path = f'{path}.tmp-{os.getpid()}'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    with open(_latest_path(name, typed), 'w') as f:
+        f.write(key)
+
+
+def latest_snapshot_key(name, typed=False):
+    """Kunci snapshot terakhir yang tersimpan untuk tabel, None jika tidak ada"""
+    try:
+        with open(_latest_path(name, typed)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _load_table(name, source, typed):
+    try:
+        path = source_path(name, source)
+        key = content_hash(path, typed)
+    except OSError:
+        key = latest_snapshot_key(name, typed)
+        df = read_snapshot(name, key) if key else None
+        if df is None:
+            raise
+        return df, key, 'snapshot'
+
+    df = read_snapshot(name, key)
+    if df is not None:
+        return df, key, 'snapshot'
+    df = parse_table(name, path, typed)
+    write_snapshot(name, key, df, typed)
+    return df, key, 'typed' if typed else 'csv'
+
+
+def load_table(name, source=None, typed=False):
+    """Memuat satu tabel sumber lewat snapshot Parquet.
+
+    Jika sumber tidak dapat dijangkau (misalnya offline), snapshot terakhir
+    yang tersimpan dipakai sebagai gantinya. Puncak memori pemuatan dicatat
+    di df.attrs['ingest'] (peak_shared=True jika tabel lain dimuat bersamaan,
+    lihat analisis/profiling.py).
+    """
+    with stage(f'load:{name}', trace_memory=True) as record:
+        df, key, mode = _load_table(name, source, typed)
+        record.update(rows=len(df), mode=mode)
+    df.attrs['content_hash'] = key
+    df.attrs['ingest'] = {
+        'table': name,
+        'mode': mode,
+        'rows': len(df),
+        'peak_mb': record['peak_mb'],
+        'peak_shared': record['peak_shared'],
+        'resident_mb': df.memory_usage(deep=True).sum() / 2**20,
+    }
+    return df
+
+
+def dataset_version(*tables):
+    """Versi dataset dari gabungan hash isi tabel-tabel sumber"""
+    keys = [str(df.attrs.get('content_hash', '')) for df in tables]
+    return hashlib.sha256('|'.join(keys).encode()).hexdigest()[:16]
+
+
+def source_version(source=None, typed=False):
+    """Versi dataset dari hash isi file sumber tanpa memuat tabelnya.
+
+    Sama dengan dataset_version(*load_tables(source, typed)); jika sumber tidak
+    dapat dijangkau dipakai kunci snapshot terakhir seperti pada load_table.
+    """
+    def source_key(name):
+        try:
+            return content_hash(source_path(name, source), typed)
+        except OSError:
+            return latest_snapshot_key(name, typed)
+
+    keys = map_tables(source_key)
+    return hashlib.sha256('|'.join(str(key or '') for key in keys).encode()).hexdigest()[:16]
+
+
+def load_tables(source=None, typed=False, workers=None):
+    """Memuat users, friends, posts, reactions (bersamaan) sesuai urutan TABLE_NAMES"""
+    return tuple(map_tables(lambda name: load_table(name, source, typed), workers=workers))
@@ -0,0 +1,165 @@
+"""Generator data sintetis deterministik untuk keempat tabel sumber.
+
+Skala ditentukan oleh jumlah reaksi; tabel lain mengikuti rasio dataset asli
+(±1 user per 25 reaksi, 0,36 pertemanan dan 0,5 post per reaksi). Derajat
+pertemanan mengikuti power-law dan aktivitas posting/reaksi mengikuti Zipf.
+Tabel besar ditulis ke CSV per chunk agar skala 10^8 tetap muat di memori.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from analisis.snapshot import TABLE_NAMES
+
+NAMES = ['Ali', 'Sarah', 'Francine', 'Lee', 'Hans', 'Jordi']
+SURNAMES = ['Wellington', 'Pomme', 'Picard', 'Smith', 'Di Lillo', 'Roth']
+POST_TYPES = ['Text', 'Image', 'Video', 'Gif', 'Status_Change']
+REACTION_TYPES = ['Like', 'Emoticon', 'Comment']
+
+EPOCH_START = 1_420_070_400   # 2015-01-01
+EPOCH_END = 1_609_459_200     # 2021-01-01
+ACTIVITY_START = 1_577_836_800  # 2020-01-01
+
+CHUNK_ROWS = 1_000_000
+DUPLICATE_RATE = 0.005
+FRIEND_EXPONENT = 0.9
+POST_EXPONENT = 0.9
+REACTION_EXPONENT = 0.8
+# Reaksi asli memuat id user di luar tabel users (hingga ~9x jumlah user)
+REACTION_ID_SPAN = 9
+REACTION_NULL_RATE = 0.001
+
+
+def table_sizes(n_reactions):
+    """Jumlah baris per tabel untuk skala n_reactions"""
+    n_reactions = int(n_reactions)
+    return {
+        'user_table': max(n_reactions // 25, 100),
+        'friends_table': int(n_reactions * 0.36),
+        'posts_table': n_reactions // 2,
+        'reactions_table': n_reactions,
+    }
+
+
+def _rng(seed, *stream):
+    return np.random.default_rng([seed, *stream])
+
+
+def zipf_cdf(n, exponent, seed, stream):
+    """CDF bobot Zipf atas id 1..n yang urutannya diacak (deterministik)"""
+    weights = np.arange(1, n + 1, dtype=np.float64) ** -exponent
+    weights = weights[_rng(seed, stream, 0).permutation(n)]
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def _sample(cdf, size, rng):
+    return np.searchsorted(cdf, rng.random(size), side='right').astype(np.int64) + 1
+
+
+def _with_duplicates(df, rng):
+    """Menimpa sebagian kecil baris dengan salinan baris lain (duplikat persis)"""
+    n_dup = int(len(df) * DUPLICATE_RATE)
+    rows = np.arange(len(df))
+    rows[rng.choice(len(df), n_dup, replace=False)] = rng.integers(0, len(df), n_dup)
+    return df.take(rows).reset_index(drop=True)
+
+
+def _dates(rng, size, start=ACTIVITY_START, end=EPOCH_END):
+    return rng.integers(start, end, size)
+
+
+def users_chunk(n_users, seed):
+    rng = _rng(seed, 1)
+    ages = np.rint(rng.normal(33, 10, n_users)).astype(np.int64)
+    # Sedikit usia tidak valid seperti di data asli
+    ages[rng.random(n_users) < 0.002] *= -1
+    return pd.DataFrame({
+        'Surname': rng.choice(SURNAMES, n_users),
+        'Name': rng.choice(NAMES, n_users),
+        'Age': ages,
+        'Subscription Date': _dates(rng, n_users, EPOCH_START, EPOCH_END),
+    })
+
+
+def friends_chunk(size, cdf, seed, chunk):
+    rng = _rng(seed, 2, chunk)
+    # Satu ujung mengikuti Zipf (hub), ujung lain seragam: derajat power-law tanpa banyak pasangan kembar
+    first = _sample(cdf, size, rng)
+    second = rng.integers(1, len(cdf) + 1, size)
+    df = pd.DataFrame({'Friend 1': first, 'Friend 2': second})
+    # Sebagian baris menjadi pasangan terbalik (B,A) agar dedup tak berarah ikut teruji
+    n_rev = int(size * DUPLICATE_RATE)
+    rows = rng.choice(size, n_rev, replace=False)
+    source = rng.integers(0, size, n_rev)
+    df.loc[rows, 'Friend 1'] = second[source]
+    df.loc[rows, 'Friend 2'] = first[source]
+    return _with_duplicates(df, rng)
+
+
+def posts_chunk(size, cdf, seed, chunk):
+    rng = _rng(seed, 3, chunk)
+    df = pd.DataFrame({
+        'User': _sample(cdf, size, rng),
+        'Post Type': rng.choice(POST_TYPES, size, p=[0.35, 0.25, 0.2, 0.1, 0.1]),
+        'Post Date': _dates(rng, size),
+    })
+    return _with_duplicates(df, rng)
+
+
+def reactions_chunk(size, cdf, seed, chunk):
+    rng = _rng(seed, 4, chunk)
+    users = _sample(cdf, size, rng).astype(np.float64)
+    users[rng.random(size) < REACTION_NULL_RATE] = np.nan
+    types = rng.choice(REACTION_TYPES, size, p=[0.5, 0.3, 0.2]).astype(object)
+    types[rng.random(size) < REACTION_NULL_RATE] = None
+    dates = _dates(rng, size).astype(np.float64)
+    dates[rng.random(size) < REACTION_NULL_RATE] = np.nan
+    df = pd.DataFrame({'User': users, 'Reaction Type': types, 'Reaction Date': dates})
+    return _with_duplicates(df, rng)
+
+
+def _chunks(total, chunk_rows):
+    for chunk, start in enumerate(range(0, total, chunk_rows)):
+        yield chunk, min(chunk_rows, total - start)
+
+
+def generate_tables(n_reactions, seed=0, chunk_rows=CHUNK_ROWS):
+    """Generator (nama tabel, chunk DataFrame) berurutan untuk keempat tabel"""
+    sizes = table_sizes(n_reactions)
+    n_users = sizes['user_table']
+    yield 'user_table', users_chunk(n_users, seed)
+
+    makers = {
+        'friends_table': (friends_chunk, zipf_cdf(n_users, FRIEND_EXPONENT, seed, 2)),
+        'posts_table': (posts_chunk, zipf_cdf(n_users, POST_EXPONENT, seed, 3)),
+        'reactions_table': (reactions_chunk,
+                            zipf_cdf(n_users * REACTION_ID_SPAN, REACTION_EXPONENT, seed, 4)),
+    }
+    for name, (make, cdf) in makers.items():
+        for chunk, size in _chunks(sizes[name], chunk_rows):
+            yield name, make(size, cdf, seed, chunk)
+
+
+def write_dataset(directory, n_reactions, seed=0, chunk_rows=CHUNK_ROWS):
+    """Menulis dataset sintetis sebagai CSV ke directory; mengembalikan jumlah baris per tabel"""
+    os.makedirs(directory, exist_ok=True)
+    rows = dict.fromkeys(TABLE_NAMES, 0)
+    for name in TABLE_NAMES:
+        path = os.path.join(directory, f'{name}.csv')
+        if os.path.exists(path):
+            os.remove(path)
+    for name, df in generate_tables(n_reactions, seed, chunk_rows):
+        path = os.path.join(directory, f'{name}.csv')
+        df.to_csv(path, mode='a', header=rows[name] == 0, index=False)
+        rows[name] += len(df)
+    return rows
+
+
+def make_tables(n_reactions, seed=0):
+    """Dataset sintetis langsung sebagai DataFrame (untuk skala kecil)"""
+    parts = dict((name, []) for name in TABLE_NAMES)
+    for name, df in generate_tables(n_reactions, seed):
+        parts[name].append(df)
+    return tuple(pd.concat(parts[name], ignore_index=True) for name in TABLE_NAMES)
@@ -0,0 +1,286 @@
+"""Validasi streaming keempat tabel sumber.
+
+Setiap tabel CSV dibaca sekali per potongan dan diperiksa: skema kolom, tipe
+nilai, nilai kosong, rentang nilai (Age 0-100), kewajaran epoch tanggal, dan
+integritas referensial (id pengguna di friends/posts/reactions harus ada di
+himpunan id pengguna). Baris yang gagal disalin ke file karantina
+<tabel>.quarantine.csv beserta alasannya; data sumber tidak diubah.
+
+Id pengguna diambil seperti pipeline: kolom id eksplisit jika ada (Id atau
+user_id), selain itu posisi 1..n baris users setelah duplikat dibuang (lihat
+aggregation.build_integrated_dataset). Hitungan baris, pemeriksaan, dan
+karantina dihitung atas baris CSV mentah, sebelum deduplikasi. Id pengguna
+dikumpulkan di pass validasi tabel users itu sendiri; tabel yang sudah dimuat
+mentah (validate_dataset(tables=...)) divalidasi tanpa membaca CSV lagi.
+
+    python -m analisis.validation --output validation
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+from analisis.aggregation import DenseIndex
+from analisis.dedup import row_hashes
+from analisis.ingest import CHUNK_SIZE, DATE_COLUMNS, SCHEMAS
+from analisis.profiling import stage
+from analisis.snapshot import TABLE_NAMES, cache_dir, source_path
+
+try:
+    import pyarrow
+    import pyarrow.csv as pyarrow_csv
+except ImportError:
+    pyarrow = None
+
+# Epoch wajar: sejak 2000-01-01 hingga sehari setelah validasi dijalankan
+EPOCH_MIN = 946_684_800
+EPOCH_SLACK = 86_400
+
+VALUE_RANGES = {'Age': (0, 100)}
+# Nilai kosong yang diisi saat cleaning (bukan baris rusak)
+NULLABLE_COLUMNS = {'reactions_table': ['Reaction Type', 'Reaction Date']}
+REFERENCE_COLUMNS = {
+    'friends_table': ['Friend 1', 'Friend 2'],
+    'posts_table': ['User'],
+    'reactions_table': ['User'],
+}
+# Kolom id pengguna eksplisit; tanpa kolom ini id adalah posisi baris setelah dedup
+USER_ID_COLUMNS = ['Id', 'user_id']
+REPORT_COLUMNS = ['table', 'check', 'rows', 'rate']
+QUARANTINE_SUFFIX = '.quarantine.csv'
+REPORT_NAME = 'validation.json'
+
+
+def _is_numeric(dtype):
+    return dtype not in ('category', 'str', 'object')
+
+
+def _is_integer(dtype):
+    return dtype.lower().startswith('int')
+
+
+class UserIds:
+    """Pengumpul id pengguna yang sah per potongan users, sama seperti yang dipakai pipeline"""
+
+    def __init__(self, header):
+        self.id_column = next((c for c in USER_ID_COLUMNS if c in header), None)
+        self.columns = [c for c in SCHEMAS['user_table'] if c in header]
+        self.parts = []
+
+    def add(self, chunk):
+        if self.id_column:
+            values = pd.to_numeric(chunk[self.id_column], errors='coerce').dropna()
+            self.parts.append(values.to_numpy(dtype=np.int64))
+        else:
+            self.parts.append(row_hashes(chunk[self.columns]))
+
+    def ids(self):
+        values = np.concatenate(self.parts) if self.parts else np.empty(0, dtype=np.int64)
+        if self.id_column:
+            return np.unique(values)
+        # Baris users yang sama persis dibuang saat cleaning, lalu diberi id 1..n
+        return np.arange(1, len(np.unique(values)) + 1)
+
+
+def user_ids(path, chunksize=CHUNK_SIZE):
+    """Id pengguna yang sah untuk cek referensial (membaca tabel users tersendiri)"""
+    with _csv_chunks(path, chunksize) as (header, chunks):
+        collector = UserIds(header)
+        for chunk in chunks:
+            collector.add(chunk)
+    return collector.ids()
+
+
+def _numeric_values(raw):
+    """Nilai kolom sebagai float64 (NaN jika bukan bilangan); tanggal yang sudah
+    dikonversi saat dimuat dikembalikan ke epoch detik"""
+    if is_datetime64_any_dtype(raw):
+        stamps = raw.to_numpy(dtype='datetime64[ns]')
+        return np.where(np.isnat(stamps), np.nan, stamps.astype(np.int64) / 1e9)
+    return pd.to_numeric(raw, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def check_chunk(name, chunk, users=None, epoch_max=None):
+    """Mask baris gagal per pemeriksaan untuk satu potongan; juga jumlah nilai kosong per kolom.
+
+    users adalah DenseIndex id pengguna yang sah (None: cek referensial dilewati).
+    """
+    masks = {}
+    nulls = {}
+    nullable = NULLABLE_COLUMNS.get(name, [])
+    for column, dtype in SCHEMAS[name].items():
+        if column not in chunk:
+            continue
+        raw = chunk[column]
+        missing = raw.isna().to_numpy()
+        nulls[column] = int(missing.sum())
+        if column not in nullable:
+            masks[f'null:{column}'] = missing
+        if not _is_numeric(dtype):
+            continue
+        values = _numeric_values(raw)
+        invalid = np.isnan(values) & ~missing
+        if _is_integer(dtype):
+            invalid |= ~np.isnan(values) & (np.mod(values, 1) != 0)
+        masks[f'type:{column}'] = invalid
+        if column in VALUE_RANGES:
+            low, high = VALUE_RANGES[column]
+            masks[f'range:{column}'] = (values < low) | (values > high)
+        if column == DATE_COLUMNS.get(name):
+            masks[f'date:{column}'] = (values < EPOCH_MIN) | (values > epoch_max)
+        if users is not None and column in REFERENCE_COLUMNS.get(name, []):
+            # Nilai kosong/bukan bilangan bulat sudah ditangkap cek null/type
+            integral = ~np.isnan(values) & (np.mod(values, 1) == 0)
+            known = np.zeros(len(values), dtype=bool)
+            known[integral] = users.positions(values[integral].astype(np.int64)) >= 0
+            masks[f'ref:{column}'] = integral & ~known
+    return masks, nulls
+
+
+def _reasons(masks, bad):
+    """Alasan per baris gagal; kombinasi pemeriksaan dikodekan sebagai bit lalu dipetakan ke teks"""
+    checks = list(masks)
+    codes = np.zeros(int(bad.sum()), dtype=np.int64)
+    for bit, check in enumerate(checks):
+        codes |= masks[check][bad].astype(np.int64) << bit
+    unique, inverse = np.unique(codes, return_inverse=True)
+    labels = np.array([';'.join(c for bit, c in enumerate(checks) if code >> bit & 1)
+                       for code in unique], dtype=object)
+    return labels[inverse]
+
+
+def _append_quarantine(rejected, path):
+    header = not os.path.exists(path)
+    if pyarrow is None:
+        rejected.to_csv(path, mode='a', index=False, header=header)
+        return
+    # Penulis CSV Arrow jauh lebih cepat untuk karantina besar (mis. referensi yatim)
+    table = pyarrow.Table.from_pandas(rejected, preserve_index=False)
+    with open(path, 'ab') as f:
+        pyarrow_csv.write_csv(table, f, pyarrow_csv.WriteOptions(include_header=header))
+
+
+def _frame_chunks(df, chunksize):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+@contextmanager
+def _csv_chunks(path, chunksize):
+    """(header, potongan) file CSV; kolom dibaca apa adanya (tanpa skema) agar nilai
+    yang salah tipe tetap terdeteksi"""
+    header = list(pd.read_csv(path, nrows=0).columns)
+    with pd.read_csv(path, chunksize=chunksize) as reader:
+        yield header, reader
+
+
+def validate_chunks(name, header, chunks, users=None, quarantine_path=None, collector=None):
+    """Validasi potongan-potongan satu tabel; collector (UserIds) ikut diisi di pass yang sama"""
+    expected = list(SCHEMAS[name])
+    summary = {
+        'table': name, 'rows': 0, 'quarantined': 0, 'checks': {}, 'nulls': {},
+        'missing_columns': [c for c in expected if c not in header],
+        'extra_columns': [c for c in header if c not in expected],
+    }
+    epoch_max = time.time() + EPOCH_SLACK
+    if quarantine_path and os.path.exists(quarantine_path):
+        os.remove(quarantine_path)
+
+    with stage(f'validate:{name}') as record:
+        for chunk in chunks:
+            if collector is not None:
+                collector.add(chunk)
+            masks, nulls = check_chunk(name, chunk, users, epoch_max)
+            for column, count in nulls.items():
+                summary['nulls'][column] = summary['nulls'].get(column, 0) + count
+            bad = np.zeros(len(chunk), dtype=bool)
+            for check, mask in masks.items():
+                summary['checks'][check] = summary['checks'].get(check, 0) + int(mask.sum())
+                bad |= mask
+            if quarantine_path and bad.any():
+                rejected = chunk[bad].copy()
+                rejected.insert(0, 'line', summary['rows'] + np.flatnonzero(bad) + 2)
+                rejected['reasons'] = _reasons(masks, bad)
+                _append_quarantine(rejected, quarantine_path)
+            summary['rows'] += len(chunk)
+            summary['quarantined'] += int(bad.sum())
+        record['rows'] = summary['rows']
+    return summary
+
+
+def validate_table(name, path, users=None, quarantine_path=None, chunksize=CHUNK_SIZE, collector=None):
+    """Validasi satu file CSV dalam satu pass; mengembalikan ringkasan hitungan (baris mentah)"""
+    with _csv_chunks(path, chunksize) as (header, chunks):
+        return validate_chunks(name, header, chunks, users, quarantine_path, collector)
+
+
+def validate_dataset(source=None, output_dir=None, chunksize=CHUNK_SIZE, tables=None):
+    """Validasi keempat tabel; id pengguna dari tabel users dipakai untuk cek referensial.
+
+    tables: keempat frame mentah yang sudah dimuat (urutan TABLE_NAMES, mis. hasil
+    load_tables() tanpa typed); jika diberikan, CSV tidak dibaca lagi.
+    """
+    output_dir = output_dir or cache_dir('validation')
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    users = None
+    for i, name in enumerate(TABLE_NAMES):
+        quarantine_path = os.path.join(output_dir, f'{name}{QUARANTINE_SUFFIX}')
+        if tables is None:
+            source_chunks = _csv_chunks(source_path(name, source), chunksize)
+        else:
+            source_chunks = nullcontext((list(tables[i].columns), _frame_chunks(tables[i], chunksize)))
+        with source_chunks as (header, chunks):
+            # Id pengguna dikumpulkan di pass validasi users, tanpa membaca tabelnya lagi
+            collector = UserIds(header) if name == 'user_table' else None
+            summary = validate_chunks(name, header, chunks, users, quarantine_path, collector)
+        if collector is not None:
+            ids = collector.ids()
+            summary['user_ids'] = len(ids)
+            users = DenseIndex(ids)
+        results.append(summary)
+    with open(os.path.join(output_dir, REPORT_NAME), 'w') as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def validation_report(results):
+    """Laporan ringkas: satu baris per pemeriksaan yang gagal, plus nilai kosong dan total karantina"""
+    rows = []
+    for summary in results:
+        total = max(summary['rows'], 1)
+        for column in summary['missing_columns']:
+            rows.append((summary['table'], f'schema:missing:{column}', summary['rows'], 1.0))
+        for column in summary['extra_columns']:
+            rows.append((summary['table'], f'schema:extra:{column}', 0, 0.0))
+        for column, count in summary['nulls'].items():
+            if count:
+                rows.append((summary['table'], f'nulls:{column}', count, count / total))
+        for check, count in summary['checks'].items():
+            if count and not check.startswith('null:'):
+                rows.append((summary['table'], check, count, count / total))
+        rows.append((summary['table'], 'quarantined', summary['quarantined'],
+                     summary['quarantined'] / total))
+    return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validasi streaming tabel sumber')
+    parser.add_argument('--source', default=None, help='folder/URL data (default: SOSMED_DATA_DIR)')
+    parser.add_argument('--output', default=None,
+                        help='folder file karantina dan validation.json (default: .cache/validation)')
+    args = parser.parse_args(argv)
+
+    report = validation_report(validate_dataset(args.source, args.output))
+    print(report.to_string(index=False, formatters={'rate': '{:.2%}'.format}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,9 +6,32 @@ import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from analisis.aggregation import build_integrated_dataset
+from analisis.artifact_cache import ArtifactCache
+from analisis.backends import dashboard_frames, default_backend
+from analisis.cleaning import load_clean_tables
+from analisis.figure_cache import FIGURE_CACHE
+from analisis.graph import FriendGraph, add_graph_metrics
+from analisis.profiling import PROFILER, configure_logging, memory_tracing_enabled, stage, start_memory_tracing
+from analisis.ranking import RANKING_COLUMNS
+from analisis.sections import GRANULARITIES, SectionData, SectionPrewarmer, figure
+from analisis.shared_store import SharedStore
+from analisis.sketches import approx_mode
+from analisis.snapshot import dataset_version, source_version
 import warnings
 warnings.filterwarnings('ignore')
 
+# Frame hasil cache dibagi antar sesi, jadi harus diperlakukan read-only.
+# pandas 3 selalu copy-on-write (opsinya deprecated); hanya pandas 2 yang perlu diaktifkan
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Log JSON per tahap (aktif jika SOSMED_PERF_LOG diset, lihat analisis/profiling.py)
+configure_logging()
+# tracemalloc (peak_mb) hanya dinyalakan jika SOSMED_PERF_MEMORY=1, karena memperlambat
+# setiap alokasi Python di proses
+start_memory_tracing()
+
 # Konfigurasi halaman
 st.set_page_config(
     page_title="Analisis Data Sosial Media",
@@ -43,99 +66,130 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
+@st.cache_resource
 def load_data():
-    """Memuat dan memproses data"""
+    """Memuat dan memproses data (dibagi antar sesi tanpa disalin)"""
     try:
-        # Load data
-        users = pd.read_csv('https://raw.githubusercontent.com/cayaaa14/data-real/refs/heads/main/user_table.csv')
-        friends = pd.read_csv('https://raw.githubusercontent.com/cayaaa14/data-real/refs/heads/main/friends_table.csv')
-        posts = pd.read_csv('https://raw.githubusercontent.com/cayaaa14/data-real/refs/heads/main/posts_table.csv')
-        reactions = pd.read_csv('https://raw.githubusercontent.com/cayaaa14/data-real/refs/heads/main/reactions_table.csv')
-        
-        # Data cleaning
-        users['Subscription Date'] = pd.to_datetime(users['Subscription Date'], unit='s')
-        posts['Post Date'] = pd.to_datetime(posts['Post Date'], unit='s')
-        
-        # Clean reactions data
-        reactions = reactions.dropna(subset=['User'])
-        mode_rt = reactions['Reaction Type'].mode()[0]
-        reactions['Reaction Type'] = reactions['Reaction Type'].fillna(mode_rt)
-        median_rd = reactions['Reaction Date'].median()
-        reactions['Reaction Date'] = reactions['Reaction Date'].fillna(median_rd)
-        reactions['Reaction Date'] = pd.to_datetime(reactions['Reaction Date'], unit='s')
-        
-        # Remove duplicates
-        users = users.drop_duplicates()
-        friends = friends.drop_duplicates()
-        posts = posts.drop_duplicates()
-        reactions = reactions.drop_duplicates()
+        # source_version() memvalidasi sumber dan memberi hash isinya; tabel bersih untuk versi
+        # dan mode itu dibaca dari store bersama, atau dibangun sekali oleh load_clean_tables()
+        # (per tabel di thread pool: snapshot Parquet/CSV typed, lalu cleaning; median imputasi
+        # dari sketch bila SOSMED_APPROX=1) lalu diterbitkan ke store (lihat analisis/cleaning.py)
+        with stage('load_data') as record:
+            version = source_version(typed=True)
+            mode = 'approx' if approx_mode() else 'exact'
+            users, friends, posts, reactions = SharedStore().get_or_build(
+                f'tables-{version}-{mode}', lambda: load_clean_tables(typed=True)
+            )
+            record['rows'] = len(users) + len(friends) + len(posts) + len(reactions)
         
         return users, friends, posts, reactions
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None, None, None, None
 
-@st.cache_data
-def create_integrated_dataset(users, friends, posts, reactions):
-    """Membuat dataset terintegrasi"""
-    # Base dari users
-    users = users.copy()
-    users['user_id'] = range(1, len(users) + 1)
-    integrated_data = users[['user_id', 'Name', 'Surname', 'Age', 'Subscription Date']].copy()
-    
-    # Data teman
-    all_friends = pd.concat([
-        friends[['Friend 1']].rename(columns={'Friend 1': 'user_id'}),
-        friends[['Friend 2']].rename(columns={'Friend 2': 'user_id'})
-    ])
-    friend_stats = all_friends.value_counts('user_id').reset_index()
-    friend_stats.columns = ['user_id', 'friend_count']
-    
-    # Data posting
-    posts = posts.copy()
-    posts = posts.rename(columns={'User': 'user_id'})
-    posts['post_id'] = range(1, len(posts) + 1)
-    post_stats = posts.groupby('user_id').agg({'post_id': 'count'}).reset_index()
-    post_stats.columns = ['user_id', 'post_count']
-    
-    # Data reaksi diberikan
-    reactions = reactions.copy()
-    reactions = reactions.rename(columns={'User': 'user_id'})
-    reactions['reaction_id'] = range(1, len(reactions) + 1)
-    reactions_given = reactions.groupby('user_id').agg({'reaction_id': 'count'}).reset_index()
-    reactions_given.columns = ['user_id', 'reactions_given']
-    
-    # Simulasi reaksi terhadap posting
-    reactions['post_id'] = reactions['reaction_id'] % len(posts) + 1
-    post_reactions = posts.merge(reactions, on='post_id', how='inner')
-    reactions_received = post_reactions.groupby('user_id_x').agg({'user_id_y': 'count'}).reset_index()
-    reactions_received.columns = ['user_id', 'reactions_received']
-    
-    # Gabungkan semua data
-    integrated_data = integrated_data.merge(friend_stats, on='user_id', how='left')
-    integrated_data = integrated_data.merge(post_stats, on='user_id', how='left')
-    integrated_data = integrated_data.merge(reactions_given, on='user_id', how='left')
-    integrated_data = integrated_data.merge(reactions_received, on='user_id', how='left')
+def add_friend_graph_metrics(integrated_data, friends):
+    """Metrik graf pertemanan (komponen, PageRank, clustering, segitiga)"""
+    with stage('integrate:graph_metrics') as record:
+        graph = FriendGraph.from_friends(friends, integrated_data['user_id'])
+        add_graph_metrics(integrated_data, graph)
+        record['rows'] = graph.num_edges
+
+def build_integrated_artifacts(users, friends, posts, reactions):
+    """Membuat dataset terintegrasi beserta metrik graf"""
+    integrated_data, posts_processed, reactions_processed = build_integrated_dataset(users, friends, posts, reactions)
+    add_friend_graph_metrics(integrated_data, friends)
+    return integrated_data, posts_processed, reactions_processed
+
+def build_backend_artifacts():
+    """Frame dashboard dari backend out-of-core, dataset terintegrasi diberi metrik graf"""
+    frames = dashboard_frames()
+    add_friend_graph_metrics(frames[0], frames[1])
+    return frames
+
+@st.cache_resource
+def load_backend_data():
+    """Frame ringkas dari backend out-of-core (dibagi antar sesi tanpa disalin).
     
-    # Bersihkan missing values
-    integrated_data.fillna(0, inplace=True)
+    Keempat tabel tidak dimuat ke pandas: cleaning, agregasi per pengguna, rollup
+    per jam, dan ringkasan Overview dihitung di backend (lihat analisis/backends.py);
+    hanya dataset terintegrasi dan edge pertemanan bersih yang berukuran besar.
+    """
+    try:
+        with stage('load_backend_data') as record:
+            mode = 'approx' if approx_mode() else 'exact'
+            version = f"{source_version(typed=True)}-{default_backend()}-{mode}"
+            key = f'backend-{version}'
+            frames = SharedStore().get_or_build(
+                key,
+                lambda: ArtifactCache().get_or_build(key, build_backend_artifacts)
+            )
+            record['rows'] = sum(len(frame) for frame in frames)
+        return frames, version
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return None, None
+
+@st.cache_resource
+def create_integrated_dataset(_users, _friends, _posts, _reactions, version):
+    """Dataset terintegrasi dengan kunci fingerprint dataset.
     
-    # Tambahan kolom analisis
-    integrated_data['age_group'] = pd.cut(
-        integrated_data['Age'],
-        bins=[0, 20, 30, 40, 50, 100],
-        labels=['<20', '20-29', '30-39', '40-49', '50+']
+    Tabel tidak di-hash oleh Streamlit (argumen berawalan _); hasilnya
+    diterbitkan ke store bersama dan dipetakan zero-copy oleh setiap proses.
+    Store bersama (/dev/shm) dicek dulu, lalu artefak disk di .cache/artifacts
+    yang bertahan setelah reboot; dataset baru dibangun jika keduanya kosong.
+    """
+    key = f'integrated-{version}'
+    with stage('create_integrated_dataset') as record:
+        result = SharedStore().get_or_build(
+            key,
+            lambda: ArtifactCache().get_or_build(
+                key,
+                lambda: build_integrated_artifacts(_users, _friends, _posts, _reactions)
+            )
+        )
+        record['rows'] = len(result[0])
+    return result
+
+@st.cache_resource
+def get_section_data(_users, _friends, _posts, _reactions, _integrated_data, _posts_processed, _reactions_processed, version):
+    """Tabel dan indeks turunan (ranking, graf, rollup, kubus, momen, filter) per versi dataset"""
+    return SectionData(_users, _friends, _posts, _reactions, _integrated_data, _posts_processed, _reactions_processed, version)
+
+@st.cache_resource
+def get_backend_section_data(_frames, version):
+    """Data section dari frame backend (rollup dan ringkasan sudah diagregasi)"""
+    return SectionData.from_frames(*_frames, version)
+
+@st.cache_resource
+def get_section_payloads(_data, version):
+    """Payload section per versi dataset; worker latar belakang langsung menyiapkan semuanya"""
+    return SectionPrewarmer(_data).start()
+
+def show_figure(payload, key):
+    """Menampilkan figur dari payload section"""
+    st.plotly_chart(figure(payload, key), use_container_width=True)
+
+def show_performance_panel():
+    """Catatan tahap terbaru (dimuat, dibersihkan, diagregasi, digambar) di sidebar"""
+    report = PROFILER.report()
+    st.sidebar.subheader("⏱️ Performance")
+    entries, cached_bytes = FIGURE_CACHE.usage()
+    st.sidebar.write(f"• Cache figur: {entries} payload, {cached_bytes / 2**20:.1f} MB")
+    if report.empty:
+        st.sidebar.info("Belum ada tahap yang tercatat.")
+        return
+    if not memory_tracing_enabled():
+        st.sidebar.caption("peak_mb kosong: jalankan dengan SOSMED_PERF_MEMORY=1 untuk mengukur memori")
+    # Satu baris per tahap: eksekusi terakhir (tahap cache hanya berjalan sekali per proses)
+    latest = report.drop_duplicates('stage', keep='last').set_index('stage')
+    group = latest.index.str.split(':').str[0]
+    totals = latest[latest['depth'] == 0].groupby(group[latest['depth'] == 0])['wall_s'].sum()
+    for name, seconds in totals.sort_values(ascending=False).items():
+        st.sidebar.write(f"• {name}: {seconds:.3f} s")
+    st.sidebar.dataframe(
+        latest[['wall_s', 'cpu_s', 'peak_mb', 'peak_shared', 'rows']].round(3),
+        use_container_width=True
     )
-    integrated_data['registration_year'] = pd.to_datetime(integrated_data['Subscription Date']).dt.year
-    integrated_data['is_active_poster'] = integrated_data['post_count'] > 0
-    integrated_data['is_social'] = integrated_data['friend_count'] > 0
-    integrated_data['engagement_ratio'] = integrated_data['reactions_received'] / (integrated_data['post_count'] + 1)
-    integrated_data['total_activity'] = (integrated_data['friend_count'] + 
-                                       integrated_data['post_count'] + 
-                                       integrated_data['reactions_given'])
-    
-    return integrated_data, posts, reactions
 
 def main():
     # Header
@@ -144,12 +198,24 @@ def main():
     
     # Load data
     with st.spinner('Memuat dan memproses data...'):
-        users, friends, posts, reactions = load_data()
-        if users is None:
-            st.error("Gagal memuat data. Silakan periksa koneksi internet Anda.")
-            return
-        
-        integrated_data, posts_processed, reactions_processed = create_integrated_dataset(users, friends, posts, reactions)
+        if default_backend() == 'pandas':
+            users, friends, posts, reactions = load_data()
+            if users is None:
+                st.error("Gagal memuat data. Silakan periksa koneksi internet Anda.")
+                return
+            
+            version = dataset_version(users, friends, posts, reactions)
+            integrated_data, posts_processed, reactions_processed = create_integrated_dataset(users, friends, posts, reactions, version)
+            data = get_section_data(users, friends, posts, reactions, integrated_data, posts_processed, reactions_processed, version)
+        else:
+            # Backend out-of-core (SOSMED_BACKEND=duckdb): tabel tidak dimuat ke pandas
+            frames, version = load_backend_data()
+            if frames is None:
+                st.error("Gagal memuat data. Silakan periksa koneksi internet Anda.")
+                return
+            data = get_backend_section_data(frames, version)
+        # Agregat dan figur semua section disiapkan di latar belakang (lihat analisis/sections.py)
+        payloads = get_section_payloads(data, version)
     
     # Sidebar untuk navigasi
     st.sidebar.title("🎛️ Navigasi")
@@ -160,447 +226,355 @@ def main():
         "💝 Analisis Reaksi",
         "📊 Distribusi Aktivitas",
         "🔗 Analisis Korelasi",
-        "🎯 Insights Mendalam"
+        "🎯 Insights Mendalam",
+        "🕸️ Analisis Jaringan"
     ]
     
     selected_section = st.sidebar.selectbox("Pilih Bagian Analisis:", sections)
     
-    # Overview & Statistik
-    if selected_section == "📈 Overview & Statistik":
-        st.markdown('<h2 class="sub-header">📈 Overview & Statistik Umum</h2>', unsafe_allow_html=True)
-        
-        # Metrics cards
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("👥 Total Pengguna", f"{len(users):,}", delta=None)
-        with col2:
-            st.metric("🤝 Total Pertemanan", f"{len(friends):,}", delta=None)
-        with col3:
-            st.metric("📝 Total Postingan", f"{len(posts):,}", delta=None)
-        with col4:
-            st.metric("💝 Total Reaksi", f"{len(reactions):,}", delta=None)
-        
-        # Detailed statistics
-        st.subheader("📊 Statistik Detail")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**👥 Statistik Pengguna:**")
-            st.write(f"• Usia rata-rata: {users['Age'].mean():.1f} tahun")
-            st.write(f"• Usia median: {users['Age'].median():.1f} tahun")
-            st.write(f"• Rentang usia: {users['Age'].min()}-{users['Age'].max()} tahun")
+    # Tiap section diukur sebagai satu tahap (lihat panel Performance); payload yang
+    # sudah disiapkan worker atau yang params widget-nya pernah dipakai diambil dari
+    # cache figur dan di-replay langsung, yang belum ada dibangun atau ditunggu
+    with stage(f'section:{selected_section}'):
+        # Overview & Statistik
+        if selected_section == "📈 Overview & Statistik":
+            st.markdown('<h2 class="sub-header">📈 Overview & Statistik Umum</h2>', unsafe_allow_html=True)
+            payload = payloads.payload('overview')
+            counts = payload['counts']
+        
+            # Metrics cards
+            col1, col2, col3, col4 = st.columns(4)
+        
+            with col1:
+                st.metric("👥 Total Pengguna", f"{counts['users']:,}", delta=None)
+            with col2:
+                st.metric("🤝 Total Pertemanan", f"{counts['friends']:,}", delta=None)
+            with col3:
+                st.metric("📝 Total Postingan", f"{counts['posts']:,}", delta=None)
+            with col4:
+                st.metric("💝 Total Reaksi", f"{counts['reactions']:,}", delta=None)
+        
+            # Detailed statistics
+            st.subheader("📊 Statistik Detail")
+            # Mode aproksimasi: jumlah unik & median dari sketch ingest, dengan batas galat ~95%
+            approx = payload['approx']
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                st.write("**👥 Statistik Pengguna:**")
+                st.write(f"• Usia rata-rata: {payload['age_mean']:.1f} tahun")
+                if 'age_median' in approx:
+                    st.write(f"• Usia median: ≈{approx['age_median']['estimate']:.1f} tahun ({approx['age_median']['error']})")
+                else:
+                    st.write(f"• Usia median: {payload['age_median']:.1f} tahun")
+                st.write(f"• Rentang usia: {payload['age_range'][0]}-{payload['age_range'][1]} tahun")
             
-            st.write("**🤝 Statistik Pertemanan:**")
-            all_friends = pd.concat([
-                friends[['Friend 1']].rename(columns={'Friend 1': 'user_id'}),
-                friends[['Friend 2']].rename(columns={'Friend 2': 'user_id'})
-            ])
-            avg_friends = all_friends.groupby('user_id').size().mean()
-            st.write(f"• Rata-rata teman per pengguna: {avg_friends:.1f}")
-            st.write(f"• Pengguna dengan teman: {all_friends['user_id'].nunique():,}")
-        
-        with col2:
-            st.write("**📝 Statistik Postingan:**")
-            active_posters = posts['User'].nunique()
-            st.write(f"• Pengguna aktif posting: {active_posters:,}")
-            st.write(f"• Persentase active posters: {active_posters / len(users) * 100:.1f}%")
-            avg_posts = posts.groupby('User').size().mean()
-            st.write(f"• Rata-rata post per active user: {avg_posts:.1f}")
+                st.write("**🤝 Statistik Pertemanan:**")
+                st.write(f"• Rata-rata teman per pengguna: {payload['avg_friends']:.1f}")
+                if 'friend_users' in approx:
+                    st.write(f"• Pengguna dengan teman: ≈{approx['friend_users']['estimate']:,.0f} ({approx['friend_users']['error']})")
+                else:
+                    st.write(f"• Pengguna dengan teman: {payload['friend_users']:,}")
+        
+            with col2:
+                st.write("**📝 Statistik Postingan:**")
+                if 'active_posters' in approx:
+                    active_posters = approx['active_posters']['estimate']
+                    st.write(f"• Pengguna aktif posting: ≈{active_posters:,.0f} ({approx['active_posters']['error']})")
+                else:
+                    active_posters = payload['active_posters']
+                    st.write(f"• Pengguna aktif posting: {active_posters:,}")
+                st.write(f"• Persentase active posters: {active_posters / counts['users'] * 100:.1f}%")
+                st.write(f"• Rata-rata post per active user: {payload['avg_posts']:.1f}")
             
-            st.write("**💝 Statistik Reaksi:**")
-            users_giving_reactions = reactions['User'].nunique()
-            st.write(f"• Users memberi reaksi: {users_giving_reactions:,}")
-            st.write(f"• Persentase pemberi reaksi: {users_giving_reactions / len(users) * 100:.1f}%")
+                st.write("**💝 Statistik Reaksi:**")
+                if 'reacting_users' in approx:
+                    users_giving_reactions = approx['reacting_users']['estimate']
+                    st.write(f"• Users memberi reaksi: ≈{users_giving_reactions:,.0f} ({approx['reacting_users']['error']})")
+                else:
+                    users_giving_reactions = payload['reacting_users']
+                    st.write(f"• Users memberi reaksi: {users_giving_reactions:,}")
+                st.write(f"• Persentase pemberi reaksi: {users_giving_reactions / counts['users'] * 100:.1f}%")
+        
+            # Semua taksiran sketch beserta selang ~95%
+            if approx:
+                with st.expander("≈ Statistik Aproksimasi (Sketch)"):
+                    st.dataframe(pd.DataFrame(approx).T, use_container_width=True)
+        
+            # Memori ingest per tabel
+            if len(payload['memory_report']) > 0:
+                with st.expander("💾 Memori Ingest per Tabel"):
+                    st.dataframe(payload['memory_report'], use_container_width=True)
+        
+            # Laporan duplikat per tabel
+            if len(payload['duplicates_report']) > 0:
+                with st.expander("🧹 Laporan Duplikat per Tabel"):
+                    st.dataframe(payload['duplicates_report'], use_container_width=True)
     
-    # Analisis Demografi
-    elif selected_section == "👥 Analisis Demografi":
-        st.markdown('<h2 class="sub-header">👥 Analisis Demografi</h2>', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Distribusi Kelompok Usia
-            age_distribution = integrated_data['age_group'].value_counts().sort_index()
-            fig = px.bar(
-                x=age_distribution.index,
-                y=age_distribution.values,
-                title="Distribusi Pengguna per Kelompok Usia",
-                labels={'x': 'Kelompok Usia', 'y': 'Jumlah Pengguna'},
-                color=age_distribution.values,
-                color_continuous_scale='viridis'
-            )
-            fig.update_layout(showlegend=False, height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Histogram Usia
-            fig = px.histogram(
-                integrated_data,
-                x='Age',
-                title="Distribusi Usia Pengguna (Histogram)",
-                labels={'Age': 'Usia (tahun)', 'count': 'Jumlah Pengguna'},
-                nbins=30
-            )
-            fig.add_vline(x=integrated_data['Age'].mean(), line_dash="dash", 
-                         annotation_text=f"Rata-rata: {integrated_data['Age'].mean():.1f}")
-            fig.add_vline(x=integrated_data['Age'].median(), line_dash="dot", 
-                         annotation_text=f"Median: {integrated_data['Age'].median():.1f}")
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Aktivitas per Kelompok Usia
-        age_activity = integrated_data.groupby('age_group')[['friend_count', 'post_count', 'reactions_given', 'reactions_received']].mean()
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=age_activity.index, y=age_activity['friend_count'], 
-                                mode='lines+markers', name='Rata-rata Teman', line=dict(width=3)))
-        fig.add_trace(go.Scatter(x=age_activity.index, y=age_activity['post_count'], 
-                                mode='lines+markers', name='Rata-rata Post', line=dict(width=3)))
-        fig.add_trace(go.Scatter(x=age_activity.index, y=age_activity['reactions_given'], 
-                                mode='lines+markers', name='Rata-rata Reaksi Diberikan', line=dict(width=3)))
-        fig.add_trace(go.Scatter(x=age_activity.index, y=age_activity['reactions_received'], 
-                                mode='lines+markers', name='Rata-rata Reaksi Diterima', line=dict(width=3)))
-        
-        fig.update_layout(
-            title="Pola Aktivitas per Kelompok Usia",
-            xaxis_title="Kelompok Usia",
-            yaxis_title="Rata-rata Aktivitas",
-            height=500
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        # Analisis Demografi
+        elif selected_section == "👥 Analisis Demografi":
+            st.markdown('<h2 class="sub-header">👥 Analisis Demografi</h2>', unsafe_allow_html=True)
+            payload = payloads.payload('demografi')
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                # Distribusi Kelompok Usia
+                show_figure(payload, 'age_distribution')
+        
+            with col2:
+                # Histogram Usia
+                show_figure(payload, 'age_histogram')
+        
+            # Aktivitas per Kelompok Usia (dari kubus agregat)
+            show_figure(payload, 'age_activity')
+        
+            # Drill-down per usia tunggal
+            show_figure(payload, 'age_detail')
     
-    # Top Performers
-    elif selected_section == "🏆 Top Performers":
-        st.markdown('<h2 class="sub-header">🏆 Top Performers</h2>', unsafe_allow_html=True)
-        
-        # Filter untuk top N
-        top_n = st.slider("Tampilkan Top N pengguna:", 5, 20, 10)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Top Active Users
-            top_active = integrated_data.nlargest(top_n, 'total_activity')
-            fig = px.bar(
-                top_active,
-                x='total_activity',
-                y=[f"{row['Name']} {row['Surname']}" for _, row in top_active.iterrows()],
-                orientation='h',
-                title=f"Top {top_n} Pengguna Paling Aktif",
-                labels={'total_activity': 'Total Aktivitas', 'y': 'Pengguna'}
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Top Posters
-            top_posters = integrated_data.nlargest(top_n, 'post_count')
-            fig = px.bar(
-                top_posters,
-                x='post_count',
-                y=[f"{row['Name']} {row['Surname']}" for _, row in top_posters.iterrows()],
-                orientation='h',
-                title=f"Top {top_n} Content Creator",
-                labels={'post_count': 'Jumlah Post', 'y': 'Pengguna'}
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Detailed table
-        st.subheader("📋 Tabel Detail Top Performers")
-        display_cols = ['Name', 'Surname', 'Age', 'friend_count', 'post_count', 'reactions_given', 'reactions_received', 'total_activity']
-        top_detailed = integrated_data.nlargest(top_n, 'total_activity')[display_cols]
-        st.dataframe(top_detailed, use_container_width=True)
+        # Top Performers
+        elif selected_section == "🏆 Top Performers":
+            st.markdown('<h2 class="sub-header">🏆 Top Performers</h2>', unsafe_allow_html=True)
+        
+            # Filter untuk top N
+            top_n = st.slider("Tampilkan Top N pengguna:", 5, 20, 10)
+            payload = payloads.payload('top_performers', top_n=top_n)
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                # Top Active Users
+                show_figure(payload, 'top_active')
+        
+            with col2:
+                # Top Posters
+                show_figure(payload, 'top_posters')
+        
+            # Detailed table
+            st.subheader("📋 Tabel Detail Top Performers")
+            st.dataframe(payload['top_detailed'], use_container_width=True)
+        
+            # Peringkat satu pengguna
+            st.subheader("🔎 Peringkat Pengguna")
+            user_id = st.number_input("Masukkan user_id:", min_value=1, max_value=len(data.integrated_data), value=1, step=1)
+            rank_cols = st.columns(len(RANKING_COLUMNS))
+            for col, metric in zip(rank_cols, RANKING_COLUMNS):
+                rank = data.ranking.rank_of(int(user_id), metric)
+                col.metric(metric, f"#{rank:,}" if rank is not None else "-")
     
-    # Analisis Reaksi
-    elif selected_section == "💝 Analisis Reaksi":
-        st.markdown('<h2 class="sub-header">💝 Analisis Reaksi</h2>', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Pie chart reaksi
-            reaction_counts = reactions_processed['Reaction Type'].value_counts()
-            fig = px.pie(
-                values=reaction_counts.values,
-                names=reaction_counts.index,
-                title="Proporsi Jenis Reaksi"
-            )
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Bar chart reaksi
-            fig = px.bar(
-                x=reaction_counts.index,
-                y=reaction_counts.values,
-                title="Jumlah Reaksi per Jenis",
-                labels={'x': 'Jenis Reaksi', 'y': 'Jumlah'},
-                color=reaction_counts.values,
-                color_continuous_scale='plasma'
-            )
-            fig.update_layout(showlegend=False, height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Timeline reaksi
-        reactions_timeline = reactions_processed.copy()
-        reactions_timeline['date'] = pd.to_datetime(reactions_timeline['Reaction Date']).dt.date
-        daily_reactions = reactions_timeline.groupby('date').size().reset_index(name='count')
-        
-        fig = px.line(
-            daily_reactions,
-            x='date',
-            y='count',
-            title="Timeline Aktivitas Reaksi Harian"
-        )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        # Analisis Reaksi
+        elif selected_section == "💝 Analisis Reaksi":
+            st.markdown('<h2 class="sub-header">💝 Analisis Reaksi</h2>', unsafe_allow_html=True)
+            payload = payloads.payload('analisis_reaksi')
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                # Pie chart reaksi
+                show_figure(payload, 'reaction_pie')
+        
+            with col2:
+                # Bar chart reaksi
+                show_figure(payload, 'reaction_bar')
+        
+            # Timeline reaksi (dari rollup yang dibangun sekali per versi dataset)
+            col1, col2 = st.columns(2)
+            with col1:
+                granularity_label = st.selectbox("Granularitas Timeline:", list(GRANULARITIES), index=1)
+            with col2:
+                by_type = st.checkbox("Pisahkan per jenis reaksi", value=False)
+        
+            payload = payloads.payload('analisis_reaksi.timeline', granularity=granularity_label, by_type=by_type)
+            show_figure(payload, 'timeline')
     
-    # Distribusi Aktivitas
-    elif selected_section == "📊 Distribusi Aktivitas":
-        st.markdown('<h2 class="sub-header">📊 Distribusi Aktivitas</h2>', unsafe_allow_html=True)
-        
-        # Level aktivitas
-        def categorize_activity(row):
-            if row['total_activity'] == 0:
-                return 'Tidak Aktif'
-            elif row['total_activity'] <= 5:
-                return 'Aktivitas Rendah'
-            elif row['total_activity'] <= 15:
-                return 'Aktivitas Sedang'
-            elif row['total_activity'] <= 30:
-                return 'Aktivitas Tinggi'
-            else:
-                return 'Sangat Aktif'
-        
-        integrated_data['activity_level'] = integrated_data.apply(categorize_activity, axis=1)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Pie chart level aktivitas
-            activity_counts = integrated_data['activity_level'].value_counts()
-            fig = px.pie(
-                values=activity_counts.values,
-                names=activity_counts.index,
-                title="Proporsi Level Aktivitas Pengguna"
-            )
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Engagement ratio distribution
-            posting_users = integrated_data[integrated_data['post_count'] > 0]
-            fig = px.histogram(
-                posting_users,
-                x='engagement_ratio',
-                title="Distribusi Engagement Ratio",
-                labels={'engagement_ratio': 'Engagement Ratio', 'count': 'Jumlah Pengguna'},
-                nbins=30
-            )
-            fig.add_vline(x=posting_users['engagement_ratio'].mean(), line_dash="dash",
-                         annotation_text=f"Rata-rata: {posting_users['engagement_ratio'].mean():.2f}")
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Post type analysis
-        if 'Post Type' in posts_processed.columns:
-            post_type_counts = posts_processed['Post Type'].value_counts()
-            fig = px.bar(
-                x=post_type_counts.index,
-                y=post_type_counts.values,
-                title="Distribusi Jenis Postingan",
-                labels={'x': 'Jenis Post', 'y': 'Jumlah'},
-                color=post_type_counts.values,
-                color_continuous_scale='viridis'
-            )
-            fig.update_layout(showlegend=False, height=400)
-            st.plotly_chart(fig, use_container_width=True)
+        # Distribusi Aktivitas
+        elif selected_section == "📊 Distribusi Aktivitas":
+            st.markdown('<h2 class="sub-header">📊 Distribusi Aktivitas</h2>', unsafe_allow_html=True)
+            payload = payloads.payload('distribusi_aktivitas')
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                # Pie chart level aktivitas
+                show_figure(payload, 'activity_pie')
+        
+            with col2:
+                # Engagement ratio distribution
+                show_figure(payload, 'engagement')
+        
+            # Post type analysis
+            if payload['figures']['post_types'] is not None:
+                show_figure(payload, 'post_types')
     
-    # Analisis Korelasi
-    elif selected_section == "🔗 Analisis Korelasi":
-        st.markdown('<h2 class="sub-header">🔗 Analisis Korelasi</h2>', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Scatter plot: Friends vs Posts
-            fig = px.scatter(
-                integrated_data,
-                x='friend_count',
-                y='post_count',
-                color='total_activity',
-                size='Age',
-                title="Hubungan Jumlah Teman vs Postingan",
-                labels={'friend_count': 'Jumlah Teman', 'post_count': 'Jumlah Post'},
-                color_continuous_scale='viridis'
-            )
-            
-            # Add trendline
-            correlation = integrated_data['friend_count'].corr(integrated_data['post_count'])
-            fig.add_annotation(
-                text=f"Korelasi: {correlation:.3f}",
-                xref="paper", yref="paper",
-                x=0.02, y=0.98,
-                showarrow=False,
-                bgcolor="yellow",
-                bordercolor="black"
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Scatter plot: Age vs Activity
-            fig = px.scatter(
-                integrated_data,
-                x='Age',
-                y='total_activity',
-                color='age_group',
-                title="Hubungan Usia vs Total Aktivitas",
-                labels={'Age': 'Usia', 'total_activity': 'Total Aktivitas'}
-            )
-            
-            age_activity_corr = integrated_data['Age'].corr(integrated_data['total_activity'])
-            fig.add_annotation(
-                text=f"Korelasi: {age_activity_corr:.3f}",
-                xref="paper", yref="paper",
-                x=0.02, y=0.98,
-                showarrow=False,
-                bgcolor="yellow",
-                bordercolor="black"
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Correlation matrix
-        correlation_vars = ['Age', 'friend_count', 'post_count', 'reactions_given', 'reactions_received', 'total_activity']
-        correlation_matrix = integrated_data[correlation_vars].corr()
-        
-        fig = px.imshow(
-            correlation_matrix,
-            text_auto=True,
-            aspect="auto",
-            title="Matriks Korelasi Antar Variabel",
-            color_continuous_scale='RdBu'
-        )
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        # Analisis Korelasi
+        elif selected_section == "🔗 Analisis Korelasi":
+            st.markdown('<h2 class="sub-header">🔗 Analisis Korelasi</h2>', unsafe_allow_html=True)
+        
+            # Korelasi dan garis tren dibaca dari akumulator momen (tanpa memindai ulang data)
+            payload = payloads.payload('korelasi')
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                # Scatter plot: Friends vs Posts, dengan garis tren
+                show_figure(payload, 'friends_posts')
+        
+            with col2:
+                # Scatter plot: Age vs Activity
+                show_figure(payload, 'age_activity')
+        
+            # Correlation matrix
+            method = st.radio("Metode korelasi:", ["Pearson", "Spearman"], horizontal=True)
+            show_figure(payloads.payload('korelasi.matrix', method=method), 'matrix')
     
-    # Insights Mendalam
-    elif selected_section == "🎯 Insights Mendalam":
-        st.markdown('<h2 class="sub-header">🎯 Insights Mendalam</h2>', unsafe_allow_html=True)
-        
-        # Heatmap aktivitas per usia dan tahun
-        activity_heatmap = integrated_data.groupby(['age_group', 'registration_year'])['total_activity'].mean().unstack()
-        
-        fig = px.imshow(
-            activity_heatmap,
-            text_auto=True,
-            aspect="auto",
-            title="Pola Aktivitas Berdasarkan Usia dan Tahun Bergabung",
-            labels={'x': 'Tahun Registrasi', 'y': 'Kelompok Usia'},
-            color_continuous_scale='YlOrRd'
-        )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        # Insights Mendalam
+        elif selected_section == "🎯 Insights Mendalam":
+            st.markdown('<h2 class="sub-header">🎯 Insights Mendalam</h2>', unsafe_allow_html=True)
+        
+            # Heatmap aktivitas per usia dan tahun (dari kubus agregat)
+            drill_down = st.checkbox("Drill-down ke usia tunggal", value=False)
+            show_figure(payloads.payload('insights.heatmap', drill_down=drill_down), 'heatmap')
         
-        # Key insights
-        st.subheader("🔍 Key Insights")
+            # Key insights
+            st.subheader("🔍 Key Insights")
+            payload = payloads.payload('insights')
         
-        col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
         
-        with col1:
-            st.markdown("**📊 Temuan Utama:**")
+            with col1:
+                st.markdown("**📊 Temuan Utama:**")
             
-            # Most active age group
-            most_active_age = integrated_data.groupby('age_group')['total_activity'].mean().idxmax()
-            st.write(f"• Kelompok usia paling aktif: **{most_active_age}**")
+                # Most active age group
+                st.write(f"• Kelompok usia paling aktif: **{payload['most_active_age']}**")
             
-            # Engagement insights
-            posting_users = integrated_data[integrated_data['post_count'] > 0]
-            high_engagement_pct = (posting_users['engagement_ratio'] > posting_users['engagement_ratio'].median()).mean() * 100
-            st.write(f"• {high_engagement_pct:.1f}% content creator memiliki engagement di atas median")
+                # Engagement insights
+                st.write(f"• {payload['high_engagement_pct']:.1f}% content creator memiliki engagement di atas median")
             
-            # Social correlation
-            correlation = integrated_data['friend_count'].corr(integrated_data['post_count'])
-            if correlation > 0.3:
-                social_insight = "Pengguna yang lebih sosial cenderung lebih aktif posting"
-            elif correlation < -0.3:
-                social_insight = "Pengguna yang lebih sosial cenderung kurang aktif posting"
-            else:
-                social_insight = "Tidak ada hubungan kuat antara jumlah teman dan aktivitas posting"
-            st.write(f"• {social_insight}")
-        
-        with col2:
-            st.markdown("**🎯 Rekomendasi:**")
+                # Social correlation
+                st.write(f"• {payload['social_insight']}")
+        
+            with col2:
+                st.markdown("**🎯 Rekomendasi:**")
             
-            # Top reaction type
-            top_reaction = reactions_processed['Reaction Type'].value_counts().index[0]
-            st.write(f"• Fokus pada konten yang mendorong reaksi '**{top_reaction}**'")
+                # Top reaction type
+                st.write(f"• Fokus pada konten yang mendorong reaksi '**{payload['top_reaction']}**'")
             
-            # Activity distribution
-            inactive_pct = (integrated_data['total_activity'] == 0).mean() * 100
-            st.write(f"• {inactive_pct:.1f}% pengguna tidak aktif - peluang engagement")
+                # Activity distribution
+                st.write(f"• {payload['inactive_pct']:.1f}% pengguna tidak aktif - peluang engagement")
             
-            # Age targeting
-            st.write(f"• Target kelompok usia **{most_active_age}** untuk fitur baru")
+                # Age targeting
+                st.write(f"• Target kelompok usia **{payload['most_active_age']}** untuk fitur baru")
             
-            # Posting frequency
-            avg_posts = posting_users['post_count'].mean()
-            st.write(f"• Rata-rata {avg_posts:.1f} post per active user - dorong konsistensi")
-        
-        # Interactive filters
-        st.subheader("🎛️ Eksplorasi Interaktif")
-        
-        # Age filter
-        age_range = st.slider(
-            "Filter Rentang Usia:",
-            int(integrated_data['Age'].min()),
-            int(integrated_data['Age'].max()),
-            (int(integrated_data['Age'].min()), int(integrated_data['Age'].max()))
-        )
+                # Posting frequency
+                st.write(f"• Rata-rata {payload['avg_posts']:.1f} post per active user - dorong konsistensi")
         
-        # Activity filter
-        activity_threshold = st.slider(
-            "Minimal Total Aktivitas:",
-            0,
-            int(integrated_data['total_activity'].max()),
-            0
-        )
+            # Interactive filters
+            st.subheader("🎛️ Eksplorasi Interaktif")
+        
+            filter_index = data.filter_index
+            age_min, age_max = (int(v) for v in filter_index.bounds('Age'))
+        
+            # Age filter
+            age_range = st.slider(
+                "Filter Rentang Usia:",
+                age_min,
+                age_max,
+                (age_min, age_max)
+            )
         
-        # Apply filters
-        filtered_data = integrated_data[
-            (integrated_data['Age'] >= age_range[0]) &
-            (integrated_data['Age'] <= age_range[1]) &
-            (integrated_data['total_activity'] >= activity_threshold)
-        ]
-        
-        # Show filtered statistics
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("👥 Pengguna Terfilter", len(filtered_data))
-        with col2:
-            st.metric("📊 Rata-rata Aktivitas", f"{filtered_data['total_activity'].mean():.1f}")
-        with col3:
-            st.metric("🎯 Rata-rata Engagement", f"{filtered_data['engagement_ratio'].mean():.2f}")
-        
-        # Filtered visualization
-        if len(filtered_data) > 0:
-            fig = px.scatter(
-                filtered_data,
-                x='friend_count',
-                y='post_count',
-                color='age_group',
-                size='total_activity',
-                title="Data Terfilter: Teman vs Post",
-                hover_data=['Name', 'Surname', 'Age']
+            # Activity filter
+            activity_threshold = st.slider(
+                "Minimal Total Aktivitas:",
+                0,
+                int(filter_index.bounds('total_activity')[1]),
+                0
             )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+        
+            # Apply filters (indeks terurut + prefix sum, tanpa mask atas seluruh data)
+            payload = payloads.payload('insights.filter', age_range=tuple(age_range),
+                                       activity_threshold=activity_threshold)
+            filtered_means = payload['filtered_means']
+        
+            # Show filtered statistics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("👥 Pengguna Terfilter", payload['filtered_count'])
+            with col2:
+                st.metric("📊 Rata-rata Aktivitas", f"{filtered_means['total_activity']:.1f}")
+            with col3:
+                st.metric("🎯 Rata-rata Engagement", f"{filtered_means['engagement_ratio']:.2f}")
+        
+            # Filtered visualization
+            if payload['filtered_count'] > 0:
+                show_figure(payload, 'filtered')
+    
+        # Analisis Jaringan
+        elif selected_section == "🕸️ Analisis Jaringan":
+            st.markdown('<h2 class="sub-header">🕸️ Analisis Jaringan Pertemanan</h2>', unsafe_allow_html=True)
+            payload = payloads.payload('jaringan')
+            graph = data.graph
+        
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("👥 Pengguna (Node)", f"{payload['num_nodes']:,}")
+            with col2:
+                st.metric("🤝 Pertemanan (Edge)", f"{payload['num_edges']:,}")
+            with col3:
+                st.metric("📊 Rata-rata Derajat", f"{payload['degree_mean']:.1f}")
+            with col4:
+                st.metric("🏆 Derajat Maksimum", f"{payload['degree_max']:,}")
+        
+            # Distribusi derajat
+            show_figure(payload, 'degrees')
+        
+            # Metrik graf global
+            st.subheader("🌍 Metrik Graf Global")
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                st.write(f"• Jumlah komponen terhubung: **{payload['components']:,}**")
+                st.write(f"• Ukuran komponen terbesar: **{payload['largest_component']:,}** pengguna")
+                st.write(f"• Total segitiga pertemanan: **{payload['triangles']:,}**")
+                st.write(f"• Rata-rata koefisien clustering: **{payload['clustering_mean']:.3f}**")
+            
+                st.write("**Top 10 PageRank:**")
+                st.dataframe(payload['top_pagerank'], use_container_width=True)
+        
+            with col2:
+                show_figure(payload, 'clustering')
+        
+            # Eksplorasi pengguna
+            st.subheader("🔍 Eksplorasi Pengguna")
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                user_a = int(st.number_input("user_id Pengguna A:", min_value=1, max_value=graph.num_nodes, value=1, step=1))
+                user_b = int(st.number_input("user_id Pengguna B:", min_value=1, max_value=graph.num_nodes, value=min(2, graph.num_nodes), step=1))
+                st.write(f"• Jumlah teman A: **{graph.degree(user_a):,}**")
+                st.write(f"• Jumlah teman B: **{graph.degree(user_b):,}**")
+                st.write(f"• Teman bersama A & B: **{graph.mutual_friends(user_a, user_b):,}**")
+            
+                neighbor_rows = graph.index.positions(graph.neighbors(user_a))
+                st.write("**Daftar teman Pengguna A:**")
+                st.dataframe(
+                    data.integrated_data.iloc[neighbor_rows][['user_id', 'Name', 'Surname', 'Age', 'friend_count']],
+                    use_container_width=True,
+                    height=250
+                )
+        
+            with col2:
+                k = st.slider("Jumlah hop (k):", 1, 6, 3)
+                payload = payloads.payload('jaringan.hops', user_id=user_a, k=k)
+                st.metric("🌐 Pengguna Terjangkau", f"{payload['reached']:,}",
+                          delta=f"{payload['reached'] / max(graph.num_nodes - 1, 1) * 100:.1f}% jaringan")
+                show_figure(payload, 'hops')
+    
+    # Panel Performance (opsional): waktu, CPU, puncak memori, dan baris per tahap
+    if st.sidebar.checkbox("⏱️ Tampilkan Panel Performance", value=False):
+        show_performance_panel()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()